@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: BatchDriver.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Command line driver for running GoldQC over files of historical water quality records outside of GoldSim.
+Input vectors are streamed from a CSV or NumPy .npy file in fixed size chunks through the same configuration
+and calculation path GoldSim uses, and results are appended to a CSV file as each chunk completes.
+
+Usage: python BatchDriver.py input.csv output.csv [--chunk-size N] [--offset N | --resume] [--config FILE]
+"""
+# ===========================================================================
+import argparse
+import csv
+import os
+import sys
+import time
+from itertools import islice
+
+import GoldQC
+
+# Seconds between progress reports.
+REPORT_INTERVAL = 10.0
+
+
+def read_csv(path, offset=0, header=False):
+    """
+    Lazily reads input vectors from a CSV file, one row per vector.
+
+    :param path: CSV file with one column per GoldQC element.
+    :param offset: number of data rows to skip.
+    :param header: whether the first row is a header to skip.
+
+    :return: iterator of lists of floats
+    """
+    with open(path, 'rb') as f:
+        reader = csv.reader(f)
+        if header:
+            next(reader, None)
+        for row in islice(reader, offset, None):
+            if row:
+                yield [float(value) for value in row]
+
+
+def read_npy(path, offset=0):
+    """
+    Lazily reads input vectors from a 2-D NumPy .npy file, memory mapped so it is never loaded whole.
+
+    :param path: .npy file with one row per vector.
+    :param offset: number of rows to skip.
+
+    :return: iterator of lists of floats
+    """
+    try:
+        import numpy
+    except ImportError:
+        exit("Error: NumPy is required to read .npy input files")
+    data = numpy.load(path, mmap_mode='r')
+    for index in xrange(offset, data.shape[0]):
+        yield data[index].tolist()
+
+
+def count_rows(path, header=False):
+    """
+    :return: the number of data rows already written to a CSV output file, 0 if it does not exist.
+    """
+    if not os.path.isfile(path):
+        return 0
+    with open(path, 'rb') as f:
+        rows = sum(1 for row in csv.reader(f) if row)
+    return max(rows - 1, 0) if header else rows
+
+
+def chunks(iterable, size):
+    """
+    Splits an iterator into lists of at most size items without reading ahead.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_chunk(vectors, session):
+    """
+    Runs a chunk of vectors as a single batch. If PHREEQC fails on the batch the session re-runs each vector on
+    its own so one bad record only loses its own results.
+
+    :param vectors: list of input vectors.
+    :param session: initialised GoldQCSession to run on.
+
+    :return: (list of output vectors with None for failed vectors, number of failed vectors)
+    """
+    outputs = session.MyCustomCalculationsBatch(vectors)
+    if not isinstance(outputs, list):
+        outputs = [None] * len(vectors)
+    return outputs, outputs.count(None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run GoldQC over a CSV or .npy file of input vectors.")
+    parser.add_argument('input', help="CSV or .npy file with one row per input vector in the config element order")
+    parser.add_argument('output', help="CSV file the output vectors are appended to")
+    parser.add_argument('--config', default="GoldQC.config", help="GoldQC config file (default GoldQC.config)")
+    parser.add_argument('--chunk-size', type=int, default=100, help="vectors run per PHREEQC call (default 100)")
+    parser.add_argument('--offset', type=int, default=0, help="number of input rows to skip")
+    parser.add_argument('--resume', action='store_true', help="skip the rows already in the output file")
+    parser.add_argument('--header', action='store_true', help="the CSV input has a header row; one is also "
+                                                               "written to the output")
+    args = parser.parse_args(argv)
+
+    session = GoldQC.GoldQCSession(args.config)
+    if session.InitialChecks():
+        exit("Error: GoldQC could not be initialised. Check the log file %s" % session.LOG_FILE_NAME)
+    # Rows are independent records rather than steps of GoldSim cells, so none is skipped or warm started from the
+    # row before.
+    session.STEP_SKIPPER = None
+    session.WARM_START = None
+
+    offset = count_rows(args.output, args.header) if args.resume else args.offset
+    if args.input.lower().endswith('.npy'):
+        vectors = read_npy(args.input, offset)
+    else:
+        vectors = read_csv(args.input, offset, args.header)
+
+    # Starting a new output file unless continuing from a previous run.
+    mode = 'ab' if offset and os.path.isfile(args.output) else 'wb'
+    done = 0
+    failed = 0
+    start = last_report = time.time()
+    with open(args.output, mode) as f:
+        writer = csv.writer(f)
+        if args.header and mode == 'wb':
+            writer.writerow(session.ELEMENTS)
+        for chunk in chunks(vectors, args.chunk_size):
+            outputs, chunk_failed = run_chunk(chunk, session)
+            writer.writerows([output if output is not None else ['nan'] * len(session.ELEMENTS)
+                              for output in outputs])
+            f.flush()
+            done += len(chunk)
+            failed += chunk_failed
+            if time.time() - last_report > REPORT_INTERVAL:
+                last_report = time.time()
+                print "%d rows done (offset %d), %.1f rows/s" % (done, offset + done, done / (last_report - start))
+                sys.stdout.flush()
+
+    elapsed = max(time.time() - start, 1e-9)
+    summary = "Batch driver: %d rows from offset %d in %.1f s, %.1f rows/s, %d failed.\n" % \
+              (done, offset, elapsed, done / elapsed, failed)
+    print summary,
+    session.write_log(summary)
+    session.WrapUpStuff()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: Benchmarks.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Benchmarks GoldQC's own per step overhead (input building, output conversion, caching and logging) by running
+CustomCalculations against a fake PHREEQC engine that replays realistic selected output tables, so the chemistry
+itself is excluded. Stages cover 8 to 60 elements, with and without pH and charge balancing, debug levels 0 to 2
+and single step and batch shapes. Startup stages time importing GoldQC and the CalcInputs and InitialChecks calls
+GoldSim makes before the first step, each in a new interpreter, with CalcInputs, which parses the config, timed with
+and without the cached config. Round trip stages time a fake engine run and selected output read in process and
+through the engine server.
+
+Usage: python Benchmarks.py [--save results.json] [--compare baseline.json [--threshold 1.25]]
+Comparing against a saved run exits with status 1 if any stage's median or 90th percentile latency regressed by
+more than the threshold ratio.
+"""
+# ===========================================================================
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from timeit import default_timer
+
+import GoldQC
+from Conversions import MOLAR_MASS_LIST
+from EngineServer import EngineServer
+from Engines import FakeEngine
+from SolutionTemplate import SolutionTemplate
+
+ELEMENT_COUNTS = (8, 15, 30, 60)
+DEBUG_LEVELS = (0, 1, 2)
+BATCH_SIZE = 20
+CHARGE_ELEMENT = 'Cl'
+# Common elements first so the smaller stages look like typical GoldQC models.
+COMMON_ELEMENTS = ['Ca', 'Mg', 'Na', 'K', 'Cl', 'S(6)', 'Al', 'Fe', 'Mn', 'Br', 'Si', 'Sr', 'Ba', 'Zn', 'Cu']
+STARTUP_RUNS = 20
+ROUND_TRIP_STEPS = 2000
+STARTUP_ELEMENTS = 8
+# Run in a new interpreter for every sample so nothing is already imported.
+STARTUP_SCRIPT = """
+import json
+from timeit import default_timer
+begin = default_timer()
+import GoldQC
+imported = default_timer()
+GoldQC.CalcInputs()
+inputs = default_timer()
+status = GoldQC.InitialChecks()
+checked = default_timer()
+GoldQC.WrapUpStuff()
+print json.dumps({'import': imported - begin, 'CalcInputs': inputs - imported, 'InitialChecks': checked - inputs,
+                  'status': status})
+"""
+
+
+class ReplayEngine(FakeEngine):
+    """
+    FakeEngine that only simulates the first input with each number of solutions and replays that output for
+    later inputs, so benchmark timings measure GoldQC rather than the fake engine's parsing.
+    """
+
+    def __init__(self):
+        FakeEngine.__init__(self)
+        self._tables = {}
+
+    def RunString(self, input_string):
+        count = input_string.count('END\n')
+        if count not in self._tables:
+            FakeEngine.RunString(self, input_string)
+            self._tables[count] = self._output
+        self.run_count += 1
+        self._output = self._tables[count]
+
+
+def benchmark_elements(count, ph):
+    """
+    :return: a deterministic element list of the given length, with pH as the third element if ph is True.
+    """
+    others = sorted([e for e in MOLAR_MASS_LIST if e not in COMMON_ELEMENTS and e not in ('H', 'O')],
+                    key=lambda e: MOLAR_MASS_LIST[e])
+    elements = (COMMON_ELEMENTS + others)[:count - 1 if ph else count]
+    if ph:
+        elements.insert(2, 'pH')
+    return elements
+
+
+def write_database(path, elements):
+    """
+    Writes a minimal PHREEQC database defining the benchmark elements and the default Gypsum phase.
+    """
+    with open(path, 'w') as database:
+        database.write("SOLUTION_MASTER_SPECIES\n")
+        for element in elements:
+            if element != 'pH':
+                database.write("%s\t%s\t0\t%s\t%s\n" % (element, element, element, MOLAR_MASS_LIST[element]))
+        database.write("PHASES\nGypsum\n\tCaSO4:2H2O = Ca+2 + SO4-2 + 2 H2O\n\tlog_k\t-4.58\nEND\n")
+
+
+def percentile(ordered, fraction):
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def memory_tracker():
+    """
+    :return: (name, start, stop) where stop returns the named memory statistic since start: the peak traced bytes
+             when the interpreter has tracemalloc, otherwise the growth in objects tracked by the garbage collector,
+             which counts the container objects a stage retained rather than its allocations.
+    """
+    try:
+        import tracemalloc
+    except ImportError:
+        def start():
+            gc.collect()
+            return len(gc.get_objects())
+
+        def stop(begin):
+            return len(gc.get_objects()) - begin
+        return 'retained_objects', start, stop
+
+    def start():
+        tracemalloc.start()
+        return 0
+
+    def stop(begin):
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+    return 'peak_bytes', start, stop
+
+
+def run_stage(directory, count, ph, charge, debug_level, batch, steps, projection=False):
+    """
+    Runs a single benchmark stage and returns its latency and memory statistics.
+    """
+    elements = benchmark_elements(count, ph)
+    db_path = os.path.join(directory, 'benchmark.dat')
+    write_database(db_path, elements)
+
+    # Configuring a new session as parseConfig would, with every cache and the engine pool disabled.
+    session = GoldQC.GoldQCSession()
+    session.ELEMENTS = list(elements)
+    session.DB_PATH = db_path
+    session.LOG_FILE_NAME = os.path.join(directory, 'benchmark.log')
+    session.ENGINE_BACKEND = 'fake'
+    session.DEBUG_LEVEL = debug_level
+    session.CHARGE = CHARGE_ELEMENT if charge else None
+    session.EQ_OPTIONS = [["Gypsum", 0, 0]]
+    session.CACHE_SIZE = 0
+    session.CACHE_DIRECTORY = ''
+    session.POOL_SIZE = 0
+    session.PROJECTION = projection
+    session.IN_VAR_LIST = [[count, GoldQC.VECTOR_TYPE, "inputVector"]]
+    session.RET_VAR_LIST = [[count, GoldQC.VECTOR_TYPE, "outputVector"]]
+    if session.InitialChecks():
+        raise RuntimeError("GoldQC could not be initialised, see %s" % session.LOG_FILE_NAME)
+    session.PHREEQC = ReplayEngine()
+    session.PHREEQC.LoadDatabase(db_path)
+
+    generator = random.Random(count)
+    vectors = [[generator.uniform(0.01, 500.0) for _ in elements] for _ in range(steps)]
+    size = BATCH_SIZE if batch else 1
+    # Warming up so the output map and replayed tables are built before timing.
+    session.MyCustomCalculationsBatch(vectors[:size])
+
+    latencies = []
+    memory, start_memory, stop_memory = memory_tracker()
+    used = start_memory()
+    for i in range(0, steps, size):
+        chunk = vectors[i:i + size]
+        begin = default_timer()
+        if batch:
+            session.MyCustomCalculationsBatch(chunk)
+        else:
+            session.CustomCalculations(chunk[0], count)
+        latencies.append((default_timer() - begin) / len(chunk))
+    used = stop_memory(used)
+
+    if session.ERRORS:
+        raise RuntimeError("GoldQC reported errors, see %s" % session.LOG_FILE_NAME)
+    session.WrapUpStuff()
+
+    latencies.sort()
+    return {'p50_us': 1e6 * percentile(latencies, 0.5), 'p90_us': 1e6 * percentile(latencies, 0.9),
+            'p99_us': 1e6 * percentile(latencies, 0.99), 'max_us': 1e6 * latencies[-1],
+            'mean_us': 1e6 * sum(latencies) / len(latencies), memory: used, 'steps': steps}
+
+
+def latency_stats(latencies):
+    """
+    :return: dictionary of the latency percentiles in microseconds.
+    """
+    latencies = sorted(latencies)
+    return {'p50_us': 1e6 * percentile(latencies, 0.5), 'p90_us': 1e6 * percentile(latencies, 0.9),
+            'p99_us': 1e6 * percentile(latencies, 0.99), 'max_us': 1e6 * latencies[-1],
+            'mean_us': 1e6 * sum(latencies) / len(latencies), 'steps': len(latencies)}
+
+
+def run_startup(directory, runs):
+    """
+    Times importing GoldQC and the calls GoldSim makes before the first step, each in a new interpreter.
+
+    :return: dictionary of startup stage name to latency statistics
+    """
+    elements = benchmark_elements(STARTUP_ELEMENTS, True)
+    db_path = os.path.join(directory, 'benchmark.dat')
+    write_database(db_path, elements)
+    config_path = os.path.join(directory, 'GoldQC.config')
+    with open(config_path, 'w') as config:
+        config.write("[phreeqc]\ndatabase= %s\nengine= fake\n\n[GoldSim]\nelements= %r\n\n[GoldQC]\n"
+                     "log_file= %s\n" % (db_path, elements, os.path.join(directory, 'startup.log')))
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.abspath(__file__))] +
+                                                [p for p in [os.environ.get('PYTHONPATH')] if p])
+
+    def sample(cached):
+        if not cached and os.path.isfile(config_path + '.cache'):
+            os.remove(config_path + '.cache')
+        output = subprocess.check_output([sys.executable, '-c', STARTUP_SCRIPT], cwd=directory, env=environment)
+        timings = json.loads(output.strip().splitlines()[-1])
+        if timings['status']:
+            raise RuntimeError("GoldQC could not be initialised, see %s" % os.path.join(directory, 'startup.log'))
+        return timings
+
+    # The first run writes the database index, which later runs reuse as they would in GoldSim.
+    sample(True)
+    uncached = [sample(False)['CalcInputs'] for _ in range(runs)]
+    cached = [sample(True) for _ in range(runs)]
+    return {'startup_import': latency_stats([timings['import'] for timings in cached]),
+            'startup_CalcInputs_uncached_config': latency_stats(uncached),
+            'startup_CalcInputs': latency_stats([timings['CalcInputs'] for timings in cached]),
+            'startup_InitialChecks': latency_stats([timings['InitialChecks'] for timings in cached])}
+
+
+def run_round_trip(directory, steps):
+    """
+    Times running a single step input and reading its selected output on an in process fake engine and on a fake
+    engine in the engine server.
+
+    :return: dictionary of round trip stage name to latency statistics
+    """
+    elements = benchmark_elements(STARTUP_ELEMENTS, True)
+    db_path = os.path.join(directory, 'benchmark.dat')
+    write_database(db_path, elements)
+    template = SolutionTemplate(elements, '\ttemp\t\t25\n\tpe\t\t\t4\n\tredox\t\tpe\n',
+                                'EQUILIBRIUM_PHASES\n\tGypsum\t0\t0\n',
+                                "".join(['%s ' % e for e in elements if e != 'pH']), None, '7', True)
+    generator = random.Random(steps)
+    input_strings = [template.render_batch([(1, [generator.uniform(0.01, 500.0) for _ in elements])])
+                     for _ in range(steps)]
+    results = {}
+    server = EngineServer('fake')
+    try:
+        for name, engine in (('round_trip_in_process', FakeEngine()), ('round_trip_server', server)):
+            engine.LoadDatabase(db_path)
+            latencies = []
+            for input_string in input_strings:
+                begin = default_timer()
+                engine.RunString(input_string)
+                engine.GetSelectedOutputArray()
+                latencies.append(default_timer() - begin)
+            results[name] = latency_stats(latencies)
+    finally:
+        server.close()
+    return results
+
+
+def stage_name(count, ph, charge, debug_level, batch):
+    return "e%d_%s_%s_debug%d_%s" % (count, 'pH' if ph else 'nopH', 'charge' if charge else 'nocharge',
+                                     debug_level, 'batch' if batch else 'single')
+
+
+def compare(results, baseline, threshold):
+    """
+    :return: list of descriptions of the stages whose median or 90th percentile regressed past the threshold.
+    """
+    regressions = []
+    for name, stage in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for key in ('p50_us', 'p90_us'):
+            if stage[key] > previous[key] * threshold:
+                regressions.append("%s %s: %.1f us vs %.1f us baseline (%.2fx)" %
+                                   (name, key, stage[key], previous[key], stage[key] / previous[key]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GoldQC's per step overhead with a fake PHREEQC engine.")
+    parser.add_argument('--steps', type=int, default=500, help="steps timed per stage (default 500)")
+    parser.add_argument('--elements', type=int, nargs='+', default=ELEMENT_COUNTS, help="element counts to run")
+    parser.add_argument('--debug-levels', type=int, nargs='+', default=DEBUG_LEVELS, help="debug levels to run")
+    parser.add_argument('--projection', action='store_true', help="request only the selected output columns "
+                                                                   "GoldQC uses")
+    parser.add_argument('--startup-runs', type=int, default=STARTUP_RUNS,
+                        help="new interpreters started per startup stage, 0 to skip them (default %d)" % STARTUP_RUNS)
+    parser.add_argument('--round-trip-steps', type=int, default=ROUND_TRIP_STEPS,
+                        help="steps timed per round trip stage, 0 to skip them (default %d)" % ROUND_TRIP_STEPS)
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON results from a previous run to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="latency ratio to the baseline counted as a regression (default 1.25)")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix='goldqc_benchmark_')
+    results = {}
+    try:
+        memory = memory_tracker()[0]
+        print "%-40s %10s %10s %10s %10s %16s" % ('stage', 'p50 us', 'p90 us', 'p99 us', 'max us',
+                                                  memory.replace('_', ' '))
+        for count in args.elements:
+            for ph in (False, True):
+                for charge in (False, True):
+                    for debug_level in args.debug_levels:
+                        for batch in (False, True):
+                            name = stage_name(count, ph, charge, debug_level, batch)
+                            stage = run_stage(directory, count, ph, charge, debug_level, batch, args.steps,
+                                              args.projection)
+                            results[name] = stage
+                            print "%-40s %10.1f %10.1f %10.1f %10.1f %16d" % \
+                                  (name, stage['p50_us'], stage['p90_us'], stage['p99_us'], stage['max_us'],
+                                   stage[memory])
+                            sys.stdout.flush()
+        extra = {}
+        if args.startup_runs > 0:
+            extra.update(run_startup(directory, args.startup_runs))
+        if args.round_trip_steps > 0:
+            extra.update(run_round_trip(directory, args.round_trip_steps))
+        results.update(extra)
+        for name, stage in sorted(extra.items()):
+            print "%-40s %10.1f %10.1f %10.1f %10.1f" % \
+                  (name, stage['p50_us'], stage['p90_us'], stage['p99_us'], stage['max_us'])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'stages': results},
+                      f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['stages']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print "\nRegressions past %.2fx:" % args.threshold
+            for regression in regressions:
+                print "\t%s" % regression
+            exit(1)
+        print "\nNo regressions past %.2fx." % args.threshold
+
+
+if __name__ == "__main__":
+    main()
@@ -161,3 +161,14 @@ ELEMENT_SYMBOLS = {
     "alk": "Alkalinity",
     "Alk": "Alkalinity",
 }
+
+
+def molar_masses(elements):
+    """
+    Looks up the molar masses for a list of PHREEQC element names.
+
+    :param elements: list of element symbols in PHREEQC format e.g. ["Ca", "S(6)"]
+
+    :return: list of molar masses in the same order as elements
+    """
+    return [MOLAR_MASS_LIST[element] for element in elements]
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: DatabaseIndex.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Parses the SOLUTION_MASTER_SPECIES, SOLUTION_SPECIES and PHASES data blocks of a PHREEQC database once and caches
+the result in a small index file, so GoldQC can check element and phase names without re-reading large databases
+every time it is initialised.
+"""
+# ===========================================================================
+import hashlib
+import json
+import os
+import re
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.index'
+
+# PHREEQC keywords are upper case words (with underscores) of three or more letters starting in the first column.
+KEYWORD = re.compile(r'^([A-Z][A-Z_]{2,})(\s|$)')
+
+
+class DatabaseIndex(object):
+    """
+    Names defined in a PHREEQC database, held in sets for constant time lookups.
+
+    Element (master species) and solution species names are case sensitive, phase names are not, as in PHREEQC.
+    """
+
+    def __init__(self, master_species, phases, solution_species):
+        """
+        :param master_species: element names from SOLUTION_MASTER_SPECIES e.g. "Ca", "S(6)", "Alkalinity".
+        :param phases: phase names from PHASES e.g. "Gypsum".
+        :param solution_species: species defined in SOLUTION_SPECIES e.g. "CaSO4".
+        """
+        self.master_species = frozenset(master_species)
+        self.phases = frozenset(phases)
+        self.solution_species = frozenset(solution_species)
+        self._phases_lower = frozenset(phase.lower() for phase in self.phases)
+
+    def has_element(self, element):
+        return element in self.master_species
+
+    def has_phase(self, phase):
+        return phase.lower() in self._phases_lower
+
+    def has_species(self, species):
+        return species in self.solution_species
+
+    def to_dict(self):
+        return {'master_species': sorted(self.master_species), 'phases': sorted(self.phases),
+                'solution_species': sorted(self.solution_species)}
+
+
+def parse_database(db_path):
+    """
+    Reads the names defined in a PHREEQC database file.
+
+    :param db_path: path to the PHREEQC database.
+
+    :return: DatabaseIndex
+    """
+    sections = {'SOLUTION_MASTER_SPECIES': set(), 'PHASES': set(), 'SOLUTION_SPECIES': set()}
+    names = None
+    with open(db_path, 'r') as database:
+        for line in database:
+            # Removing comments, which run from a # to the end of the line.
+            line = line.split('#', 1)[0].rstrip()
+            if not line:
+                continue
+            keyword = KEYWORD.match(line)
+            if keyword:
+                names = sections.get(keyword.group(1))
+                continue
+            # Definitions start in the first column, indented lines are their options.
+            if names is None or line[0].isspace():
+                continue
+            if names is sections['SOLUTION_SPECIES']:
+                # A reaction defines the first species on its right hand side.
+                products = line.split('=', 1)[-1].split()
+                if products:
+                    names.add(products[0])
+            else:
+                names.add(line.split()[0])
+    return DatabaseIndex(sections['SOLUTION_MASTER_SPECIES'], sections['PHASES'], sections['SOLUTION_SPECIES'])
+
+
+def file_hash(path):
+    """
+    :return: sha1 hex digest of a file's contents.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_database_index(db_path, index_path=None):
+    """
+    Loads the index for a PHREEQC database from its index file, parsing the database and rewriting the index file
+    if the database has changed. The database is only hashed when its modification time or size differs from the
+    index, so an unchanged database is not read at all. Failing to write the index file is not an error.
+
+    :param db_path: path to the PHREEQC database.
+    :param index_path: path of the index file, defaults to the database file name plus INDEX_SUFFIX in the
+                       current directory as database directories are often read only.
+
+    :return: DatabaseIndex
+    """
+    if index_path is None:
+        index_path = os.path.basename(db_path) + INDEX_SUFFIX
+    stat = os.stat(db_path)
+    identity = {'version': INDEX_VERSION, 'path': os.path.abspath(db_path), 'mtime': stat.st_mtime,
+                'size': stat.st_size}
+
+    cached = None
+    try:
+        with open(index_path, 'r') as f:
+            cached = json.load(f)
+    except (IOError, OSError, ValueError):
+        pass
+
+    if cached and all(cached.get(key) == value for key, value in identity.items()):
+        return DatabaseIndex(cached['master_species'], cached['phases'], cached['solution_species'])
+
+    # The modification time can change without the contents changing, e.g. when the database is copied.
+    identity['sha1'] = file_hash(db_path)
+    if cached and cached.get('version') == INDEX_VERSION and cached.get('sha1') == identity['sha1']:
+        index = DatabaseIndex(cached['master_species'], cached['phases'], cached['solution_species'])
+    else:
+        index = parse_database(db_path)
+
+    contents = index.to_dict()
+    contents.update(identity)
+    try:
+        with open(index_path, 'w') as f:
+            json.dump(contents, f)
+    except (IOError, OSError):
+        pass
+    return index
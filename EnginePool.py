@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: EnginePool.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Runs PHREEQC input strings across a pool of worker processes, each with its own PHREEQC engine and loaded
+database, so independent solutions can be evaluated in parallel instead of serially on a single engine.
+"""
+# ===========================================================================
+import multiprocessing
+import time
+from collections import deque
+
+from Engines import create_engine
+
+# Seconds to wait on results before checking for crashed workers.
+POLL_INTERVAL = 0.5
+# Number of times a task is retried after the worker running it crashed.
+MAX_TASK_RETRIES = 2
+
+
+def _worker_main(worker_index, db_path, engine_factory, task_queue, result_conn, ready, ready_flags):
+    """
+    Worker process loop. Runs (run id, task index, input string) tasks until a None task is received.
+
+    Results are sent on the worker's own result connection as (run id, task index, output, error, warning, seconds
+    spent). The worker's ready flag is set and the shared ready semaphore released before each result is sent so
+    the pool can wait on every worker at once and large results are not held up by a full pipe.
+    """
+    engine = engine_factory()
+    engine.LoadDatabase(db_path)
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        run_id, task_index, input_string = task
+        start = time.time()
+        error = ''
+        # noinspection PyBroadException
+        try:
+            engine.RunString(input_string)
+        except Exception:
+            error = engine.GetErrorString() or 'PHREEQC RunString failed with no error message.\n'
+        warning = engine.GetWarningString()
+        output = engine.GetSelectedOutputArray()
+        if output:
+            output = tuple(tuple(row) for row in output)
+        result = (run_id, task_index, output, error, warning, time.time() - start)
+        ready_flags[worker_index] = 1
+        ready.release()
+        result_conn.send(result)
+
+
+class EnginePool(object):
+    """
+    A fixed size pool of worker processes each owning a PHREEQC engine.
+
+    Every worker has its own task queue so the pool always knows which task a worker is running; if a worker
+    dies the task is handed to a restarted worker. Results are returned in the order the input strings were given.
+
+    Every worker also has its own result pipe, so stopping a worker that has run over its time budget can only
+    break the pipe that is replaced along with it. Tasks carry the id of the run they belong to and results from
+    an earlier run are dropped.
+    """
+
+    def __init__(self, size, db_path, engine_factory=create_engine):
+        """
+        :param size: number of worker processes to start.
+        :param db_path: PHREEQC database loaded by every worker.
+        :param engine_factory: picklable callable returning a PHREEQC engine, @see Engines.create_engine.
+        """
+        self.size = size
+        self.db_path = db_path
+        self.engine_factory = engine_factory
+        self.restarts = 0
+        self.timeouts = 0
+        self.tasks_done = [0] * size
+        self.busy_time = [0.0] * size
+        self.started = time.time()
+        self._run_id = 0
+        self._ready = multiprocessing.Semaphore(0)
+        self._ready_flags = multiprocessing.RawArray('b', size)
+        self._workers = [None] * size
+        for index in range(size):
+            self._start_worker(index)
+
+    def _start_worker(self, index):
+        if self._workers[index] is not None:
+            self._workers[index][2].close()
+        task_queue = multiprocessing.Queue()
+        result_conn, worker_conn = multiprocessing.Pipe(duplex=False)
+        self._ready_flags[index] = 0
+        process = multiprocessing.Process(target=_worker_main,
+                                          args=(index, self.db_path, self.engine_factory, task_queue, worker_conn,
+                                                self._ready, self._ready_flags))
+        process.daemon = True
+        process.start()
+        # Only the worker writes to its pipe, closing this end lets a read fail if the worker dies.
+        worker_conn.close()
+        self._workers[index] = (process, task_queue, result_conn)
+
+    def run(self, input_strings, timeout=None):
+        """
+        Runs input strings across the pool.
+
+        :param input_strings: list of PHREEQC input strings.
+        :param timeout: seconds an input may run before its worker is stopped and restarted and the input reported
+            as failed, None for no limit. Checked every POLL_INTERVAL.
+
+        :return: list of (selected output, error string, warning string) in the same order as input_strings.
+        """
+        self._run_id += 1
+        results = [None] * len(input_strings)
+        retries = [0] * len(input_strings)
+        pending = deque(enumerate(input_strings))
+        idle = range(self.size)
+        in_flight = {}
+        started = {}
+
+        while pending or in_flight:
+            while pending and idle:
+                worker = idle.pop()
+                task = pending.popleft()
+                self._workers[worker][1].put((self._run_id,) + task)
+                in_flight[worker] = task
+                started[worker] = time.time()
+            if timeout is not None:
+                self._stop_overdue(in_flight, started, idle, results, timeout)
+            self._ready.acquire(True, POLL_INTERVAL)
+            received = self._receive(in_flight)
+            if not received:
+                self._restart_crashed(in_flight, pending, idle, retries, results)
+                continue
+            for worker, (run_id, task_index, output, error, warning, elapsed) in received:
+                if run_id != self._run_id or in_flight[worker][0] != task_index:
+                    # Result from an earlier run, or a task that was already re-queued.
+                    continue
+                del in_flight[worker]
+                idle.append(worker)
+                results[task_index] = (output, error, warning)
+                self.tasks_done[worker] += 1
+                self.busy_time[worker] += elapsed
+        return results
+
+    def _receive(self, in_flight):
+        """
+        Reads the results of the busy workers that have flagged one as ready.
+
+        :return: list of (worker index, result) pairs
+        """
+        received = []
+        for worker in in_flight.keys():
+            if not self._ready_flags[worker]:
+                continue
+            self._ready_flags[worker] = 0
+            try:
+                received.append((worker, self._workers[worker][2].recv()))
+            except EOFError:
+                # The worker died before sending its result, it is restarted by _restart_crashed.
+                pass
+        return received
+
+    def _restart_crashed(self, in_flight, pending, idle, retries, results):
+        """
+        Restarts any worker that has died while running a task, re-queuing the task unless it has already
+        crashed a worker MAX_TASK_RETRIES times.
+        """
+        for worker, task in in_flight.items():
+            if self._workers[worker][0].is_alive():
+                continue
+            self.restarts += 1
+            self._start_worker(worker)
+            del in_flight[worker]
+            idle.append(worker)
+            task_index = task[0]
+            if retries[task_index] < MAX_TASK_RETRIES:
+                retries[task_index] += 1
+                pending.appendleft(task)
+            else:
+                results[task_index] = (None, 'PHREEQC worker process crashed running this input.\n', '')
+
+    def _stop_overdue(self, in_flight, started, idle, results, timeout):
+        """
+        Stops and restarts any worker that has been running its task for longer than timeout seconds, failing
+        the task.
+        """
+        now = time.time()
+        for worker, task in in_flight.items():
+            if now - started[worker] < timeout:
+                continue
+            process = self._workers[worker][0]
+            process.terminate()
+            process.join()
+            self.timeouts += 1
+            self._start_worker(worker)
+            del in_flight[worker]
+            idle.append(worker)
+            results[task[0]] = (None, 'PHREEQC run stopped after exceeding its %g s time budget.\n' % timeout, '')
+
+    def close(self):
+        """
+        Stops all worker processes.
+
+        :return: None
+        """
+        for process, task_queue, result_conn in self._workers:
+            task_queue.put(None)
+        for process, task_queue, result_conn in self._workers:
+            process.join(POLL_INTERVAL * 4)
+            if process.is_alive():
+                process.terminate()
+            result_conn.close()
+
+    def summary(self):
+        """
+        :return: Per worker utilisation summary for the log file.
+        """
+        wall_time = max(time.time() - self.started, 1e-9)
+        summary = "Engine pool: %d workers, %d restarts, %d timeouts.\n" % (self.size, self.restarts, self.timeouts)
+        for index in range(self.size):
+            summary += "\tWorker %d: %d runs, %.2f s busy, %.1f%% utilisation\n" % \
+                       (index, self.tasks_done[index], self.busy_time[index],
+                        100.0 * self.busy_time[index] / wall_time)
+        return summary
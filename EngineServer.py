@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: EngineServer.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Runs the PHREEQC engine in a long lived local server process so an engine crash does not take down GoldSim. Steps
+are exchanged through a ring of fixed size shared memory buffers, text for the input string and doubles for the
+selected output, with only small fixed size messages on a pipe to signal each request and response, so nothing is
+pickled per step. The server is restarted automatically if it dies.
+"""
+# ===========================================================================
+import multiprocessing
+import struct
+from array import array
+from multiprocessing.sharedctypes import RawArray
+
+from Engines import EngineError, create_engine
+
+# Request messages: (command, slot, length of the input string or database path).
+REQUEST = struct.Struct('<iii')
+# Response messages: (slot, failed, length of the text, rows, columns).
+RESPONSE = struct.Struct('<iiiii')
+COMMAND_STOP = 0
+COMMAND_LOAD = 1
+COMMAND_RUN = 2
+# Seconds to wait on a response before checking whether the server has died.
+POLL_INTERVAL = 0.5
+# Separates the error, warning and headings and the text cells in the response text.
+FIELD_SEPARATOR = '\x00'
+
+
+def encode_output(output, numbers):
+    """
+    Writes a selected output array to a double buffer, text cells as NaN with their values kept separately.
+
+    :param output: @see Dispatch.getSelectedOutputArray()
+    :param numbers: double buffer, rows after the headings are written row by row if they fit.
+
+    :return: (headings, text cells as 'row\\tcolumn\\tvalue' lines, rows, columns, array of the values if they
+             did not fit in numbers or None)
+    """
+    if not output:
+        return (), '', 0, 0, None
+    headings = output[0]
+    rows = len(output) - 1
+    columns = len(headings)
+    values = array('d', [0.0]) * (rows * columns)
+    text_cells = []
+    nan = float('nan')
+    for r, row in enumerate(output[1:]):
+        for c, value in enumerate(row):
+            if isinstance(value, (int, long, float)) and not isinstance(value, bool):
+                values[r * columns + c] = value
+            else:
+                values[r * columns + c] = nan
+                text_cells.append('%d\t%d%s' % (r, c, '' if value is None else '\t%s' % value))
+    if len(values) > len(numbers):
+        return headings, '\n'.join(text_cells), rows, columns, values
+    numbers[:len(values)] = values
+    return headings, '\n'.join(text_cells), rows, columns, None
+
+
+def decode_output(headings, text_cells, rows, columns, values):
+    """
+    :return: the selected output array written by encode_output.
+    """
+    if not columns:
+        return ()
+    table = [list(values[r * columns:(r + 1) * columns]) for r in range(rows)]
+    for line in text_cells.split('\n') if text_cells else ():
+        cell = line.split('\t', 2)
+        table[int(cell[0])][int(cell[1])] = cell[2] if len(cell) > 2 else None
+    return (tuple(headings),) + tuple([tuple(row) for row in table])
+
+
+def _server_main(backend, library, texts, numbers, requests, responses):
+    """
+    Server process loop, running requests until a stop command is received.
+
+    Input strings longer than the slot's text buffer, and outputs larger than its double buffer, follow their
+    message on the pipe instead.
+    """
+    engine = create_engine(backend, library)
+    while True:
+        command, slot, length = REQUEST.unpack(requests.recv_bytes())
+        if command == COMMAND_STOP:
+            break
+        text = texts[slot]
+        request = requests.recv_bytes() if length > len(text) else text[:length]
+        error = ''
+        # noinspection PyBroadException
+        try:
+            if command == COMMAND_LOAD:
+                engine.LoadDatabase(request)
+            else:
+                engine.RunString(request)
+        except Exception as e:
+            error = engine.GetErrorString() or str(e) or 'PHREEQC %s failed with no error message.\n' % \
+                ('LoadDatabase' if command == COMMAND_LOAD else 'RunString')
+        output = engine.GetSelectedOutputArray() if command == COMMAND_RUN else ()
+        headings, text_cells, rows, columns, values = encode_output(output, numbers[slot])
+        reply = FIELD_SEPARATOR.join([error, engine.GetWarningString() or '', '\t'.join(headings), text_cells])
+        if len(reply) <= len(text):
+            text[:len(reply)] = reply
+        responses.send_bytes(RESPONSE.pack(slot, 1 if error else 0, len(reply), rows, columns))
+        if len(reply) > len(text):
+            responses.send_bytes(reply)
+        if values is not None:
+            responses.send_bytes(values.tostring())
+
+
+class EngineServer(object):
+    """
+    PHREEQC engine with the IPhreeqc COM interface that runs in a server process.
+
+    Each request uses the next slot of the ring. The selected output is only decoded from the slot's double buffer
+    when it is read, and GetSelectedOutputLastRows copies the equilibrated rows straight from it. If the server dies
+    while running an input it is restarted, the database is loaded again and EngineError is raised for that input.
+    """
+
+    def __init__(self, backend='com', library=None, slots=2, buffer_size=1 << 20):
+        """
+        :param backend: engine backend run by the server, @see Engines.create_engine.
+        :param library: IPhreeqc shared library for the ctypes backend.
+        :param slots: number of buffer pairs in the ring.
+        :param buffer_size: size in bytes of each slot's text and double buffers.
+        """
+        self.backend = backend
+        self.library = library
+        self.db_path = None
+        self.restarts = 0
+        self.run_count = 0
+        self._texts = [RawArray('c', buffer_size) for _ in range(max(slots, 1))]
+        self._numbers = [RawArray('d', buffer_size // 8) for _ in range(max(slots, 1))]
+        self._slot = 0
+        self._error = ''
+        self._warning = ''
+        # (headings, text cells, rows, columns, values) of the last run.
+        self._output = ((), '', 0, 0, ())
+        self._process = None
+        self._start()
+
+    def _start(self):
+        server_requests, self._requests = multiprocessing.Pipe(False)
+        self._responses, server_responses = multiprocessing.Pipe(False)
+        self._process = multiprocessing.Process(target=_server_main,
+                                                args=(self.backend, self.library, self._texts, self._numbers,
+                                                      server_requests, server_responses))
+        self._process.daemon = True
+        self._process.start()
+
+    def _restart(self):
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join()
+        self.restarts += 1
+        self._start()
+        if self.db_path is not None:
+            self._request(COMMAND_LOAD, self.db_path)
+
+    def _request(self, command, request):
+        """
+        Sends a request to the server and waits for its response, restarting the server if it dies while running
+        an input.
+
+        :return: failed flag, setting the error and warning strings and output of the last run
+        """
+        if not self._process.is_alive():
+            self._restart()
+        slot = self._slot
+        self._slot = (slot + 1) % len(self._texts)
+        text = self._texts[slot]
+        # The input is in the buffer before the server is signalled.
+        if len(request) <= len(text):
+            text[:len(request)] = request
+        try:
+            self._requests.send_bytes(REQUEST.pack(command, slot, len(request)))
+            if len(request) > len(text):
+                self._requests.send_bytes(request)
+            while not self._responses.poll(POLL_INTERVAL):
+                if not self._process.is_alive():
+                    raise EOFError()
+            slot, failed, length, rows, columns = RESPONSE.unpack(self._responses.recv_bytes())
+            reply = self._responses.recv_bytes() if length > len(text) else text[:length]
+            values = self._numbers[slot]
+            if rows * columns > len(values):
+                values = array('d')
+                values.fromstring(self._responses.recv_bytes())
+        except (EOFError, IOError):
+            # The server died, closing its end of the pipes.
+            self._warning, self._output = '', ((), '', 0, 0, ())
+            self._error = "PHREEQC engine server stopped while running this request.\n"
+            if command == COMMAND_RUN:
+                self._restart()
+                self._error = "PHREEQC engine server stopped while running this input and was restarted.\n"
+            return 1
+        self._error, self._warning, headings, text_cells = reply.split(FIELD_SEPARATOR)
+        self._output = (tuple(headings.split('\t')) if headings else (), text_cells, rows, columns, values)
+        return failed
+
+    def LoadDatabase(self, db_path):
+        if self._request(COMMAND_LOAD, db_path):
+            raise EngineError(self._error)
+        self.db_path = db_path
+
+    def RunString(self, input_string):
+        self.run_count += 1
+        if self._request(COMMAND_RUN, input_string):
+            raise EngineError(self._error)
+
+    def GetErrorString(self):
+        return self._error
+
+    def GetWarningString(self):
+        return self._warning
+
+    def GetSelectedOutputArray(self):
+        return decode_output(*self._output)
+
+    def GetSelectedOutputLastRows(self, buffer):
+        """
+        Copies the last row of each simulation into a float buffer from the shared double buffer, as
+        IPhreeqcLibrary does.
+        """
+        headings, text_cells, rows, columns, values = self._output
+        if not columns:
+            return (), 0
+        last = [row for row in range(rows) if row == rows - 1 or values[row * columns] != values[(row + 1) * columns]]
+        if len(buffer) < len(last) * columns:
+            buffer.extend(array('d', [0.0]) * (len(last) * columns - len(buffer)))
+        for position, row in enumerate(last):
+            buffer[position * columns:(position + 1) * columns] = array('d', values[row * columns:(row + 1) * columns])
+        return headings, len(last)
+
+    def close(self):
+        """
+        Stops the server process.
+
+        :return: None
+        """
+        if self._process is not None and self._process.is_alive():
+            self._requests.send_bytes(REQUEST.pack(COMMAND_STOP, 0, 0))
+            self._process.join(POLL_INTERVAL * 4)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._process = None
+
+    def summary(self):
+        """
+        :return: Summary of the server's runs and restarts for the log file.
+        """
+        return "Engine server: %d runs, %d restarts.\n" % (self.run_count, self.restarts)
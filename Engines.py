@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: Engines.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Provides the PHREEQC engine backends GoldQC can run on. Every backend has the IPhreeqc COM interface used by
+GoldQC (LoadDatabase, RunString, GetSelectedOutputArray, GetErrorString and GetWarningString):
+
+* com: the IPhreeqc COM object (Windows only).
+* ctypes: the IPhreeqc shared library (IPhreeqc.dll or libiphreeqc.so) called directly through ctypes.
+* fake: a pure Python stand in that echoes the solution back, used for testing and benchmarking.
+"""
+# ===========================================================================
+import ctypes
+import os
+from array import array
+from math import log10
+
+from Conversions import MOLAR_MASS_LIST
+
+BACKENDS = ('com', 'ctypes', 'fake')
+
+# Variant types returned by the IPhreeqc library, see Var.h.
+TT_EMPTY = 0
+TT_ERROR = 1
+TT_LONG = 2
+TT_DOUBLE = 3
+TT_STRING = 4
+
+# Longest string read from the selected output by the ctypes backend.
+MAX_STRING_LENGTH = 256
+
+
+class EngineError(Exception):
+    """
+    Raised by the ctypes and fake backends when PHREEQC reports errors, as the COM object does.
+    """
+    pass
+
+
+# Errors raised when an engine can not be created or can not load a database (WindowsError for COM).
+ENGINE_ERRORS = (EnvironmentError, EngineError)
+
+
+def create_engine(backend='com', library=None):
+    """
+    Creates a PHREEQC engine. Defined at module level so it can be passed to worker processes.
+
+    :param backend: one of BACKENDS.
+    :param library: path to the IPhreeqc shared library for the ctypes backend, searched for if not given.
+
+    :return: object with the IPhreeqc COM interface
+    """
+    if backend == 'com':
+        try:
+            from comtypes.client import CreateObject
+        except ImportError as e:
+            raise EngineError("The com PHREEQC engine backend needs the comtypes package (%s). Install comtypes or "
+                              "set engine to ctypes in the config file." % e)
+        return CreateObject('IPhreeqcCOM.Object')
+    if backend == 'ctypes':
+        return IPhreeqcLibrary(library)
+    if backend == 'fake':
+        return FakeEngine()
+    raise EngineError("Unknown PHREEQC engine backend %s, expected one of %s" % (backend, ", ".join(BACKENDS)))
+
+
+class IPhreeqcLibrary(object):
+    """
+    PHREEQC engine calling the IPhreeqc C API directly through ctypes.
+
+    Selected output values are read one at a time with GetSelectedOutputValue2, the only selected output accessor
+    in the C API, into buffers that are reused for every value, avoiding COM marshalling. The values are read column
+    by column into a float buffer rather than a tuple per row.
+    """
+
+    def __init__(self, library=None):
+        """
+        :param library: path to the IPhreeqc shared library, searched for on the system path if not given.
+        """
+        if not library:
+            # ctypes.util is slow to import and only needed to search for the library.
+            import ctypes.util
+            library = ctypes.util.find_library('IPhreeqc') or ctypes.util.find_library('iphreeqc') or \
+                      ('IPhreeqc.dll' if os.name == 'nt' else 'libiphreeqc.so')
+        try:
+            self._lib = ctypes.CDLL(library)
+        except OSError as e:
+            raise EngineError("Could not load the IPhreeqc library %s: %s" % (library, e))
+
+        lib = self._lib
+        lib.CreateIPhreeqc.restype = ctypes.c_int
+        lib.DestroyIPhreeqc.argtypes = [ctypes.c_int]
+        lib.LoadDatabase.argtypes = [ctypes.c_int, ctypes.c_char_p]
+        lib.LoadDatabase.restype = ctypes.c_int
+        lib.RunString.argtypes = [ctypes.c_int, ctypes.c_char_p]
+        lib.RunString.restype = ctypes.c_int
+        lib.GetErrorString.argtypes = [ctypes.c_int]
+        lib.GetErrorString.restype = ctypes.c_char_p
+        lib.GetWarningString.argtypes = [ctypes.c_int]
+        lib.GetWarningString.restype = ctypes.c_char_p
+        lib.GetSelectedOutputRowCount.argtypes = [ctypes.c_int]
+        lib.GetSelectedOutputRowCount.restype = ctypes.c_int
+        lib.GetSelectedOutputColumnCount.argtypes = [ctypes.c_int]
+        lib.GetSelectedOutputColumnCount.restype = ctypes.c_int
+        lib.GetSelectedOutputValue2.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                                ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_double),
+                                                ctypes.c_char_p, ctypes.c_uint]
+        lib.GetSelectedOutputValue2.restype = ctypes.c_int
+
+        self._id = lib.CreateIPhreeqc()
+        if self._id < 0:
+            raise EngineError("Could not create an IPhreeqc instance")
+        self._vtype = ctypes.c_int()
+        self._dvalue = ctypes.c_double()
+        self._svalue = ctypes.create_string_buffer(MAX_STRING_LENGTH)
+        self._buffer = array('d')
+
+    def __del__(self):
+        if getattr(self, '_id', -1) >= 0:
+            self._lib.DestroyIPhreeqc(self._id)
+            self._id = -1
+
+    def LoadDatabase(self, db_path):
+        if self._lib.LoadDatabase(self._id, db_path):
+            raise EngineError(self.GetErrorString())
+
+    def RunString(self, input_string):
+        if self._lib.RunString(self._id, input_string):
+            raise EngineError(self.GetErrorString())
+
+    def GetErrorString(self):
+        return self._lib.GetErrorString(self._id) or ''
+
+    def GetWarningString(self):
+        return self._lib.GetWarningString(self._id) or ''
+
+    def _value(self, row, column):
+        """
+        Reads a single selected output value, row 0 holds the headings.
+        """
+        self._lib.GetSelectedOutputValue2(self._id, row, column, ctypes.byref(self._vtype),
+                                          ctypes.byref(self._dvalue), self._svalue, MAX_STRING_LENGTH)
+        vtype = self._vtype.value
+        if vtype == TT_DOUBLE:
+            return self._dvalue.value
+        if vtype == TT_LONG:
+            return int(self._dvalue.value)
+        if vtype == TT_STRING:
+            return self._svalue.value
+        return None
+
+    def GetSelectedOutputArray(self):
+        """
+        Reads the selected output column by column into a float buffer reused between calls. Values that are not
+        numbers, such as the state column, are read as nan.
+
+        :return: the selected output as the tuple of headings followed by a float array per row, in the same layout
+                 as the COM object.
+        """
+        lib, handle, vtype, dvalue = self._lib, self._id, self._vtype, self._dvalue
+        rows = lib.GetSelectedOutputRowCount(handle)
+        columns = lib.GetSelectedOutputColumnCount(handle)
+        if rows < 1:
+            return ()
+        headings = tuple([self._value(0, column) for column in range(columns)])
+        count = rows - 1
+        buffer = self._buffer
+        if len(buffer) < count * columns:
+            buffer.extend(array('d', [0.0]) * (count * columns - len(buffer)))
+        nan = float('nan')
+        for column in range(columns):
+            position = column
+            for row in range(1, rows):
+                lib.GetSelectedOutputValue2(handle, row, column, ctypes.byref(vtype), ctypes.byref(dvalue),
+                                            self._svalue, MAX_STRING_LENGTH)
+                buffer[position] = dvalue.value if vtype.value in (TT_DOUBLE, TT_LONG) else nan
+                position += columns
+        return (headings,) + tuple([buffer[i * columns:(i + 1) * columns] for i in range(count)])
+
+    def GetSelectedOutputLastRows(self, buffer):
+        """
+        Reads the last row of each simulation, found from the first column, into a float buffer. Only the first
+        column of the other rows is read.
+
+        :param buffer: array('d') reused between calls, extended if it is too small.
+
+        :return: (tuple of headings, number of rows read)
+        """
+        lib, handle, vtype, dvalue = self._lib, self._id, self._vtype, self._dvalue
+        rows = lib.GetSelectedOutputRowCount(handle)
+        columns = lib.GetSelectedOutputColumnCount(handle)
+        headings = tuple([self._value(0, column) for column in range(columns)])
+        first = [self._value(row, 0) for row in range(1, rows)]
+        last = [row for row in range(1, rows) if row == rows - 1 or first[row - 1] != first[row]]
+        if len(buffer) < len(last) * columns:
+            buffer.extend(array('d', [0.0]) * (len(last) * columns - len(buffer)))
+        nan = float('nan')
+        position = 0
+        for row in last:
+            for column in range(columns):
+                lib.GetSelectedOutputValue2(handle, row, column, ctypes.byref(vtype), ctypes.byref(dvalue),
+                                            self._svalue, MAX_STRING_LENGTH)
+                buffer[position] = dvalue.value if vtype.value in (TT_DOUBLE, TT_LONG) else nan
+                position += 1
+        return headings, len(last)
+
+
+class FakeEngine(object):
+    """
+    Pure Python stand in for IPhreeqc for testing and benchmarking GoldQC without PHREEQC.
+
+    Each simulation in the input string gives an initial solution row and an equilibrated row with the default
+    selected output columns, the mass of water (set with -water, 1 kg by default) and the requested totals. Totals
+    are the SOLUTION concentrations converted from mg/L to mol/kgw, so a GoldQC run returns its inputs unchanged.
+    RunString calls are counted in run_count.
+
+    SAVE solution, SOLUTION_MODIFY -pH and -totals, in mol for the solution's mass of water, and USE solution are
+    followed for warm starts, a simulation using a saved solution only gives the equilibrated row. A SELECTED_OUTPUT
+    block with -reset false only gives the sim, pH and mass_H2O columns before the totals. Phases listed with
+    -saturation_indices are given si_ columns after the totals holding a stand in saturation index, the log10 of the
+    sum of the totals, as the fake engine has no phases.
+    """
+
+    # Lines of a SOLUTION block that are not element concentrations.
+    SOLUTION_OPTIONS = ('units', 'density', '-water', 'temp', 'pe', 'redox')
+    HEADINGS = ('sim', 'state', 'soln', 'dist_x', 'time', 'step', 'pH', 'pe', 'mass_H2O')
+    PROJECTED_COLUMNS = (0, 6, 8)
+
+    def __init__(self):
+        self.run_count = 0
+        self.db_path = None
+        self._totals = None
+        self._projected = False
+        self._phases = ()
+        self._solutions = {}
+        self._sim = 0
+        self._output = ()
+        self._error = ''
+        self._warning = ''
+
+    def LoadDatabase(self, db_path):
+        if not os.path.isfile(db_path):
+            self._error = "ERROR: Could not open database file %s\n" % db_path
+            raise EngineError(self._error)
+        self.db_path = db_path
+
+    def RunString(self, input_string):
+        self.run_count += 1
+        self._error = ''
+        self._warning = ''
+        rows = []
+        block = None
+        solution = None
+        modified = None
+        save = None
+        for line in input_string.splitlines():
+            tokens = line.split()
+            if not tokens:
+                continue
+            if not line[0].isspace():
+                block = tokens[0]
+                if block == 'SELECTED_OUTPUT':
+                    self._projected = False
+                    self._phases = ()
+                elif block == 'SOLUTION':
+                    solution = {'number': int(tokens[1]) if len(tokens) > 1 else 1, 'pH': 7.0, 'pe': 4.0,
+                                'water': 1.0, 'values': {}, 'initial': True}
+                elif block == 'SOLUTION_MODIFY':
+                    modified = self._saved(int(tokens[1]))
+                elif block == 'USE' and tokens[1] == 'solution':
+                    saved = self._saved(int(tokens[2]))
+                    solution = dict(saved, values=dict(saved['values']), initial=False)
+                elif block == 'SAVE' and tokens[1] == 'solution':
+                    save = int(tokens[2])
+                elif block == 'END':
+                    if solution is not None:
+                        rows.extend(self._simulate(solution, save))
+                    solution = modified = save = None
+                continue
+            if block == 'SOLUTION' and solution is not None:
+                if tokens[0] in ('pH', 'pe'):
+                    solution[tokens[0]] = float(tokens[1])
+                elif tokens[0] == '-water':
+                    solution['water'] = float(tokens[1])
+                elif tokens[0] not in self.SOLUTION_OPTIONS:
+                    solution['values'][tokens[0]] = float(tokens[1])
+            elif block == 'SOLUTION_MODIFY' and tokens[0] == '-pH':
+                modified['pH'] = float(tokens[1])
+            elif block == 'SOLUTION_MODIFY' and not tokens[0].startswith('-'):
+                modified['values'][tokens[0]] = float(tokens[1]) * 1000.0 * MOLAR_MASS_LIST.get(tokens[0], 1.0) / \
+                    modified['water']
+            elif block == 'SELECTED_OUTPUT' and tokens[0] == '-totals':
+                self._totals = tuple(tokens[1:])
+            elif block == 'SELECTED_OUTPUT' and tokens[0] == '-reset':
+                self._projected = tokens[1].lower() == 'false'
+            elif block == 'SELECTED_OUTPUT' and tokens[0] in ('-saturation_indices', '-si'):
+                self._phases = tuple(tokens[1:])
+        if solution is not None:
+            rows.extend(self._simulate(solution, save))
+        if self._totals is None:
+            self._output = ()
+            return
+        headings = self.HEADINGS + tuple(['%s(mol/kgw)' % total for total in self._totals] +
+                                         ['si_%s' % phase for phase in self._phases])
+        if self._projected:
+            columns = self.PROJECTED_COLUMNS + tuple(range(len(self.HEADINGS), len(headings)))
+            headings = tuple([headings[column] for column in columns])
+            rows = [tuple([row[column] for column in columns]) for row in rows]
+        self._output = (headings,) + tuple(rows)
+
+    def _saved(self, number):
+        """
+        :return: the solution saved as number, raising EngineError if there is none.
+        """
+        if number not in self._solutions:
+            self._error = "ERROR: Solution %d not found.\n" % number
+            self._output = ()
+            raise EngineError(self._error)
+        return self._solutions[number]
+
+    def _simulate(self, solution, save=None):
+        """
+        :return: the initial (unless using a saved solution) and equilibrated selected output rows for a solution.
+        """
+        self._sim += 1
+        if save is not None:
+            self._solutions[save] = dict(solution, number=save, values=dict(solution['values']))
+        totals = tuple([solution['values'].get(total, 0.0) / (1000.0 * MOLAR_MASS_LIST.get(total, 1.0))
+                        for total in self._totals or ()])
+        if self._phases:
+            si = log10(sum(totals)) if sum(totals) > 0 else -999.999
+            totals += (si,) * len(self._phases)
+        initial = (self._sim, 'i_soln', solution['number'], -99, -99, -99, solution['pH'], solution['pe'],
+                   solution['water'])
+        react = (self._sim, 'react', solution['number'], -99, 0.0, 1, solution['pH'], solution['pe'],
+                 solution['water'])
+        return [initial + totals, react + totals] if solution['initial'] else [react + totals]
+
+    def GetErrorString(self):
+        return self._error
+
+    def GetWarningString(self):
+        return self._warning
+
+    def GetSelectedOutputArray(self):
+        return self._output
+
+    def GetSelectedOutputLastRows(self, buffer):
+        """
+        Copies the last row of each simulation into a float buffer, as IPhreeqcLibrary does.
+        """
+        if not self._output:
+            return (), 0
+        rows = self._output[1:]
+        last = [row for i, row in enumerate(rows) if i == len(rows) - 1 or row[0] != rows[i + 1][0]]
+        columns = len(self._output[0])
+        if len(buffer) < len(last) * columns:
+            buffer.extend(array('d', [0.0]) * (len(last) * columns - len(buffer)))
+        position = 0
+        for row in last:
+            for value in row:
+                buffer[position] = value if isinstance(value, (int, long, float)) else float('nan')
+                position += 1
+        return self._output[0], len(last)
@@ -41,241 +41,1477 @@ https://www.goldsim.com/library/models/featurescapabilities/dllscripts/pythondll
 """
 # ===========================================================================
 import datetime
-import re
-from math import log10
+import hashlib
+from array import array
+import marshal
+import sys
+from functools import partial
+from math import ceil
 from ConfigParser import ConfigParser, NoOptionError, NoSectionError
-from collections import OrderedDict
 
-from comtypes.client import CreateObject
-from prettytable import PrettyTable
-
-from Conversions import ELEMENT_SYMBOLS, MOLAR_MASS_LIST
-
-# Module level globals.
+# prettytable and the optional features, such as the engine pool, the caches and warm starts, are imported where
+# they are used or enabled so importing GoldQC, which GoldSim does for every entry point, only loads what every run
+# needs.
+from Conversions import ELEMENT_SYMBOLS
+from DatabaseIndex import load_database_index
+from Engines import ENGINE_ERRORS, create_engine
+from LogWriter import LogWriter
+from MessageCounter import MessageCounter
+from Profiler import timer
+from SolutionTemplate import OutputMap, SolutionTemplate
+
+# Module level constants.
 GOLDQC_VERSION = 0.931
-PHREEQC = None
-STEP = 0
-ERRORS = 0
-WARNINGS = 0
-PHREEQC_SPECS = ''
-EQ_PHASES = ''
-TOTALS = ''
-LOG_FILE_NAME = 'logFile.txt'
-DB_PATH = None
-DEBUG_LEVEL = 0
-SUPPRESS_WARNINGS = False
-USE_CONFIG_PH = True
-
-# PHREEQC variables to be populated by parseConfig
-ELEMENTS = []
-PH = 7
-PE = 4
-REDOX = 'pe'
-TEMP = 25
-CHARGE = None
-EQ_OPTIONS = [["Gypsum", 0, 0]]
-
-# GoldSim specific constants and variables
+# Log file used until a config names one, and by write_log when no config can be read.
+DEFAULT_LOG_FILE = 'logFile.txt'
+
+# GoldSim specific constants
 VECTOR_TYPE = "1-D Array"  # this is vector
+MATRIX_TYPE = "2-D Array"  # this is a matrix with one row per cell
 VAR_CNT_IND = 0  # index of count
 VAR_TYPE_IND = 1  # index for the type
 VAR_DESC_IND = 2  # the index for the description
-IN_VAR_LIST = None
-RET_VAR_LIST = None
 
+# Session attributes set by parseConfig, cached in a file next to the config and reused while the config is unchanged.
+CONFIG_ATTRIBUTES = ('LOG_FILE_NAME', 'DB_PATH', 'DEBUG_LEVEL', 'SUPPRESS_WARNINGS', 'USE_CONFIG_PH',
+                     'LOG_FLUSH_INTERVAL', 'MESSAGE_REPEATS', 'RECORD_FILE',
+                     'LOG_BUFFER_SIZE', 'ENGINE_BACKEND', 'ENGINE_LIBRARY', 'PROFILE', 'PROFILE_FILE', 'CACHE_SIZE',
+                     'CACHE_TOLERANCE', 'CACHE_DIRECTORY', 'CACHE_DISK_SIZE', 'POOL_SIZE', 'POOL_PYTHON',
+                     'SERVER_ENABLED', 'SERVER_SLOTS', 'SERVER_BUFFER_SIZE',
+                     'WARM_START_ENABLED', 'WARM_FALLBACK', 'WARM_REFRESH', 'SURROGATE_FILE', 'SURROGATE_TOLERANCE',
+                     'SURROGATE_CHECK_INTERVAL', 'ELEMENTS', 'PH', 'PE', 'REDOX', 'TEMP', 'CHARGE', 'EQ_OPTIONS',
+                     'CELLS', 'IN_VAR_LIST', 'RET_VAR_LIST', 'PROJECTION', 'RETRY_RUNGS', 'RETRY_BUDGET',
+                     'SKIP_THRESHOLD', 'SKIP_ELEMENT_THRESHOLDS', 'SKIP_REFRESH', 'SKIP_EXTRAPOLATE',
+                     'SPECIATION_FAST_PATH')
+CONFIG_CACHE_VERSION = 1
+
+# Number of the equilibrated solution kept in PHREEQC for warm starts.
+WARM_SOLUTION = 999999
 
-def parseConfig():
-    """
-    Helper function to parse the config file GoldQC.config. This function will read the config file and set the global
-    variables accordingly.
 
-    :return: None
+def split_selected_output(phreeqc_values):
     """
-    global LOG_FILE_NAME, DB_PATH, DEBUG_LEVEL, SUPPRESS_WARNINGS, USE_CONFIG_PH
-    global ELEMENTS, PH, PE, REDOX, TEMP, CHARGE, EQ_OPTIONS
-    global IN_VAR_LIST, RET_VAR_LIST
-    # Parsing config file and sanitising configuration variables
-    config = ConfigParser()
-    conf_check = config.read("GoldQC.config")
-    if not len(conf_check):
-        raise Exception("Error: Config file GoldQC.Config could not be read")
+    Splits the selected output array of a (possibly batched) run into one table per simulation, each in the
+    same (headings, initial solution, equilibrated solution) layout as a single simulation run.
 
-    try:
-        ELEMENTS = config.get("GoldSim", "elements")
-        if not ELEMENTS:
-            exit("Error elements not specified")
-        else:
-            ELEMENTS = eval(ELEMENTS)
-    except SyntaxError:
-        exit("Error parsing elements in config: potentially missing ]")
-    except NameError:
-        exit("Error parsing elements in config: a non-string object was encountered")
-    except NoOptionError:
-        exit("Error Elements are not specified.")
-    if not all(isinstance(item, str) for item in ELEMENTS):
-        exit("Error an element listed in the config is not in string format (double or single quotes)")
-    try:
-        DB_PATH = config.get("phreeqc", "database")
-    except NoSectionError:
-        exit("Error no database file specified.")
-    try:
-        LOG_FILE_NAME = config.get("GoldQC", "log_file")
-    except (NoOptionError, ValueError, NoSectionError):
-        LOG_FILE_NAME = 'GoldQC.log'
-    try:
-        DEBUG_LEVEL = int(config.get("GoldQC", "debug_level"))
-    except (ValueError, NoOptionError, NoSectionError):
-        DEBUG_LEVEL = 0
-    try:
-        t = config.get("GoldQC", "suppress_warnings")
-        if t:
-            SUPPRESS_WARNINGS = eval(t)
-            if not isinstance(SUPPRESS_WARNINGS, bool):
-                SUPPRESS_WARNINGS = False
-        else:
-            SUPPRESS_WARNINGS = False
-    except NoOptionError:
-        SUPPRESS_WARNINGS = False
-    try:
-        t = config.get("GoldQC", "use_Config_pH")
-        if t:
-            USE_CONFIG_PH = eval(t)
-            if not isinstance(USE_CONFIG_PH, bool):
-                USE_CONFIG_PH = True
-    except NoOptionError:
-        USE_CONFIG_PH = True
-    try:
-        PH = config.get("phreeqc", "pH")
-        if not PH:
-            PH = '7'
-    except NoOptionError:
-        PH = 7
-    try:
-        PE = config.get("phreeqc", "pe")
-        if not PE:
-            PE = '4'
-    except NoOptionError:
-        PE = 4
-    try:
-        REDOX = config.get("phreeqc", "redox")
-        if not REDOX:
-            REDOX = 'pe'
-        else:
-            REDOX = eval(REDOX)
-    except NoOptionError:
-        REDOX = 'pe'
-    try:
-        TEMP = config.get("phreeqc", "temp")
-        if not TEMP:
-            TEMP = '25'
-    except NoOptionError:
-        TEMP = 25
-    try:
-        CHARGE = config.get("phreeqc", "charge")
-        if not CHARGE:
-            CHARGE = None
-        else:
-            CHARGE = eval(CHARGE)
-    except NoOptionError:
-        CHARGE = None
-    try:
-        t = config.get("phreeqc", "equilibrium_phases")
-        if t:
-            EQ_OPTIONS = eval(t)
-    except NoOptionError:
-        EQ_OPTIONS = [["Gypsum", 0, 0]]
-    except SyntaxError:
-        exit("Error parsing elements in config: potentially missing ]")
-    except NameError:
-        exit("Error parsing elements in config: a non-string object was encountered")
+    :param phreeqc_values: @see Dispatch.getSelectedOutputArray()
 
-    IN_VAR_LIST = [[len(ELEMENTS), VECTOR_TYPE, "inputVector"]]
-    RET_VAR_LIST = [[len(ELEMENTS), VECTOR_TYPE, "outputVector"]]
+    :return: list of selected output tables in simulation order
+    """
+    headings = phreeqc_values[0]
+    rows = phreeqc_values[1:]
+    if 'sim' not in headings:
+        # Without the sim column each simulation is expected to give an initial and equilibrated row.
+        return [(headings, rows[i], rows[i + 1]) for i in range(0, len(rows) - 1, 2)]
+
+    # Rows are in simulation order so each simulation's rows are consecutive.
+    sim = list(headings).index('sim')
+    tables = []
+    current = None
+    for row in rows:
+        if not tables or row[sim] != current:
+            current = row[sim]
+            tables.append([headings, row, row])
+        else:
+            tables[-1][2] = row
+    return [tuple(table) for table in tables]
 
 
-def InitialChecks():
+class GoldQCSession(object):
     """
-        Required function; starts up the Iphreeqc module and initialises the logfile.
+    One GoldQC configuration with its own PHREEQC engine, solution template, caches, log and step counters.
+
+    The GoldSim entry points at the end of this module run on the default session, created from GoldQC.config in
+    the working directory the first time one of them is called. A GoldSim model with several external elements,
+    each with its own elements and equilibrium phases, can give each element a small module creating its own
+    session from its own config file and exposing the session's methods under the entry point names:
 
-        :return: Integer status: 0 = good; 1 = bad
+        import GoldQC
+        SESSION = GoldQC.GoldQCSession("Other.config")
+        CalcInputs = SESSION.CalcInputs
+        ...
+
+    Sessions share no state so independent sessions can be run concurrently from different threads, each on its own
+    engine. A COM engine can only be used from the thread it was created on, so a session should be started with
+    InitialChecks and run from the same thread.
     """
-    # globals
-    global LOG_FILE_NAME
-    global PHREEQC
-    global DEBUG_LEVEL
-    global DB_PATH, ELEMENTS, PHREEQC_SPECS, EQ_PHASES, TOTALS, USE_CONFIG_PH
-
-    debug_string = ''
-    # Loging initial start of log, also clears old log.
-    with open(LOG_FILE_NAME, 'w') as Log:
-        Log.write("Starting GoldQC.py script at %s.\n\n" % datetime.datetime.now().strftime("%x %H:%M"))
-    if DEBUG_LEVEL:
-        debug_string += "database path: %s\n" % str(DB_PATH)
 
-    try:
-        PHREEQC = CreateObject('IPhreeqcCOM.Object')
-    except WindowsError as e:
-        debug_string += "Error Could not find IPhreeqcCOM, are you sure its installed?\n" \
-                        "Error Message: %s\n" % e
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            Log.write(debug_string)
-        return 1
-    try:
-        PHREEQC.LoadDatabase(DB_PATH)
-    except WindowsError as e:
-        debug_string += "Error Could not load database file %s\n" \
-                        "Error message: %s" % (DB_PATH, e)
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            Log.write(debug_string)
-        return 1
-
-    # checking for any element name changes from GoldSim to Phreeqc.
-    # Checking to make sure all elements are in the database file.
-    database_species = []
-    with open(DB_PATH, 'r') as database:
-        for num, line in enumerate(database, 1):
-            line = line.rstrip()
-            if line == "SOLUTION_MASTER_SPECIES":
-
-                #Skipping the next 3 lines (they are table headings.
-                for i in range(3):
-                    database.next()
-                #Extracting species list from database
-                for l in database:
-                    if l.startswith("# "):
-                        break
-                    else:
-                        l = l.split("\t")
-                        database_species.append(l[0])
-                break
+    def __init__(self, config_file=None):
+        """
+        :param config_file: config file to parse, None to keep the defaults below e.g. to set them directly.
+        """
+        self.PHREEQC = None
+        self.STEP = 0
+        self.ERRORS = 0
+        self.WARNINGS = 0
+        self.PHREEQC_SPECS = ''
+        self.EQ_PHASES = ''
+        self.TOTALS = ''
+        self.SOLUTION_TEMPLATE = None
+        self.OUTPUT_MAP = None
+        self.PROJECTION = False
+        # Float buffer the equilibrated selected output rows are read into when projection is on.
+        self.OUTPUT_BUFFER = array('d')
+        self.LOG_FILE_NAME = DEFAULT_LOG_FILE
+        self.LOG_FLUSH_INTERVAL = 1.0
+        self.LOG_BUFFER_SIZE = 10000
+        self.LOG_WRITER = None
+        self.PROFILE = False
+        self.PROFILE_FILE = 'GoldQC_profile.json'
+        self.PROFILER = None
+        self.RECORD_FILE = ''
+        self.RECORDER = None
+        self.MESSAGE_REPEATS = 10
+        self.MESSAGES = None
+        self.DB_PATH = None
+        self.DB_INDEX = None
+        self.ENGINE_BACKEND = 'com'
+        self.ENGINE_LIBRARY = ''
+        self.DEBUG_LEVEL = 0
+        self.SUPPRESS_WARNINGS = False
+        self.USE_CONFIG_PH = True
+        self.CACHE_SIZE = 0
+        self.CACHE_TOLERANCE = 0.0
+        self.RESULT_CACHE = None
+        self.CACHE_DIRECTORY = ''
+        self.CACHE_DISK_SIZE = 100000
+        self.DISK_CACHE = None
+        self.POOL_SIZE = 0
+        self.POOL_PYTHON = ''
+        self.ENGINE_POOL = None
+        self.SERVER_ENABLED = False
+        self.SERVER_SLOTS = 2
+        self.SERVER_BUFFER_SIZE = 1 << 20
+        self.ENGINE_SERVER = None
+        self.WARM_START_ENABLED = False
+        self.WARM_FALLBACK = True
+        self.WARM_REFRESH = 0
+        self.WARM_START = None
+        self.SURROGATE_FILE = ''
+        self.SURROGATE_TOLERANCE = 0.01
+        self.SURROGATE_CHECK_INTERVAL = 0
+        self.SURROGATE = None
+        self.RETRY_RUNGS = []
+        self.RETRY_BUDGET = 0.0
+        self.RETRY_LADDER = None
+        self.RETRY_POOL = None
+        self.SKIP_THRESHOLD = 0.0
+        self.SKIP_ELEMENT_THRESHOLDS = {}
+        self.SKIP_REFRESH = 10
+        self.SKIP_EXTRAPOLATE = False
+        self.STEP_SKIPPER = None
+        self.SPECIATION_FAST_PATH = False
+        self.SPECIATION_TEMPLATE = None
+        self.SATURATION_CHECK = None
+
+        # PHREEQC variables to be populated by parseConfig
+        self.ELEMENTS = []
+        self.PH = 7
+        self.PE = 4
+        self.REDOX = 'pe'
+        self.TEMP = 25
+        self.CHARGE = None
+        self.EQ_OPTIONS = [["Gypsum", 0, 0]]
+
+        # GoldSim variables to be populated by parseConfig
+        self.IN_VAR_LIST = None
+        self.RET_VAR_LIST = None
+        self.CELLS = 1
+
+        # Config file last parsed, copied into step recordings.
+        self.CONFIG_FILE = config_file
+        if config_file is not None:
+            self.parseConfig(config_file)
+
+    def parseConfig(self, config_file="GoldQC.config"):
+        """
+        Helper function to parse the config file GoldQC.config. This function will read the config file and set the
+        session attributes accordingly. The parsed values are cached in config_file.cache and reused, without parsing,
+        while the contents of the config file are unchanged.
+
+        :param config_file: path to the config file, GoldSim always uses GoldQC.config in the working directory
+
+        :return: None
+        """
+        self.CONFIG_FILE = config_file
+        try:
+            with open(config_file, 'rb') as f:
+                contents = f.read()
+        except IOError:
+            raise Exception("Error: Config file %s could not be read" % config_file)
+        key = hashlib.sha1('%s\n%s\n%s\n%s\n%s' % (CONFIG_CACHE_VERSION, GOLDQC_VERSION, sys.version, CONFIG_ATTRIBUTES,
+                                                 contents)).hexdigest()
+        cache_file = config_file + '.cache'
+        if not self.load_config_cache(cache_file, key):
+            self.read_config(config_file)
+            self.save_config_cache(cache_file, key)
+
+    def load_config_cache(self, cache_file, key):
+        """
+        Sets the config attributes from a cache file written by save_config_cache.
+
+        :param cache_file: path to the cache file
+        :param key: digest of the current config file
+
+        :return: True if the cache was for the current config file and has been loaded
+        """
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = marshal.load(f)
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            return False
+        if not isinstance(cached, dict) or cached.get('key') != key:
+            return False
+        self.__dict__.update(cached['values'])
+        return True
+
+    def save_config_cache(self, cache_file, key):
+        """
+        Writes the config attributes to a cache file, GoldQC still runs if it can not be written.
+
+        :param cache_file: path to the cache file
+        :param key: digest of the current config file
+
+        :return: None
+        """
+        values = dict([(name, getattr(self, name)) for name in CONFIG_ATTRIBUTES])
+        try:
+            with open(cache_file, 'wb') as f:
+                marshal.dump({'key': key, 'values': values}, f)
+        except (IOError, OSError, ValueError):
+            pass
 
+    def read_config(self, config_file):
+        """
+        Reads and validates the config file, setting the config attributes.
 
-        for element in ELEMENTS:
+        :param config_file: path to the config file
+
+        :return: None
+        """
+        # Parsing config file and sanitising configuration variables
+        config = ConfigParser()
+        conf_check = config.read(config_file)
+        if not len(conf_check):
+            raise Exception("Error: Config file %s could not be read" % config_file)
+
+        try:
+            self.ELEMENTS = config.get("GoldSim", "elements")
+            if not self.ELEMENTS:
+                exit("Error elements not specified")
+            else:
+                self.ELEMENTS = eval(self.ELEMENTS)
+        except SyntaxError:
+            exit("Error parsing elements in config: potentially missing ]")
+        except NameError:
+            exit("Error parsing elements in config: a non-string object was encountered")
+        except NoOptionError:
+            exit("Error Elements are not specified.")
+        if not all(isinstance(item, str) for item in self.ELEMENTS):
+            exit("Error an element listed in the config is not in string format (double or single quotes)")
+        try:
+            self.CELLS = max(int(config.get("GoldSim", "cells")), 1)
+        except (ValueError, NoOptionError, NoSectionError):
+            self.CELLS = 1
+        try:
+            self.DB_PATH = config.get("phreeqc", "database")
+        except NoSectionError:
+            exit("Error no database file specified.")
+        try:
+            self.ENGINE_BACKEND = config.get("phreeqc", "engine").strip().lower()
+            if not self.ENGINE_BACKEND:
+                self.ENGINE_BACKEND = 'com'
+        except NoOptionError:
+            self.ENGINE_BACKEND = 'com'
+        try:
+            self.ENGINE_LIBRARY = config.get("phreeqc", "library").strip()
+        except NoOptionError:
+            self.ENGINE_LIBRARY = ''
+        try:
+            self.PROJECTION = config.getboolean("phreeqc", "projection")
+        except (ValueError, NoOptionError):
+            self.PROJECTION = False
+        try:
+            self.LOG_FILE_NAME = config.get("GoldQC", "log_file")
+        except (NoOptionError, ValueError, NoSectionError):
+            self.LOG_FILE_NAME = 'GoldQC.log'
+        try:
+            self.DEBUG_LEVEL = int(config.get("GoldQC", "debug_level"))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.DEBUG_LEVEL = 0
+        try:
+            self.LOG_FLUSH_INTERVAL = float(config.get("GoldQC", "log_flush_interval"))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.LOG_FLUSH_INTERVAL = 1.0
+        try:
+            self.LOG_BUFFER_SIZE = int(config.get("GoldQC", "log_buffer_size"))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.LOG_BUFFER_SIZE = 10000
+        try:
+            self.PROFILE = config.getboolean("GoldQC", "profile")
+        except (ValueError, NoOptionError, NoSectionError):
+            self.PROFILE = False
+        try:
+            self.PROFILE_FILE = config.get("GoldQC", "profile_file").strip() or 'GoldQC_profile.json'
+        except (NoOptionError, NoSectionError):
+            self.PROFILE_FILE = 'GoldQC_profile.json'
+        try:
+            self.RECORD_FILE = config.get("GoldQC", "record_file").strip()
+        except (NoOptionError, NoSectionError):
+            self.RECORD_FILE = ''
+        try:
+            t = config.get("GoldQC", "suppress_warnings")
+            if t:
+                self.SUPPRESS_WARNINGS = eval(t)
+                if not isinstance(self.SUPPRESS_WARNINGS, bool):
+                    self.SUPPRESS_WARNINGS = False
+            else:
+                self.SUPPRESS_WARNINGS = False
+        except NoOptionError:
+            self.SUPPRESS_WARNINGS = False
+        try:
+            self.MESSAGE_REPEATS = max(int(config.get("GoldQC", "message_repeats")), 0)
+        except (ValueError, NoOptionError, NoSectionError):
+            self.MESSAGE_REPEATS = 10
+        try:
+            t = config.get("GoldQC", "use_Config_pH")
+            if t:
+                self.USE_CONFIG_PH = eval(t)
+                if not isinstance(self.USE_CONFIG_PH, bool):
+                    self.USE_CONFIG_PH = True
+        except NoOptionError:
+            self.USE_CONFIG_PH = True
+        try:
+            self.PH = config.get("phreeqc", "pH")
+            if not self.PH:
+                self.PH = '7'
+        except NoOptionError:
+            self.PH = 7
+        try:
+            self.PE = config.get("phreeqc", "pe")
+            if not self.PE:
+                self.PE = '4'
+        except NoOptionError:
+            self.PE = 4
+        try:
+            self.REDOX = config.get("phreeqc", "redox")
+            if not self.REDOX:
+                self.REDOX = 'pe'
+            else:
+                self.REDOX = eval(self.REDOX)
+        except NoOptionError:
+            self.REDOX = 'pe'
+        try:
+            self.TEMP = config.get("phreeqc", "temp")
+            if not self.TEMP:
+                self.TEMP = '25'
+        except NoOptionError:
+            self.TEMP = 25
+        try:
+            self.CHARGE = config.get("phreeqc", "charge")
+            if not self.CHARGE:
+                self.CHARGE = None
+            else:
+                self.CHARGE = eval(self.CHARGE)
+        except NoOptionError:
+            self.CHARGE = None
+        try:
+            t = config.get("phreeqc", "equilibrium_phases")
+            if t:
+                self.EQ_OPTIONS = eval(t)
+        except NoOptionError:
+            self.EQ_OPTIONS = [["Gypsum", 0, 0]]
+        except SyntaxError:
+            exit("Error parsing elements in config: potentially missing ]")
+        except NameError:
+            exit("Error parsing elements in config: a non-string object was encountered")
+        try:
+            self.CACHE_SIZE = int(config.get("cache", "size"))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.CACHE_SIZE = 0
+        try:
+            self.CACHE_TOLERANCE = abs(float(config.get("cache", "tolerance")))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.CACHE_TOLERANCE = 0.0
+        try:
+            self.CACHE_DIRECTORY = config.get("cache", "directory").strip()
+        except (NoOptionError, NoSectionError):
+            self.CACHE_DIRECTORY = ''
+        try:
+            self.CACHE_DISK_SIZE = int(config.get("cache", "disk_size"))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.CACHE_DISK_SIZE = 100000
+        try:
+            self.POOL_SIZE = int(config.get("pool", "size"))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.POOL_SIZE = 0
+        try:
+            self.POOL_PYTHON = config.get("pool", "python").strip()
+        except (NoOptionError, NoSectionError):
+            self.POOL_PYTHON = ''
+        try:
+            self.SERVER_ENABLED = config.getboolean("engine_server", "enabled")
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SERVER_ENABLED = False
+        try:
+            self.SERVER_SLOTS = max(int(config.get("engine_server", "slots")), 1)
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SERVER_SLOTS = 2
+        try:
+            self.SERVER_BUFFER_SIZE = max(int(config.get("engine_server", "buffer_size")), 1024)
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SERVER_BUFFER_SIZE = 1 << 20
+        try:
+            self.WARM_START_ENABLED = config.getboolean("warm_start", "enabled")
+        except (ValueError, NoOptionError, NoSectionError):
+            self.WARM_START_ENABLED = False
+        try:
+            self.WARM_FALLBACK = config.getboolean("warm_start", "fallback")
+        except (ValueError, NoOptionError, NoSectionError):
+            self.WARM_FALLBACK = True
+        try:
+            self.WARM_REFRESH = max(int(config.get("warm_start", "refresh_interval")), 0)
+        except (ValueError, NoOptionError, NoSectionError):
+            self.WARM_REFRESH = 0
+        try:
+            self.SURROGATE_FILE = config.get("surrogate", "table").strip()
+        except (NoOptionError, NoSectionError):
+            self.SURROGATE_FILE = ''
+        try:
+            self.SURROGATE_TOLERANCE = abs(float(config.get("surrogate", "tolerance")))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SURROGATE_TOLERANCE = 0.01
+        try:
+            self.SURROGATE_CHECK_INTERVAL = max(int(config.get("surrogate", "check_interval")), 0)
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SURROGATE_CHECK_INTERVAL = 0
+        try:
+            t = config.get("retry", "ladder").strip()
+            self.RETRY_RUNGS = eval(t) if t else []
+        except (NoOptionError, NoSectionError):
+            self.RETRY_RUNGS = []
+        except (SyntaxError, NameError):
+            exit("Error parsing the retry ladder in config: potentially missing ] or }")
+        if self.RETRY_RUNGS:
+            from RetryLadder import validate_rungs
+            problem = validate_rungs(self.RETRY_RUNGS)
+            if problem:
+                exit("Error in config: %s" % problem)
+        try:
+            self.RETRY_BUDGET = max(float(config.get("retry", "budget")), 0.0)
+        except (ValueError, NoOptionError, NoSectionError):
+            self.RETRY_BUDGET = 0.0
+        try:
+            self.SKIP_THRESHOLD = abs(float(config.get("step_skip", "threshold")))
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SKIP_THRESHOLD = 0.0
+        try:
+            t = config.get("step_skip", "element_thresholds").strip()
+            self.SKIP_ELEMENT_THRESHOLDS = eval(t) if t else {}
+        except (NoOptionError, NoSectionError):
+            self.SKIP_ELEMENT_THRESHOLDS = {}
+        except (SyntaxError, NameError):
+            exit("Error parsing the step skip element thresholds in config: potentially missing } or quotes")
+        if not isinstance(self.SKIP_ELEMENT_THRESHOLDS, dict):
+            exit("Error in config: step skip element thresholds must be in the format {\"element\": threshold, ...}")
+        unknown = [element for element in self.SKIP_ELEMENT_THRESHOLDS if element not in self.ELEMENTS]
+        if unknown:
+            exit("Error in config: step skip thresholds given for elements %s that are not in the elements list" %
+                 unknown)
+        try:
+            self.SKIP_REFRESH = max(int(config.get("step_skip", "refresh_interval")), 0)
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SKIP_REFRESH = 10
+        try:
+            self.SKIP_EXTRAPOLATE = config.getboolean("step_skip", "extrapolate")
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SKIP_EXTRAPOLATE = False
+        try:
+            self.SPECIATION_FAST_PATH = config.getboolean("speciation", "fast_path")
+        except (ValueError, NoOptionError, NoSectionError):
+            self.SPECIATION_FAST_PATH = False
+
+        # Multiple cells are passed as a single cells x elements matrix, flattened one cell after another.
+        if self.CELLS > 1:
+            self.IN_VAR_LIST = [[self.CELLS * len(self.ELEMENTS), MATRIX_TYPE, "inputMatrix"]]
+            self.RET_VAR_LIST = [[self.CELLS * len(self.ELEMENTS), MATRIX_TYPE, "outputMatrix"]]
+        else:
+            self.IN_VAR_LIST = [[len(self.ELEMENTS), VECTOR_TYPE, "inputVector"]]
+            self.RET_VAR_LIST = [[len(self.ELEMENTS), VECTOR_TYPE, "outputVector"]]
+
+    def write_log(self, message, flush=False):
+        """
+        Writes a message to the log file through the buffered log writer, or directly to the file if the writer has
+        not been started by InitialChecks.
+
+        :param message: text to write to the log
+        :param flush: write the buffered messages to the file straight away e.g. on errors
+
+        :return: None
+        """
+        if self.LOG_WRITER is None:
+            with open(self.LOG_FILE_NAME, 'a', 0) as Log:
+                Log.write(message)
+            return
+        self.LOG_WRITER.write(message)
+        if flush:
+            self.LOG_WRITER.flush()
+
+    def engine_factory(self):
+        """
+        :return: picklable callable creating a PHREEQC engine of the session's backend, @see Engines.create_engine
+        """
+        return partial(create_engine, self.ENGINE_BACKEND, self.ENGINE_LIBRARY)
+
+    def start_engine(self):
+        """
+        Creates the PHREEQC engine, in the engine server process when it is enabled.
+
+        :return: object with the IPhreeqc COM interface
+        """
+        if not self.SERVER_ENABLED:
+            return self.engine_factory()()
+        import multiprocessing
+        from EngineServer import EngineServer
+        if self.POOL_PYTHON:
+            # GoldSim's embedded interpreter can not be used to start the server process.
+            multiprocessing.set_executable(self.POOL_PYTHON)
+        self.ENGINE_SERVER = EngineServer(self.ENGINE_BACKEND, self.ENGINE_LIBRARY, self.SERVER_SLOTS,
+                                          self.SERVER_BUFFER_SIZE)
+        return self.ENGINE_SERVER
+
+    def InitialChecks(self):
+        """
+            Required function; starts up the Iphreeqc module and initialises the logfile.
+
+            :return: Integer status: 0 = good; 1 = bad
+        """
+
+        debug_string = ''
+        # Loging initial start of log, also clears old log.
+        if self.LOG_WRITER is not None:
+            self.LOG_WRITER.close()
+        self.LOG_WRITER = LogWriter(self.LOG_FILE_NAME, self.LOG_FLUSH_INTERVAL, self.LOG_BUFFER_SIZE, 'w')
+        self.write_log("Starting GoldQC.py script at %s.\n\n" % datetime.datetime.now().strftime("%x %H:%M"))
+        if self.DEBUG_LEVEL:
+            debug_string += "database path: %s\n" % str(self.DB_PATH)
+
+        if self.ENGINE_SERVER is not None:
+            self.ENGINE_SERVER.close()
+            self.ENGINE_SERVER = None
+        try:
+            self.PHREEQC = self.start_engine()
+        except ENGINE_ERRORS as e:
+            debug_string += "Error Could not start the %s PHREEQC engine, are you sure IPhreeqc is installed?\n" \
+                            "Error Message: %s\n" % (self.ENGINE_BACKEND, e)
+            self.write_log(debug_string, True)
+            return 1
+        try:
+            self.PHREEQC.LoadDatabase(self.DB_PATH)
+        except ENGINE_ERRORS as e:
+            debug_string += "Error Could not load database file %s\n" \
+                            "Error message: %s" % (self.DB_PATH, e)
+            self.write_log(debug_string, True)
+            return 1
+
+        # Reading the element and phase names from the database, cached in an index file between runs.
+        try:
+            self.DB_INDEX = load_database_index(self.DB_PATH)
+        except (IOError, OSError) as e:
+            debug_string += "Error Could not read database file %s\n" \
+                            "Error message: %s" % (self.DB_PATH, e)
+            self.write_log(debug_string, True)
+            return 1
+
+        # checking for any element name changes from GoldSim to Phreeqc.
+        # Checking to make sure all elements are in the database file.
+        for element in self.ELEMENTS:
             if element in ELEMENT_SYMBOLS:
-                ELEMENTS[ELEMENTS.index(element)] = ELEMENT_SYMBOLS[element]
+                self.ELEMENTS[self.ELEMENTS.index(element)] = ELEMENT_SYMBOLS[element]
                 element = ELEMENT_SYMBOLS[element]
-            if element not in database_species and element is not "pH":
+            if not self.DB_INDEX.has_element(element) and element != "pH":
                 debug_string += "ERROR: " + element + " is not in the selected PHREEQC database"
-                with open(LOG_FILE_NAME, 'a') as log:
-                    log.write(debug_string)
+                self.write_log(debug_string)
+                self.LOG_WRITER.close()
                 exit(1)
 
-    # Handling the case of pH being specified in GoldSim
-    if 'pH' in ELEMENTS:
-        PHREEQC_SPECS = ('\ttemp\t\t%s\n\tpe\t\t\t%s\n\tredox\t\t%s\n' % (TEMP, PE, REDOX))
-        TOTALS = "".join(['%s ' % s for s in ELEMENTS if s != 'pH'])
+        # Checking the equilibrium phases are all defined in the database file.
+        for phase in self.EQ_OPTIONS:
+            if not self.DB_INDEX.has_phase(str(phase[0])):
+                debug_string += "ERROR: phase " + str(phase[0]) + " is not in the selected PHREEQC database"
+                self.write_log(debug_string)
+                self.LOG_WRITER.close()
+                exit(1)
+
+        # Handling the case of pH being specified in GoldSim
+        if 'pH' in self.ELEMENTS:
+            self.PHREEQC_SPECS = ('\ttemp\t\t%s\n\tpe\t\t\t%s\n\tredox\t\t%s\n' % (self.TEMP, self.PE, self.REDOX))
+            self.TOTALS = "".join(['%s ' % s for s in self.ELEMENTS if s != 'pH'])
+        else:
+            self.PHREEQC_SPECS = ('\ttemp\t\t%s\n\tpH\t\t\t%s\n\tpe\t\t\t%s\n\tredox\t\t%s\n' %
+                                  (self.TEMP, self.PH, self.PE, self.REDOX))
+            self.TOTALS = "".join(['%s ' % s for s in self.ELEMENTS])
+
+        # Extracting Equilibrium phases
+        self.EQ_PHASES = 'EQUILIBRIUM_PHASES\n%s' % "".join(['\t%s\t%s\t%s\n' % (e[0], e[1], e[2])
+                                                             for e in self.EQ_OPTIONS])
+
+        # Speciating each step first and only equilibrating the steps above a phase's target saturation index.
+        self.SATURATION_CHECK = None
+        self.SPECIATION_TEMPLATE = None
+        if self.SPECIATION_FAST_PATH:
+            if not self.EQ_OPTIONS:
+                debug_string += "Warning: The speciation fast path needs equilibrium phases, it will not be used.\n"
+            elif any([float(e[2]) for e in self.EQ_OPTIONS]):
+                # A phase that can dissolve changes the solution whether or not it is supersaturated.
+                debug_string += "Warning: The speciation fast path needs every equilibrium phase to have 0 moles, " \
+                                "it will not be used.\n"
+            else:
+                from SaturationCheck import SaturationCheck
+                self.SATURATION_CHECK = SaturationCheck([(e[0], e[1]) for e in self.EQ_OPTIONS])
+        # Both tiers select the same saturation indices so the selected output headings do not change between them.
+        saturation_indices = self.SATURATION_CHECK.phases if self.SATURATION_CHECK is not None else ()
+
+        # Everything but the GoldSim values is now fixed so the input string can be compiled once.
+        self.SOLUTION_TEMPLATE = SolutionTemplate(self.ELEMENTS, self.PHREEQC_SPECS, self.EQ_PHASES, self.TOTALS,
+                                                  self.CHARGE, self.PH, self.USE_CONFIG_PH, self.PROJECTION,
+                                                  saturation_indices)
+        if self.SATURATION_CHECK is not None:
+            self.SPECIATION_TEMPLATE = SolutionTemplate(self.ELEMENTS, self.PHREEQC_SPECS, '', self.TOTALS,
+                                                        self.CHARGE, self.PH, self.USE_CONFIG_PH, self.PROJECTION,
+                                                        saturation_indices)
+        # The output columns are resolved from the selected output headings on the first run.
+        self.OUTPUT_MAP = None
+
+        # Step profiling has no cost when switched off as every timing is skipped.
+        self.PROFILER = None
+        if self.PROFILE:
+            from Profiler import StepProfiler
+            self.PROFILER = StepProfiler()
+
+        # Repeated PHREEQC warnings are counted rather than written to the log every time, errors are always written.
+        self.MESSAGES = MessageCounter(self.MESSAGE_REPEATS)
+
+        # Recording every step to a binary file, after any element names have been changed for PHREEQC.
+        if self.RECORDER is not None:
+            self.RECORDER.close()
+            self.RECORDER = None
+        if self.RECORD_FILE:
+            from StepRecorder import StepRecorder
+            try:
+                with open(self.CONFIG_FILE, 'rb') as f:
+                    self.RECORDER = StepRecorder(self.RECORD_FILE, self.ELEMENTS, f.read())
+            except EnvironmentError as e:
+                debug_string += "Warning: Could not create the step recording %s, continuing without it.\n" \
+                                "Error message: %s\n" % (self.RECORD_FILE, e)
+
+        # Starting the result cache, a size of 0 disables caching.
+        self.RESULT_CACHE = None
+        if self.CACHE_SIZE > 0:
+            from ResultCache import ResultCache
+            self.RESULT_CACHE = ResultCache(self.CACHE_SIZE, self.CACHE_TOLERANCE)
+
+        # Opening the persistent cache, GoldQC can still run without it so errors are only logged.
+        self.DISK_CACHE = None
+        if self.CACHE_DIRECTORY:
+            import sqlite3
+            from ResultCache import PersistentCache
+            try:
+                self.DISK_CACHE = PersistentCache(self.CACHE_DIRECTORY, self.DB_PATH, self.CACHE_DISK_SIZE)
+                if self.DEBUG_LEVEL and self.DISK_CACHE.invalidated:
+                    debug_string += ("Database changed, removed %d persistent cache entries\n" %
+                                     self.DISK_CACHE.invalidated)
+            except (OSError, IOError, sqlite3.Error) as e:
+                debug_string += "Warning: Could not open the persistent cache in %s, continuing without it.\n" \
+                                "Error message: %s\n" % (self.CACHE_DIRECTORY, e)
+
+        # Starting the engine pool, batches are run on the single PHREEQC engine when it is disabled.
+        if self.ENGINE_POOL is not None:
+            self.ENGINE_POOL.close()
+            self.ENGINE_POOL = None
+        if self.POOL_SIZE > 1:
+            import multiprocessing
+            from EnginePool import EnginePool
+            if self.POOL_PYTHON:
+                # GoldSim's embedded interpreter can not be used to start the worker processes.
+                multiprocessing.set_executable(self.POOL_PYTHON)
+            try:
+                self.ENGINE_POOL = EnginePool(self.POOL_SIZE, self.DB_PATH, self.engine_factory())
+            except (OSError, IOError) as e:
+                debug_string += "Warning: Could not start the engine pool, running on a single engine.\n" \
+                                "Error message: %s\n" % e
+
+        # Warm starts chain each step from the one before on the same engine and need phases to equilibrate with.
+        self.WARM_START = None
+        if self.WARM_START_ENABLED:
+            if self.ENGINE_POOL is not None:
+                debug_string += "Warning: Warm starts are not used with the engine pool.\n"
+            elif not self.EQ_OPTIONS:
+                debug_string += "Warning: Warm starts need equilibrium phases, running cold starts only.\n"
+            else:
+                from WarmStart import WarmStart
+                self.WARM_START = WarmStart(self.WARM_REFRESH)
+
+        # Retries of failed runs, on their own engine process when each attempt has a time budget.
+        if self.RETRY_POOL is not None:
+            self.RETRY_POOL.close()
+            self.RETRY_POOL = None
+        self.RETRY_LADDER = None
+        if self.RETRY_RUNGS:
+            from RetryLadder import RetryLadder
+            self.RETRY_LADDER = RetryLadder(self.RETRY_RUNGS)
+
+        # Reusing each cell's last result while its inputs stay within the skip thresholds of the inputs of that run.
+        self.STEP_SKIPPER = None
+        if self.SKIP_THRESHOLD or any(self.SKIP_ELEMENT_THRESHOLDS.values()):
+            from StepSkipper import StepSkipper
+            self.STEP_SKIPPER = StepSkipper(self.ELEMENTS, self.SKIP_THRESHOLD, self.SKIP_ELEMENT_THRESHOLDS,
+                                            self.SKIP_REFRESH, self.SKIP_EXTRAPOLATE)
+
+        # Loading the surrogate table, only used if it was built for the same elements, phases and database.
+        self.SURROGATE = None
+        if self.SURROGATE_FILE:
+            from Surrogate import SurrogateTable, fingerprint
+            try:
+                self.SURROGATE = SurrogateTable.load(self.SURROGATE_FILE, self.SURROGATE_TOLERANCE)
+                if self.SURROGATE.setup != fingerprint(self.ELEMENTS, self.PHREEQC_SPECS, self.EQ_PHASES, self.CHARGE,
+                                                       self.PH, self.USE_CONFIG_PH, self.DB_PATH):
+                    debug_string += "Warning: Surrogate table %s was built for a different PHREEQC setup, " \
+                                    "it will not be used.\n" % self.SURROGATE_FILE
+                    self.SURROGATE = None
+            except (IOError, OSError, ValueError, KeyError) as e:
+                debug_string += "Warning: Could not load the surrogate table %s, running PHREEQC for every step.\n" \
+                                "Error message: %s\n" % (self.SURROGATE_FILE, e)
+                self.SURROGATE = None
+
+        debug_string += "Successfully Started GoldQC.py script at %s.\n\n" % \
+                        datetime.datetime.now().strftime("%x %H:%M")
+        self.write_log(debug_string)
+        return 0
+
+    def CalcInputs(self):
+        """
+        Returns the number of elements as specified by the elements config, times the number of cells.
+        This should match the number of inputs from GoldSim.
+
+        :return:    Number of inputs expected. -1 is an error
+        """
+        return int(self.IN_VAR_LIST[0][VAR_CNT_IND])
+
+    def CalcOutputs(self):
+        """
+        Returns the number of elements as specified by the elements config, times the number of cells.
+        This should match the size of the vector or matrix GoldSim is expected to be returned.
+
+        :return:    Number of outputs expected. -1 is an error
+        """
+        return int(self.RET_VAR_LIST[0][VAR_CNT_IND])
+
+    def CustomCalculations(self, input_list, num_return):
+        """
+        Handles conversion from GoldSim format to Python style list. The function then passes the input to
+        MyCustomCalculations for processing to IPhreeqc format before being ran in PHREEQC and passed back
+        with conversions from PHREEQC to Python to GoldSim.
+
+        :param: input_list the list of floats which is the input array from GoldSim.
+        :param: num_return the total number of indices to return in the list which goes back to CustomPython.pyx.
+        
+        :return: return_list list of floats with NumToReturn indexes which will be written to the output arguments
+                 array.
+        """
+
+        num_output_vars = self.CELLS  # the number of output vectors, one per cell.
+        start_index = 0  # the starting index for the input.
+        element_count = len(self.ELEMENTS)
+
+        current_indexes = int(self.IN_VAR_LIST[0][VAR_CNT_IND])
+        var_in_list = input_list[start_index:(start_index + current_indexes)]
+        if len(var_in_list) != current_indexes:
+            self.write_log("Received %d values from GoldSim in function CustomCalculations. Expected %d values.\n" %
+                           (len(var_in_list), current_indexes), True)
+            return [-1]
+        # Each cell is one row of the input, all cells are run together as a single batch.
+        py_input_list = [var_in_list[i:i + element_count] for i in range(0, current_indexes, element_count)]
+
+        ret_var_list = self.MyCustomCalculations(py_input_list)
+        if not isinstance(ret_var_list, list):
+            self.write_log("ERROR: the input type from GoldSim was not a vector", True)
+            return -1
+        if len(ret_var_list) != num_output_vars:
+            self.write_log("Received %d variables back from processing in "
+                           "function CustomCalculations. Expected %d variables.\n" %
+                           (len(ret_var_list), num_output_vars), True)
+            return [-1]
+        # Cells PHREEQC failed on are returned as -1 for every element.
+        return_list = [value for output_vector in ret_var_list
+                       for value in (output_vector if output_vector is not None else [-1] * element_count)]
+
+        # noinspection PyTypeChecker
+        if len(return_list) != num_return:
+            # noinspection PyTypeChecker
+            self.write_log("Created return list with wrong length. Return "
+                           "list has length %d. Needs to have length %d.\n" %
+                           (len(return_list), num_return), True)
+            return [-1]
+        return return_list
+
+    def WrapUpStuff(self):
+        """
+        Required to end off the log file with completion time and any other useful information
+        :return: None
+        """
+
+        # local imports
+        if self.ENGINE_POOL is not None:
+            self.ENGINE_POOL.close()
+            self.write_log(self.ENGINE_POOL.summary())
+            self.ENGINE_POOL = None
+        if self.RETRY_POOL is not None:
+            self.RETRY_POOL.close()
+            self.RETRY_POOL = None
+        if self.ENGINE_SERVER is not None:
+            self.ENGINE_SERVER.close()
+            self.write_log(self.ENGINE_SERVER.summary())
+            self.ENGINE_SERVER = None
+        if self.RETRY_LADDER is not None:
+            self.write_log(self.RETRY_LADDER.summary())
+        if self.MESSAGES is not None and self.MESSAGES.messages:
+            self.write_log(self.MESSAGES.summary())
+        if self.RECORDER is not None:
+            self.RECORDER.close()
+            self.write_log(self.RECORDER.summary())
+            self.RECORDER = None
+        if self.RESULT_CACHE is not None:
+            self.write_log(self.RESULT_CACHE.summary())
+        if self.DISK_CACHE is not None:
+            self.DISK_CACHE.close()
+            self.write_log(self.DISK_CACHE.summary())
+        if self.WARM_START is not None:
+            self.write_log(self.WARM_START.summary())
+        if self.STEP_SKIPPER is not None:
+            self.write_log(self.STEP_SKIPPER.summary())
+        if self.SATURATION_CHECK is not None:
+            self.write_log(self.SATURATION_CHECK.summary())
+        if self.SURROGATE is not None:
+            self.write_log(self.SURROGATE.summary())
+        if self.PROFILER is not None:
+            self.write_log(self.PROFILER.summary())
+            try:
+                self.PROFILER.write_json(self.PROFILE_FILE)
+            except (IOError, OSError) as e:
+                self.write_log("Warning: Could not write the step profile to %s: %s\n" % (self.PROFILE_FILE, e))
+        if self.ERRORS:
+            self.write_log("Error: GoldQC enocunterd some error(s). Please check the log")
+        elif self.WARNINGS:
+            self.write_log("GoldQC completed successfully but with warnings at %s.\n" %
+                           datetime.datetime.now().strftime("%x %H:%M"))
+        else:
+            self.write_log("GoldQC completed successfully at %s.\n" % datetime.datetime.now().strftime("%x %H:%M"))
+
+        # Writing everything still buffered before GoldSim unloads the module.
+        if self.LOG_WRITER is not None:
+            self.LOG_WRITER.close()
+            self.LOG_WRITER = None
+        if self.ERRORS:
+            exit(-1)
+        return
+
+    def MyCustomCalculations(self, input_list):
+        """
+        Required to transform the input from GoldSim to a PHREEQC simulation string then transform the result from
+        PHREEQC back to GoldSims expected format
+
+        :param: input_list A list of the input values/parameters from the GoldSim
+
+        :return: return_list A list of the output values which needs to be in the format expected by RET_VAR_LIST
+        """
+        return self.MyCustomCalculationsBatch(input_list)
+
+    def MyCustomCalculationsBatch(self, vector_list):
+        """
+        Runs several input vectors through PHREEQC in a single RunString call. Each vector is given its own
+        SOLUTION/EQUILIBRIUM_PHASES simulation in the input string and the selected output is split back per
+        simulation, so the results match running each vector on its own. Can be used by offline drivers as well as
+        through MyCustomCalculations.
+
+        Each run of CELLS vectors is one step, with the vectors as its cells in order. When PHREEQC fails on a batch
+        of several vectors each is run again on its own so only the vectors it fails on are lost.
+
+        :param vector_list: A list of input vectors, each in the same format GoldSim sends to MyCustomCalculations
+
+        :return: A list with one output vector per input vector, None for a vector PHREEQC failed on, or -1 if
+                 PHREEQC failed on every vector
+        """
+
+        debug_string = ''
+        steps = [self.STEP + i // self.CELLS for i in range(len(vector_list))]
+        cells = [i % self.CELLS for i in range(len(vector_list))]
+        step_count = int(ceil(len(vector_list) / float(self.CELLS)))
+        profiling = self.PROFILER is not None
+        if profiling or self.RECORDER is not None:
+            step_started = started = timer()
+
+        if self.DEBUG_LEVEL:
+            from prettytable import PrettyTable
+            for step, cell, element_values in zip(steps, cells, vector_list):
+                debug_string += "Step %d, cell %d\n" % (step, cell) if self.CELLS > 1 else "Step %d\n" % step
+                debug_string += "Input Values:\n"
+                table = PrettyTable(["Element"] + self.ELEMENTS)
+                table.add_row(["Value"] + list(element_values))
+                debug_string += '%s\n\n' % table
+            if profiling:
+                started = self.PROFILER.record('debug input', started)
+
+        # Reusing each cell's last result, or extrapolating from its last two, while its inputs have barely changed.
+        predicted = {}
+        if self.STEP_SKIPPER is not None:
+            for i, element_values in enumerate(vector_list):
+                output = self.STEP_SKIPPER.predict(cells[i], steps[i], self.cache_values(element_values))
+                if output is not None:
+                    predicted[i] = output
+            if profiling:
+                started = self.PROFILER.record('step skip', started)
+
+        # Reusing cached results for the same inputs and PHREEQC setup where possible.
+        results = [None] * len(vector_list)
+        cache_state = (self.PHREEQC_SPECS, self.EQ_PHASES, self.CHARGE, self.USE_CONFIG_PH)
+        if self.RESULT_CACHE is not None:
+            for i, element_values in enumerate(vector_list):
+                if i not in predicted:
+                    results[i] = self.RESULT_CACHE.get(self.cache_values(element_values), cache_state)
+            if profiling:
+                started = self.PROFILER.record('result cache', started)
+
+        # Reusing results stored by earlier runs, each vector is looked up on its own so a changed cell or batch
+        # size does not miss the others.
+        if self.DISK_CACHE is not None:
+            for i, element_values in enumerate(vector_list):
+                if results[i] is None and i not in predicted:
+                    results[i] = self.DISK_CACHE.get(self.SOLUTION_TEMPLATE.render(1, element_values))
+            if profiling:
+                started = self.PROFILER.record('persistent cache', started)
+
+        # Interpolating from the surrogate table, with every check_interval'th interpolation also run through PHREEQC.
+        checked = {}
+        if self.SURROGATE is not None:
+            for i, element_values in enumerate(vector_list):
+                output = self.SURROGATE.predict(element_values) if results[i] is None and i not in predicted else None
+                if output is None:
+                    continue
+                if self.SURROGATE_CHECK_INTERVAL and self.SURROGATE.hits % self.SURROGATE_CHECK_INTERVAL == 0:
+                    checked[i] = output
+                else:
+                    predicted[i] = output
+            if profiling:
+                started = self.PROFILER.record('surrogate', started)
+        pending = [i for i, result in enumerate(results) if result is None and i not in predicted]
+
+        # Speciating the remaining vectors without the equilibrium phases first. Those below every phase's target
+        # saturation index keep their speciation and only the rest are run again with the equilibrium phases.
+        if pending and self.SATURATION_CHECK is not None:
+            run_started = timer()
+            solutions = [(steps[i], vector_list[i]) for i in pending]
+            if self.ENGINE_POOL is not None and len(solutions) > 1:
+                chunk = int(ceil(len(solutions) / float(self.ENGINE_POOL.size)))
+                input_strings = [self.SPECIATION_TEMPLATE.render_batch(solutions[j:j + chunk])
+                                 for j in range(0, len(solutions), chunk)]
+                if profiling:
+                    self.PROFILER.record('speciation input', started)
+                outputs = self.process_input_pool(input_strings, True)
+            else:
+                input_strings = [self.SPECIATION_TEMPLATE.render_batch(solutions)]
+                if profiling:
+                    self.PROFILER.record('speciation input', started)
+                # A speciation saves no solution, warm starts carry on from the last equilibrated one.
+                saved = self.WARM_START is not None and self.WARM_START.saved
+                outputs = [self.process_input(input_strings[0], speciation=True)]
+                if self.WARM_START is not None:
+                    self.WARM_START.saved = saved and self.WARM_START.saved
+            if self.DEBUG_LEVEL > 1:
+                debug_string += "".join(input_strings)
+            if profiling:
+                started = timer()
+            tables = []
+            for phreeqc_values in outputs:
+                if phreeqc_values:
+                    tables.extend(split_selected_output(phreeqc_values))
+            # Every vector is equilibrated if the speciation failed, which has already been logged as a warning.
+            if len(tables) == len(solutions):
+                for i, table in zip(pending, tables):
+                    if self.SATURATION_CHECK.supersaturated(table):
+                        continue
+                    results[i] = table
+                    self.cache_table(vector_list[i], cache_state, table)
+                pending = [i for i in pending if results[i] is None]
+            self.SATURATION_CHECK.record_speciation(timer() - run_started, len(solutions),
+                                                    len(solutions) - len(pending))
+            if profiling:
+                started = self.PROFILER.record('saturation check', started)
+
+        # Running all remaining vectors through PHREEQC in one input string, or one per worker with the engine pool.
+        if pending:
+            equilibrium_started = timer()
+            errors = self.ERRORS
+            warm = False
+            saves = None
+            solutions = [(steps[i], vector_list[i]) for i in pending]
+            if self.ENGINE_POOL is not None and len(solutions) > 1:
+                chunk = int(ceil(len(solutions) / float(self.ENGINE_POOL.size)))
+                input_strings = [self.build_input_string(solutions[j:j + chunk])
+                                 for j in range(0, len(solutions), chunk)]
+                if profiling:
+                    self.PROFILER.record('build input', started)
+                outputs = self.process_input_pool(input_strings)
+            elif self.WARM_START is not None:
+                # The cold start input is also the fallback if the warm start fails.
+                warm = self.WARM_START.use_warm()
+                # Each cell starts from its own saved solution.
+                saves = [WARM_SOLUTION + cells[i] for i in pending]
+                cold_string = self.build_input_string(solutions, saves)
+                water = [self.WARM_START.water.get(save, 1.0) for save in saves]
+                input_strings = [self.SOLUTION_TEMPLATE.render_warm_batch(solutions, saves, water) if warm
+                                 else cold_string]
+                if profiling:
+                    self.PROFILER.record('build input', started)
+                run_started = timer()
+                outputs = [self.process_input(input_strings[0], cold_string if warm else None)]
+                self.WARM_START.record(warm, timer() - run_started, len(solutions))
+            else:
+                input_strings = [self.build_input_string(solutions)]
+                if profiling:
+                    self.PROFILER.record('build input', started)
+                outputs = [self.process_input(input_strings[0])]
+            if self.DEBUG_LEVEL > 1:
+                debug_string += "".join(input_strings)
+            if profiling:
+                started = timer()
+
+            # Confirming PHREEQC did not return an error, otherwise running each vector on its own.
+            tables = []
+            for phreeqc_values in outputs:
+                if phreeqc_values:
+                    tables.extend(split_selected_output(phreeqc_values))
+            if len(tables) != len(pending):
+                self.write_log(debug_string, True)
+                debug_string = ''
+                if len(pending) == 1:
+                    self.ERRORS = 1
+                    tables = [None]
+                else:
+                    # Only the vectors PHREEQC also fails on alone are errors.
+                    self.ERRORS = errors
+                    tables = [self.process_vector(steps[i], cells[i], vector_list[i],
+                                                  saves[j] if saves is not None else None)
+                              for j, i in enumerate(pending)]
+                    if self.WARM_START is not None and None in tables:
+                        self.WARM_START.saved = False
+            if tables.count(None) == len(vector_list):
+                self.STEP += step_count
+                return -1
+            for j, (i, table) in enumerate(zip(pending, tables)):
+                if table is None:
+                    continue
+                results[i] = table
+                self.cache_table(vector_list[i], cache_state, table, warm)
+                if saves is not None:
+                    # The next warm start gives the cell's totals for the water left in its saved solution.
+                    self.WARM_START.water[saves[j]] = table[2][self.output_map(table[0]).water_column]
+            if self.SATURATION_CHECK is not None:
+                self.SATURATION_CHECK.record_equilibrium(timer() - equilibrium_started, len(pending))
+
+        # Processing PHREEQC output to GoldSim format
+        return_list = [predicted[i] if i in predicted else self.convert_output(table) if table is not None else None
+                       for i, table in enumerate(results)]
+        for i, output in checked.items():
+            if return_list[i] is not None:
+                self.SURROGATE.check(output, return_list[i])
+        if self.STEP_SKIPPER is not None:
+            for i, table in enumerate(results):
+                if table is not None:
+                    self.STEP_SKIPPER.update(cells[i], steps[i], self.cache_values(vector_list[i]), return_list[i])
+        if profiling:
+            started = self.PROFILER.record('output conversion', started)
+
+        # Writing debug information to the log file.
+        if self.DEBUG_LEVEL:
+            from prettytable import PrettyTable
+            for values in return_list:
+                if values is None:
+                    debug_string += "Output Values: PHREEQC failed\n\n"
+                    continue
+                debug_string += "Output Values:\n"
+                table = PrettyTable(["Element"] + self.ELEMENTS)
+                table.add_row(["mol/kg"] + values)
+                debug_string += '%s\n\n' % table
+            self.write_log(debug_string)
+            if profiling:
+                started = self.PROFILER.record('debug output', started)
+
+        if profiling:
+            self.PROFILER.record_step(self.STEP, started - step_started)
+        if self.RECORDER is not None:
+            self.record_steps(steps, vector_list, results, return_list, (timer() - step_started) / len(vector_list))
+        self.STEP += step_count
+        return return_list
+
+    def record_steps(self, steps, vector_list, tables, return_list, seconds):
+        """
+        Appends steps to the step recording.
+
+        :param steps: STEP number of each input vector
+        :param vector_list: input vectors from GoldSim
+        :param tables: selected output table of each step, None where it was interpolated or PHREEQC failed
+        :param return_list: output vectors returned to GoldSim, None where PHREEQC failed
+        :param seconds: time taken per step
+
+        :return: None
+        """
+        nan = float('nan')
+        for step, element_values, table, values in zip(steps, vector_list, tables, return_list):
+            if values is None:
+                self.RECORDER.write(step, seconds, nan, nan, element_values, [nan] * len(self.ELEMENTS))
+            elif table is None:
+                self.RECORDER.write(step, seconds, nan, nan, element_values, values)
+            else:
+                row = table[2]
+                self.RECORDER.write(step, seconds, row[self.OUTPUT_MAP.water_column], row[self.OUTPUT_MAP.ph_column],
+                                    element_values, values)
+
+    def cache_table(self, element_values, cache_state, table, warm=False):
+        """
+        Stores the selected output table for an input vector in the result cache and the persistent cache.
+
+        :param element_values: input vector from GoldSim
+        :param cache_state: PHREEQC setup the table was calculated with, @see ResultCache.get
+        :param table: selected output table with headings, initial and equilibrated rows
+        :param warm: the table came from a warm start
+
+        :return: None
+        """
+        if self.RESULT_CACHE is not None:
+            self.RESULT_CACHE.put(self.cache_values(element_values), cache_state, table)
+        # Warm start results depend on the saved solution so are never stored on disk.
+        if self.DISK_CACHE is not None and not warm:
+            self.DISK_CACHE.put(self.SOLUTION_TEMPLATE.render(1, element_values), [list(row) for row in table])
+
+    def cache_values(self, element_values):
+        """
+        Normalises an input vector for use as a result cache key.
+
+        :param element_values: input vector from GoldSim
+
+        :return: list of input values with any ignored GoldSim pH replaced by the config pH
+        """
+        values = list(element_values)
+        if 'pH' in self.ELEMENTS and self.USE_CONFIG_PH:
+            # GoldSim pH is ignored when using the config pH so it should not affect the match.
+            values[self.ELEMENTS.index('pH')] = self.PH
+        return values
+
+    def build_input_string(self, solutions, save=None):
+        """
+        Creates the PHREEQC input string for one or more input vectors, each as its own simulation, from the
+        solution template compiled in InitialChecks.
+
+        :param solutions: list of (solution number, input vector) pairs
+        :param save: list of numbers to save each equilibrated solution as for warm starts, or None
+
+        :return: PHREEQC input string
+        """
+        return self.SOLUTION_TEMPLATE.render_batch(solutions, save)
+
+    def convert_output(self, phreeqc_values):
+        """
+        Converts the PHREEQC selected output for one solution into the GoldSim output vector.
+
+        :param phreeqc_values: selected output table with headings, initial and equilibrated rows
+
+        :return: list of output values in ELEMENTS order
+        """
+
+        return self.output_map(phreeqc_values[0]).convert(phreeqc_values[2])
+
+    def output_map(self, headings):
+        """
+        Resolves the output columns once, only repeated if PHREEQC changes the selected output headings.
+
+        :param headings: selected output headings
+
+        :return: OutputMap for the headings
+        """
+        if self.OUTPUT_MAP is None or self.OUTPUT_MAP.headings != tuple(headings):
+            self.OUTPUT_MAP = OutputMap(headings, self.ELEMENTS, self.USE_CONFIG_PH)
+        return self.OUTPUT_MAP
+
+    def process_input(self, input_string, cold_string=None, speciation=False):
+        """
+        Runs a selected input string on the PHREEQC connection and returns the output
+
+        :param input_string: input for simulation
+        :param cold_string: when input_string is a warm start, the cold start input to fall back to if it fails
+        :param speciation: whether input_string is the speciation pass, which is only a warning if it fails as the
+                           solutions are then equilibrated
+
+        :return: @see Dispatch.getSelectedOutputArray()
+        """
+
+        profiling = self.PROFILER is not None
+        if profiling:
+            started = timer()
+
+        # Making sure Iphreeqc is still running and hasn't been killed of during simulation
+        if not self.PHREEQC:
+            if self.WARM_START is not None:
+                self.WARM_START.saved = False
+            try:
+                self.PHREEQC = self.start_engine()
+                self.PHREEQC.LoadDatabase(self.DB_PATH)
+            except ENGINE_ERRORS as e:
+                self.PHREEQC = None
+                self.write_log("Error restarting PHreeqc connection\n%s"
+                               "Database is not connected or PHREEQC not running.\n" % e, True)
+                return None
+            self.write_log("PHREEQC restarted at step %d.\n" % self.STEP)
+            # The new engine has no saved solution to warm start from.
+            if cold_string is not None:
+                input_string, cold_string = cold_string, None
+
+        failed = False
+        # noinspection PyBroadException
+        try:
+            self.PHREEQC.RunString(input_string)
+        # Running the input through Iphreeqc and catching any error that may be returned.
+        except Exception:
+            failed = True
+            phreeqc_error = self.PHREEQC.GetErrorString()
+            if cold_string is not None and self.WARM_FALLBACK:
+                self.WARM_START.fallback()
+                if self.DEBUG_LEVEL:
+                    self.write_log('Warm start failed at step %d, falling back to a cold start: \n%s' %
+                                   (self.STEP, phreeqc_error))
+                return self.process_input(cold_string)
+            if self.RETRY_LADDER is not None:
+                output = self.retry_input(input_string, phreeqc_error, cold_string is not None)
+                if output is not None:
+                    return output
+            if speciation:
+                self.WARNINGS = 1
+                if (self.MESSAGES.add('Warning', phreeqc_error, self.STEP) and
+                        (not self.SUPPRESS_WARNINGS or self.DEBUG_LEVEL)):
+                    self.write_log('Warning at step %d: speciation failed, equilibrating instead: \n%s' %
+                                   (self.STEP, phreeqc_error))
+            else:
+                if phreeqc_error:
+                    self.ERRORS = 1
+                # Errors are always written in full, they are only counted for the summary.
+                self.MESSAGES.add('Error', phreeqc_error, self.STEP)
+                self.write_log('Error at step %d: \n%s' % (self.STEP, phreeqc_error), True)
+        if self.WARM_START is not None:
+            self.WARM_START.saved = not failed
+        if profiling:
+            started = self.PROFILER.record('RunString', started)
+
+        #Logging any warnings from Iphreeqc to the log file if the user has not suppressed them
+        warning = self.PHREEQC.GetWarningString()  # TODO Investigate passing warning back to GoldSim issue #12
+        if warning:
+            self.WARNINGS = 1
+            if self.MESSAGES.add('Warning', warning, self.STEP) and (not self.SUPPRESS_WARNINGS or self.DEBUG_LEVEL):
+                self.write_log('Warning at step %d: \n%s' % (self.STEP, warning))
+        if profiling:
+            started = self.PROFILER.record('warnings', started)
+        read_rows = getattr(self.PHREEQC, 'GetSelectedOutputLastRows', None) if self.PROJECTION else None
+        if read_rows is not None:
+            # Only the equilibrated rows are read, straight into the reused float buffer.
+            headings, count = read_rows(self.OUTPUT_BUFFER)
+            width = len(headings)
+            output = ((headings,) + tuple([self.OUTPUT_BUFFER[i * width:(i + 1) * width] for i in range(count)])
+                      if headings else ())
+        else:
+            output = self.PHREEQC.GetSelectedOutputArray()
+        if profiling:
+            self.PROFILER.record('GetSelectedOutputArray', started)
+        return output
+
+    def retry_input(self, input_string, phreeqc_error, warm=False):
+        """
+        Re-runs a failed input string with each rung of the retry ladder in turn until one succeeds.
+
+        Attempts run on the PHREEQC connection, or on a single worker process when they have a time budget so an
+        attempt that runs over can be stopped.
+
+        :param input_string: input that failed
+        :param phreeqc_error: error from the failed run, logged if a rung succeeds
+        :param warm: input_string is a warm start, its equilibrium phases are never removed
+
+        :return: @see Dispatch.getSelectedOutputArray() from the first rung that succeeded, None if all of them failed
+        """
+
+        # The saved solution is not kept by attempts on the worker or without phases.
+        if self.WARM_START is not None:
+            self.WARM_START.saved = False
+        if self.RETRY_BUDGET and self.RETRY_POOL is None:
+            import multiprocessing
+            from EnginePool import EnginePool
+            if self.POOL_PYTHON:
+                multiprocessing.set_executable(self.POOL_PYTHON)
+            try:
+                self.RETRY_POOL = EnginePool(1, self.DB_PATH, self.engine_factory())
+            except (OSError, IOError) as e:
+                self.write_log("Error starting the retry engine process: %s\n" % e, True)
+                return None
+        output = None
+        for rung, attempt in self.RETRY_LADDER.attempts(input_string, self.EQ_PHASES, warm):
+            started = timer()
+            if self.RETRY_POOL is not None:
+                output, error, warning = self.RETRY_POOL.run([attempt], self.RETRY_BUDGET)[0]
+            else:
+                error = ''
+                # noinspection PyBroadException
+                try:
+                    self.PHREEQC.RunString(attempt)
+                except Exception:
+                    error = self.PHREEQC.GetErrorString() or 'PHREEQC RunString failed with no error message.\n'
+                output = self.PHREEQC.GetSelectedOutputArray() if not error else None
+            elapsed = timer() - started
+            self.RETRY_LADDER.record(rung, not error and bool(output), elapsed)
+            if self.DEBUG_LEVEL:
+                self.write_log('Retry rung %d (%s) at step %d %s after %.3f s.\n%s' %
+                               (rung, self.RETRY_LADDER.describe(rung), self.STEP, 'failed' if error else 'succeeded',
+                                elapsed, error))
+            if not error and output:
+                self.WARNINGS = 1
+                if self.MESSAGES.add('Recovered error', phreeqc_error, self.STEP):
+                    self.write_log('Warning at step %d: PHREEQC failed and was rerun with retry rung %d (%s): \n%s' %
+                                   (self.STEP, rung, self.RETRY_LADDER.describe(rung), phreeqc_error))
+                break
+            output = None
+        else:
+            self.RETRY_LADDER.unrecovered += 1
+
+        # Later steps run with PHREEQC's default settings.
+        reset_string = self.RETRY_LADDER.reset_string()
+        if self.RETRY_POOL is None and reset_string:
+            # noinspection PyBroadException
+            try:
+                self.PHREEQC.RunString(reset_string)
+            except Exception:
+                self.write_log('Error resetting the PHREEQC KNOBS after retrying step %d: \n%s' %
+                               (self.STEP, self.PHREEQC.GetErrorString()), True)
+        return output
+
+    def process_vector(self, step, cell, element_values, save=None):
+        """
+        Runs a single input vector on the PHREEQC connection, used when the batch it was part of failed.
+
+        :param step: STEP number of the vector
+        :param cell: cell index of the vector
+        :param element_values: input vector
+        :param save: number to save the equilibrated solution as for warm starts, or None
+
+        :return: selected output table, None if PHREEQC failed on the vector
+        """
+        output = self.process_input(self.build_input_string([(step, element_values)],
+                                                            [save] if save is not None else None))
+        tables = split_selected_output(output) if output else []
+        if len(tables) == 1:
+            return tables[0]
+        self.ERRORS = 1
+        self.write_log('Error at step %d: PHREEQC failed on cell %d.\n' % (step, cell), True)
+        return None
+
+    def process_input_pool(self, input_strings, speciation=False):
+        """
+        Runs several input strings across the engine pool and returns the outputs in the same order.
+
+        :param input_strings: inputs for simulation
+        :param speciation: whether the inputs are the speciation pass, @see process_input
+
+        :return: list of @see Dispatch.getSelectedOutputArray(), None for an input that could not be run
+        """
+
+        outputs = [None] * len(input_strings)
+        debug_string = ''
+        if self.PROFILER is not None:
+            started = timer()
+        results = self.ENGINE_POOL.run(input_strings)
+        if self.PROFILER is not None:
+            self.PROFILER.record('engine pool', started)
+        for i, (output, error, warning) in enumerate(results):
+            if error and self.RETRY_LADDER is not None:
+                output = self.retry_input(input_strings[i], error)
+                if output is not None:
+                    outputs[i] = output
+                    continue
+            if error and speciation:
+                self.WARNINGS = 1
+                if (self.MESSAGES.add('Warning', error, self.STEP) and
+                        (not self.SUPPRESS_WARNINGS or self.DEBUG_LEVEL)):
+                    debug_string += 'Warning at step %d: speciation failed, equilibrating instead: \n%s' % \
+                                    (self.STEP, error)
+            elif error:
+                self.ERRORS = 1
+                self.MESSAGES.add('Error', error, self.STEP)
+                debug_string += 'Error at step %d: \n%s' % (self.STEP, error)
+            if warning:
+                self.WARNINGS = 1
+                if (self.MESSAGES.add('Warning', warning, self.STEP) and
+                        (not self.SUPPRESS_WARNINGS or self.DEBUG_LEVEL)):
+                    debug_string += 'Warning at step %d: \n%s' % (self.STEP, warning)
+            outputs[i] = output if not error else None
+        if debug_string:
+            self.write_log(debug_string, bool(self.ERRORS))
+        return outputs
+
+
+# Default session used by the GoldSim entry points, created by default_session on first use so importing GoldQC
+# does not read any files.
+SESSION = None
+
+
+def default_session():
+    """
+    Returns the default session, creating it from GoldQC.config the first time. GoldSim calls CalcInputs and
+    CalcOutputs first, so the config is parsed before GoldSim needs the number of inputs and outputs.
+
+    :return: the default GoldQCSession
+    """
+    global SESSION
+    if SESSION is None:
+        SESSION = GoldQCSession("GoldQC.config")
+    return SESSION
+
+
+def parseConfig(config_file="GoldQC.config"):
+    """
+    Parses a config file into the default session, @see GoldQCSession.parseConfig.
+    """
+    global SESSION
+    if SESSION is None:
+        SESSION = GoldQCSession(config_file)
     else:
-        PHREEQC_SPECS = ('\ttemp\t\t%s\n\tpH\t\t\t%s\n\tpe\t\t\t%s\n\tredox\t\t%s\n' % (TEMP, PH, PE, REDOX))
-        TOTALS = "".join(['%s ' % s for s in ELEMENTS])
+        SESSION.parseConfig(config_file)
 
-    # Extracting Equilibrium phases
-    EQ_PHASES = 'EQUILIBRIUM_PHASES\n%s' % "".join(['\t%s\t%s\t%s\n' % (e[0], e[1], e[2]) for e in EQ_OPTIONS])
 
-    debug_string += "Successfully Started GoldQC.py script at %s.\n\n" % \
-                    datetime.datetime.now().strftime("%x %H:%M")
-    with open(LOG_FILE_NAME, 'a', 0) as Log:
-        Log.write(debug_string)
-    return 0
+def write_log(message, flush=False):
+    """
+    Writes a message to the log file of the default session, @see GoldQCSession.write_log. If the default session
+    can not be created, e.g. GoldQC.config is missing, the message is appended to DEFAULT_LOG_FILE instead.
+    """
+    try:
+        session = default_session()
+    except (Exception, SystemExit):
+        with open(DEFAULT_LOG_FILE, 'a', 0) as Log:
+            Log.write(message)
+        return
+    session.write_log(message, flush)
+
+
+def InitialChecks():
+    """
+    ****DO NOT REMOVE****
+    Required by GoldSim External element. @see GoldQCSession.InitialChecks.
+    """
+    return default_session().InitialChecks()
 
 
 def PyModuleVersion():
@@ -293,108 +1529,34 @@ def PyModuleVersion():
 
 def CalcInputs():
     """
-    Returns the number of elements as specified by the elements config.
-    This should match the number of inputs from GoldSim.
-
     ****DO NOT REMOVE****
-    Required by GoldSim External element.
-
-    :return:    Number of inputs expected. -1 is an error
+    Required by GoldSim External element. @see GoldQCSession.CalcInputs.
     """
-    return len(ELEMENTS)
+    return default_session().CalcInputs()
 
 
 def CalcOutputs():
     """
-    Returns the number of elements as specified by the elements config.
-    This should match the size of the vector GoldSim is expected to be returned.
-
     ****DO NOT REMOVE****
-    Required by GoldSim External element.
-
-    :return:    Number of outputs expected. -1 is an error
+    Required by GoldSim External element. @see GoldQCSession.CalcOutputs.
     """
-    return len(ELEMENTS)
+    return default_session().CalcOutputs()
 
 
 def CustomCalculations(input_list, num_return):
     """
-    Handles conversion from GoldSim format to Python style list. The function then passes the input to
-    MyCustomCalculations for processing to IPhreeqc format before being ran in PHREEQC and passed back
-    with conversions from PHREEQC to Python to GoldSim.
-
     ****DO NOT REMOVE****
-    Required by GoldSim External element.
-
-
-    :param: input_list the list of floats which is the input array from GoldSim.
-    :param: num_return the total number of indices to return in the list which goes back to CustomPython.pyx.
-    
-    :return: return_list list of floats with NumToReturn indexes which will be written to the output arguments array.
+    Required by GoldSim External element. @see GoldQCSession.CustomCalculations.
     """
-    # globals
-    global IN_VAR_LIST, RET_VAR_LIST, VAR_TYPE_IND, VAR_CNT_IND
-    global DEBUG_LEVEL
-
-    num_output_vars = len(RET_VAR_LIST)  # the number of input variables.
-    start_index = 0  # the starting index for the input.
-    tst_indexes = list()  # the indexes for testing
-    py_input_list = list()  # inputs in Python list format
-
-    tst_indexes.append(0)
-    current_indexes = int(IN_VAR_LIST[0][VAR_CNT_IND])
-    var_in_list = input_list[start_index:(start_index + current_indexes)]
-    input_vector = var_in_list
-    py_input_list.append(input_vector)
-    start_index = start_index + current_indexes
-    tst_indexes.append(start_index)
-
-    ret_var_list = MyCustomCalculations(py_input_list)
-    if not isinstance(ret_var_list, list):
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            Log.write("ERROR: the input type from GoldSim was not a vector")
-        return -1
-    if len(ret_var_list) != num_output_vars:
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            Log.write("Received %d variables back from processing in "
-                      "function CustomCalculations. Expected %d variables.\n" %
-                      (len(ret_var_list), num_output_vars))
-        return [-1]
-    return_list = ret_var_list[0]
-
-    # noinspection PyTypeChecker
-    if len(return_list) != num_return:
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            # noinspection PyTypeChecker
-            Log.write("Created return list with wrong length. Return "
-                      "list has length %d. Needs to have length %d.\n" %
-                      (len(return_list), num_return))
-        return [-1]
-    return return_list
+    return default_session().CustomCalculations(input_list, num_return)
 
 
 def WrapUpStuff():
     """
     ****DO NOT REMOVE****
-    Required by GoldSim External element.
-
-    Required to end off the log file with completion time and any other useful information
-    :return: None
+    Required by GoldSim External element. @see GoldQCSession.WrapUpStuff.
     """
-
-    global ERRORS, WARNINGS
-    # local imports
-    if ERRORS:
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            Log.write("Error: GoldQC enocunterd some error(s). Please check the log")
-        exit(-1)
-    with open(LOG_FILE_NAME, 'a', 0) as Log:
-        if WARNINGS:
-            Log.write("GoldQC completed successfully but with warnings at %s.\n" %
-                      datetime.datetime.now().strftime("%x %H:%M"))
-        else:
-            Log.write("GoldQC completed successfully at %s.\n" % datetime.datetime.now().strftime("%x %H:%M"))
-    return
+    return default_session().WrapUpStuff()
 
 
 def PythonInitializationError():
@@ -412,186 +1574,39 @@ def PythonInitializationError():
     debug_string += str("in your Python module to test and to ensure that it \n")
     debug_string += str("runs without error.\n")
 
-    with open(LOG_FILE_NAME, 'a', 0) as Log:
-        Log.write(debug_string)
+    write_log(debug_string, True)
     return
 
 
 def MyCustomCalculations(input_list):
     """
-    Required to transform the input from GoldSim to a PHREEQC simulation string then transform the result from
-    PHREEQC back to GoldSims expected format
-
-    :param: input_list A list of the input values/parameters from the GoldSim
-
-    :return: return_list A list of the output values which needs to be in the format expected by RET_VAR_LIST
+    Runs GoldSim input on the default session, @see GoldQCSession.MyCustomCalculations.
     """
+    return default_session().MyCustomCalculations(input_list)
 
-    # globals
-    global LOG_FILE_NAME
-    global STEP, PHREEQC_SPECS, EQ_PHASES, CHARGE, USE_CONFIG_PH, PH
-    global DEBUG_LEVEL
-    global ERRORS
-
-    debug_string = ''
-
-    if DEBUG_LEVEL:
-        debug_string += "Step %d\n" % STEP
-    element_values = input_list[0]
-
-    if DEBUG_LEVEL:
-        debug_string += "Input Values:\n"
-        table = PrettyTable(["Element"] + ELEMENTS)
-        table.add_row(["Value"] + element_values)
-        debug_string += '%s\n\n' % table
-
-    # Creating input string for input to PHREEQC
-    items = OrderedDict(zip(ELEMENTS, element_values))
-    if CHARGE in ELEMENTS:
-        items[CHARGE] = "%s\tcharge" % items[CHARGE]
-    if CHARGE not in ELEMENTS and CHARGE:
-        items.update({CHARGE: '0\tcharge'})
-    if 'pH' in ELEMENTS:
-        # Setting pH to be config specified or GoldSim specified with h+ conversion
-        items['pH'] = PH if USE_CONFIG_PH else -log10(items['pH'])
-    input_string = 'SOLUTION %d\n\tunits\t\tmg/l\n\tdensity\t\t1\n\t-water\t\t1\n' \
-                   '%s%s%sSELECTED_OUTPUT\n\t-water\t\ttrue\n\t-totals %s\nEND\n\n' % \
-                   (STEP, PHREEQC_SPECS,
-                    "".join(['\t%s\t\t\t%s\n' % (element, value) for element, value in items.items()]),
-                    EQ_PHASES, TOTALS)
-
-    # Input string created, Logging details.
-    if DEBUG_LEVEL > 1:
-        debug_string += input_string
-
-    # calling PHREEQC
-    phreeqc_values = process_input(input_string)
-
-    # Confirming PHREEQC did not return an error.
-    if phreeqc_values is None or not phreeqc_values:
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            Log.write(debug_string)
-        STEP += 1
-        ERRORS = 1
-        return -1
-
-    # Processing PHREEQC output to GoldSim format
-    if 'pH' in ELEMENTS:
-        headings = list(phreeqc_values[0])[-len(element_values)+1:]
-        values = list(phreeqc_values[2])[-len(element_values)+1:]
-        water = list(phreeqc_values[2])[-len(element_values)]
-        ph = list(phreeqc_values[2])[-len(element_values) - 2]
-        ph = 10 ** -ph if not USE_CONFIG_PH else ph
-    else:
-        headings = list(phreeqc_values[0])[-len(element_values):]
-        values = list(phreeqc_values[2])[-len(element_values):]
-        water = list(phreeqc_values[2])[-len(element_values)-1]
-        ph = list(phreeqc_values[2])[-len(element_values) - 3]
-
-    # Converting mol/kgw to mg/l ONLY NEEDED IN TOTALS MODE
-    i = 0
-    while i < len(headings):
-        headings[i] = re.sub('\(mol/kgw\)$', '', headings[i])
-        values[i] = float(values[i] * MOLAR_MASS_LIST[headings[i]] * 1000.0 * float(1 / water))
-        i += 1
-
-    # Formatting values into GoldSim required format
-    return_list = list()
-
-    # Handling adding pH back into the correct spot in the returned array.
-    if 'pH' in ELEMENTS:
-        original_list = OrderedDict(zip(ELEMENTS, element_values))
-        phreeqc_list = OrderedDict(zip(headings, values))
-        for key in original_list.keys():
-            if key in phreeqc_list.keys():
-                original_list[key] = phreeqc_list[key]
-            else:  # Should be pH the only element not in phreeqc totals that is in the Orginal List.
-                original_list[key] = ph
-        return_list.append(original_list.values())
-    else:
-        return_list.append(values)
-
-    # Writing debug information to the log file.
-    if DEBUG_LEVEL:
-        debug_string += "Output Values:\n"
-        table = PrettyTable(["Element"] + ELEMENTS)
-        table.add_row(["mol/kg"] + return_list[0])
-        debug_string += '%s\n\n' % table
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            Log.write(debug_string)
 
-    STEP += 1
-    return return_list
-
-
-def process_input(input_string):
+def MyCustomCalculationsBatch(vector_list):
     """
-    Runs a selected input string on the PHREEQC connection and returns the output
-
-    :param input_string: input for simulation
-
-    :return: @see Dispatch.getSelectedOutputArray()
+    Runs several input vectors on the default session, @see GoldQCSession.MyCustomCalculationsBatch.
     """
-
-    # globals
-    global LOG_FILE_NAME, PHREEQC, STEP, DB_PATH, ERRORS, WARNINGS, SUPPRESS_WARNINGS
-
-    from comtypes.client import CreateObject
-
-    # Making sure Iphreeqc is still running and hasn't been killed of during simulation
-    if not PHREEQC:
-        try:
-            PHREEQC = CreateObject('IPhreeqcCOM.Object')
-            PHREEQC.LoadDatabase(DB_PATH)
-        except WindowsError as e:
-            with open(LOG_FILE_NAME, 'a', 0) as Log:
-                Log.write("Error restarting PHreeqc connection\n")
-                Log.write(str(e))
-                Log.write("Database is not connected or PHREEQC not running.\n")
-        return None
-
-    # noinspection PyBroadException
-    try:
-        PHREEQC.RunString(input_string)
-    # Running the input through Iphreeqc and catching any error that may be returned.
-    except Exception:
-        with open(LOG_FILE_NAME, 'a', 0) as Log:
-            Log.write(str('Error at step %d: \n' % STEP))
-            phreeqc_error = PHREEQC.GetErrorString()
-            if phreeqc_error:
-                ERRORS = 1
-                Log.write(phreeqc_error)
-
-    #Logging any warnings from Iphreeqc to the log file if the user has not suppressed them
-    warning = PHREEQC.GetWarningString()  # TODO Investigate passing warning back to GoldSim issue #12
-    if warning:
-        WARNINGS = 1
-        if not SUPPRESS_WARNINGS or DEBUG_LEVEL:
-            with open(LOG_FILE_NAME, 'a', 0) as Log:
-                Log.write('Warning at step %d: \n' % STEP)
-                Log.write(warning)
-    output = PHREEQC.GetSelectedOutputArray()
-    return output
+    return default_session().MyCustomCalculationsBatch(vector_list)
 
 
 # Only used to test if the all components needed to use GoldQC are installed.
 def main():
-    status = InitialChecks()
+    session = default_session()
+    status = session.InitialChecks()
     if status:
         exit(status)
-    global ELEMENTS, ERRORS
-    ELEMENTS = ['Al', 'Ca', 'Mg', 'Na', 'pH', 'S(6)', 'Cl', 'Br']
+    session.ELEMENTS = ['Al', 'Ca', 'Mg', 'Na', 'pH', 'S(6)', 'Cl', 'Br']
     test_list = [["0.12", "323", "458", "4.32", "6", "0.34", "1.23", "95.6554"]]
-    output = MyCustomCalculations(test_list)
-    if output and not ERRORS:
+    output = session.MyCustomCalculations(test_list)
+    if output and not session.ERRORS:
         print "Success! Everything is setup and ready to use"
     else:
         print "Error: Something went wrong. Check the log."
-    WrapUpStuff()
-
+    session.WrapUpStuff()
 
-# Calling parseConfig as file is loaded to avoid error with GoldSim requiring number of inputs and outputs
-parseConfig()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: LogWriter.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Buffers messages for the GoldQC log file in memory and writes them in batches from a background thread, so
+logging (in particular debug logging) does not open and write the log file on every GoldSim step.
+"""
+# ===========================================================================
+import threading
+
+
+class LogWriter(object):
+    """
+    Buffered, thread safe writer for the GoldQC log file.
+
+    Messages are appended to an in memory buffer and written to the file, which is kept open, every
+    flush_interval seconds by a background thread or whenever flush is called. If the buffer is full new messages
+    are dropped and counted rather than blocking the simulation; the count is written with the next flush.
+    """
+
+    def __init__(self, file_name, flush_interval=1.0, max_buffer=10000, mode='a'):
+        """
+        :param file_name: path of the log file.
+        :param flush_interval: seconds between background flushes, 0 or less writes every message immediately.
+        :param max_buffer: maximum number of messages held before new messages are dropped.
+        :param mode: mode the log file is opened with, 'w' clears any previous log.
+        """
+        self.file_name = file_name
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._file = open(file_name, mode)
+        self._stop = threading.Event()
+        self._thread = None
+        if flush_interval > 0:
+            self._thread = threading.Thread(target=self._run, name='GoldQC log writer')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def write(self, message):
+        """
+        Queues a message for the log file.
+
+        :param message: text to write, including any new lines.
+
+        :return: None
+        """
+        with self._buffer_lock:
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                return
+            self._buffer.append(message)
+        if self._thread is None:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes all buffered messages to the log file.
+
+        :return: None
+        """
+        with self._file_lock:
+            with self._buffer_lock:
+                messages, self._buffer = self._buffer, []
+                dropped = self.dropped - self._reported_dropped
+                self._reported_dropped = self.dropped
+            if dropped:
+                messages.append("Log buffer full, %d message(s) were dropped.\n" % dropped)
+            if messages and not self._file.closed:
+                self._file.write("".join(messages))
+                self._file.flush()
+
+    def close(self):
+        """
+        Stops the background thread, writes any remaining messages and closes the log file.
+
+        :return: None
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        with self._file_lock:
+            self._file.close()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: MessageCounter.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Counts PHREEQC warnings and errors by signature, the message with its step specific numbers removed, so each
+distinct warning is only written to the log in full the first few times and the rest are summarised at the end of
+the run. Errors are always written in full and only counted for the summary.
+"""
+# ===========================================================================
+import re
+
+# Numbers on their own, not part of a name such as SO4-2 or S(6).
+NUMBER = re.compile(r'(?<![\w.(+-])[-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?')
+# Signatures kept before new ones are counted together, in case messages contain other varying text.
+MAX_SIGNATURES = 1000
+OTHER_SIGNATURE = '(other messages)'
+# Signatures listed in the wrap up summary.
+SUMMARY_SIGNATURES = 50
+
+
+def signature(line):
+    """
+    :return: a message line with its numbers replaced by #.
+    """
+    return NUMBER.sub('#', line.strip())
+
+
+class MessageCounter(object):
+    """
+    Counts the lines of warning and error messages by kind and signature, with the first and last step each was
+    seen at.
+    """
+
+    def __init__(self, repeats=10):
+        """
+        :param repeats: number of times a message is written in full for each of its signatures, 0 for always.
+        """
+        self.repeats = repeats
+        self.messages = 0
+        self.hidden = 0
+        # (kind, signature): [count, first step, last step]
+        self.signatures = {}
+
+    def add(self, kind, message, step):
+        """
+        Counts a message.
+
+        :param kind: message kind, e.g. Warning or Error.
+        :param message: PHREEQC warning or error string, possibly several lines.
+        :param step: GoldQC STEP number the message is for.
+
+        :return: True if a warning should be written to the log, i.e. one of its lines has not been seen
+                 repeats times yet
+        """
+        self.messages += 1
+        write = not self.repeats
+        for line in message.splitlines():
+            if not line.strip():
+                continue
+            key = (kind, signature(line))
+            entry = self.signatures.get(key)
+            if entry is None:
+                if len(self.signatures) >= MAX_SIGNATURES:
+                    key = (kind, OTHER_SIGNATURE)
+                    entry = self.signatures.get(key)
+                if entry is None:
+                    entry = self.signatures[key] = [0, step, step]
+            entry[0] += 1
+            entry[2] = step
+            if entry[0] <= self.repeats:
+                write = True
+        # Errors are always written in full.
+        if not write and kind != 'Error':
+            self.hidden += 1
+        return write
+
+    def summary(self):
+        """
+        :return: The most frequent signatures with their counts and first and last steps for the log file.
+        """
+        summary = "Messages: %d warnings and errors, %d distinct lines, %d messages only counted.\n" % \
+                  (self.messages, len(self.signatures), self.hidden)
+        ordered = sorted(self.signatures.items(), key=lambda item: (-item[1][0], item[1][1]))
+        for (kind, text), (count, first, last) in ordered[:SUMMARY_SIGNATURES]:
+            summary += "\t%d x %s (steps %d to %d): %s\n" % (count, kind, first, last, text)
+        if len(ordered) > SUMMARY_SIGNATURES:
+            summary += "\t... and %d less frequent lines\n" % (len(ordered) - SUMMARY_SIGNATURES)
+        return summary
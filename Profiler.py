@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: Profiler.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Lightweight timing of the phases of each GoldQC step (building the input, running PHREEQC, reading the selected
+output, converting the output and logging). Timings are kept in fixed size histograms so memory use does not grow
+with the number of steps, along with the slowest steps for the wrap up report.
+"""
+# ===========================================================================
+import heapq
+import json
+from math import frexp
+from timeit import default_timer
+
+# Bucket i of a histogram counts durations from 2^(i-1) up to 2^i microseconds, the last bucket is open ended.
+HISTOGRAM_BUCKETS = 32
+SLOWEST_STEPS = 10
+
+# Best available clock, monotonic on Windows where GoldSim runs.
+timer = default_timer
+
+
+class Histogram(object):
+    """
+    Fixed size log2 histogram of durations.
+    """
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds):
+        microseconds = seconds * 1e6
+        bucket = frexp(microseconds)[1] if microseconds >= 1 else 0
+        self.counts[min(bucket, HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, fraction):
+        """
+        :return: upper bound in seconds of the bucket holding the given fraction of durations.
+        """
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(2 ** bucket * 1e-6, self.maximum)
+        return self.maximum
+
+    def to_dict(self):
+        return {'count': self.count, 'total_s': self.total, 'max_s': self.maximum,
+                'mean_s': self.total / self.count if self.count else 0.0,
+                'p50_s': self.percentile(0.5), 'p90_s': self.percentile(0.9), 'p99_s': self.percentile(0.99),
+                'bucket_upper_us': [2 ** bucket for bucket in range(HISTOGRAM_BUCKETS)], 'buckets': self.counts}
+
+
+class StepProfiler(object):
+    """
+    Collects per phase timings for GoldQC steps.
+
+    Phases are timed by chaining record calls, each returning the current time to start the next phase from:
+
+        started = timer()
+        ...
+        started = profiler.record('input', started)
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.order = []
+        self.steps = Histogram()
+        self._slowest = []
+
+    def record(self, phase, started):
+        """
+        Adds the time since started to a phase.
+
+        :param phase: name of the phase.
+        :param started: timer() value the phase started at.
+
+        :return: the current timer() value
+        """
+        now = timer()
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram()
+            self.order.append(phase)
+        histogram.add(now - started)
+        return now
+
+    def record_step(self, step, seconds):
+        """
+        Adds the total time for a GoldSim step, keeping the slowest steps.
+
+        :param step: GoldQC STEP number.
+        :param seconds: time taken by the step.
+
+        :return: None
+        """
+        self.steps.add(seconds)
+        if len(self._slowest) < SLOWEST_STEPS:
+            heapq.heappush(self._slowest, (seconds, step))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, step))
+
+    def slowest(self):
+        """
+        :return: list of (seconds, step) for the slowest steps, slowest first.
+        """
+        return sorted(self._slowest, reverse=True)
+
+    def summary(self):
+        """
+        :return: table of phase timings and the slowest steps for the log file.
+        """
+        line = "%-24s %10s %12s %12s %12s %12s %12s\n"
+        summary = "Step profile:\n" + line % ('phase', 'count', 'total s', 'mean us', 'p50 us', 'p99 us', 'max us')
+        for name, histogram in [(phase, self.phases[phase]) for phase in self.order] + [('step', self.steps)]:
+            if not histogram.count:
+                continue
+            summary += line % (name, histogram.count, '%.3f' % histogram.total,
+                               '%.1f' % (1e6 * histogram.total / histogram.count),
+                               '%.1f' % (1e6 * histogram.percentile(0.5)), '%.1f' % (1e6 * histogram.percentile(0.99)),
+                               '%.1f' % (1e6 * histogram.maximum))
+        summary += "Slowest steps: %s\n" % ", ".join(["%d (%.1f ms)" % (step, 1e3 * seconds)
+                                                      for seconds, step in self.slowest()])
+        return summary
+
+    def write_json(self, path):
+        """
+        Writes the phase histograms and slowest steps to a JSON file.
+
+        :param path: output file path.
+
+        :return: None
+        """
+        contents = {'phases': dict([(phase, self.phases[phase].to_dict()) for phase in self.order]),
+                    'steps': self.steps.to_dict(),
+                    'slowest_steps': [{'step': step, 'seconds': seconds} for seconds, step in self.slowest()]}
+        with open(path, 'w') as f:
+            json.dump(contents, f, indent=2)
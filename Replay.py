@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: Replay.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Replays the steps of a step recording (see StepRecorder.py) through GoldQC without GoldSim, to check performance
+changes and database or engine upgrades against real workloads. The recorded input vectors are run with the config
+the recording was made with, or another config, either serially through CustomCalculations as GoldSim calls it, in
+batches through MyCustomCalculationsBatch or fanned out over the engine pool's worker processes. Outputs are
+compared with the recorded outputs using per element relative tolerances, and the replay's throughput and latency
+are reported next to the recording's.
+
+Usage: python Replay.py recording.gqr [--mode serial|batched|pool] [--batch-size N] [--workers N]
+       [--config FILE] [--engine BACKEND] [--database FILE] [--tolerance T] [--element-tolerance Ca=1e-4 ...]
+       [--save report.json]
+"""
+# ===========================================================================
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from array import array
+from itertools import islice
+from timeit import default_timer
+
+import GoldQC
+from StepRecorder import read_recording
+
+MODES = ('serial', 'batched', 'pool')
+DEFAULT_TOLERANCE = 1e-6
+# Smallest magnitude used when computing relative differences.
+DIFFERENCE_FLOOR = 1e-12
+
+
+def parse_tolerances(items):
+    """
+    :param items: list of 'element=tolerance' strings.
+
+    :return: dictionary of element to relative tolerance
+    """
+    tolerances = {}
+    for item in items:
+        element, _, tolerance = item.partition('=')
+        try:
+            tolerances[element.strip()] = float(tolerance)
+        except ValueError:
+            exit("Error: element tolerance %s is not in the format element=tolerance" % item)
+    return tolerances
+
+
+def latency_stats(latencies, total_time):
+    """
+    :param latencies: array of per step times in seconds.
+    :param total_time: time taken for all the steps.
+
+    :return: dictionary of throughput and latency percentiles in microseconds
+    """
+    ordered = sorted(latencies)
+    if not ordered:
+        return {'steps': 0, 'steps_per_s': 0.0, 'p50_us': 0.0, 'p90_us': 0.0, 'p99_us': 0.0, 'max_us': 0.0,
+                'mean_us': 0.0}
+
+    def percentile(fraction):
+        return 1e6 * ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+    return {'steps': len(ordered), 'steps_per_s': len(ordered) / total_time if total_time else 0.0,
+            'p50_us': percentile(0.5), 'p90_us': percentile(0.9), 'p99_us': percentile(0.99),
+            'max_us': 1e6 * ordered[-1], 'mean_us': 1e6 * sum(ordered) / len(ordered)}
+
+
+class OutputDiff(object):
+    """
+    Compares replayed output vectors with the recorded ones, element by element.
+    """
+
+    def __init__(self, elements, tolerance=DEFAULT_TOLERANCE, element_tolerances=None):
+        """
+        :param elements: element names of the output vectors.
+        :param tolerance: relative tolerance for elements without their own.
+        :param element_tolerances: dictionary of element to relative tolerance.
+        """
+        self.elements = list(elements)
+        self.tolerances = [(element_tolerances or {}).get(element, tolerance) for element in self.elements]
+        self.steps = 0
+        self.mismatched_steps = 0
+        self.failed_steps = 0
+        self.mismatches = [0] * len(self.elements)
+        self.largest = [0.0] * len(self.elements)
+        self.first_step = [None] * len(self.elements)
+
+    def add(self, step, recorded, replayed):
+        """
+        Compares a step's outputs.
+
+        :param step: recorded STEP number.
+        :param recorded: recorded output vector.
+        :param replayed: replayed output vector, None if GoldQC failed on the step.
+
+        :return: None
+        """
+        self.steps += 1
+        if replayed is None:
+            self.failed_steps += 1
+            return
+        mismatched = False
+        for i, (expected, actual, tolerance) in enumerate(zip(recorded, replayed, self.tolerances)):
+            if expected != expected and actual != actual:
+                continue
+            difference = abs(actual - expected) / max(abs(expected), DIFFERENCE_FLOOR)
+            if difference > self.largest[i] or difference != difference:
+                self.largest[i] = difference
+            if not difference <= tolerance:
+                mismatched = True
+                self.mismatches[i] += 1
+                if self.first_step[i] is None:
+                    self.first_step[i] = step
+        if mismatched:
+            self.mismatched_steps += 1
+
+    def passed(self):
+        return not self.mismatched_steps and not self.failed_steps
+
+    def summary(self):
+        """
+        :return: per element table of the differences found.
+        """
+        summary = "Outputs: %d steps compared, %d outside tolerance, %d failed.\n" % \
+                  (self.steps, self.mismatched_steps, self.failed_steps)
+        line = "%-12s %12s %12s %14s %12s\n"
+        summary += line % ('element', 'tolerance', 'mismatches', 'largest diff', 'first step')
+        for i, element in enumerate(self.elements):
+            summary += line % (element, '%.3g' % self.tolerances[i], self.mismatches[i], '%.3g' % self.largest[i],
+                               '' if self.first_step[i] is None else self.first_step[i])
+        return summary
+
+    def to_dict(self):
+        return {'steps': self.steps, 'mismatched_steps': self.mismatched_steps, 'failed_steps': self.failed_steps,
+                'elements': dict([(element, {'tolerance': self.tolerances[i], 'mismatches': self.mismatches[i],
+                                             'largest_difference': self.largest[i], 'first_step': self.first_step[i]})
+                                  for i, element in enumerate(self.elements)])}
+
+
+def run_group(session, mode, vectors):
+    """
+    Runs a group of input vectors: one GoldSim call of all the cells in serial mode, otherwise one batch.
+
+    :return: list of output vectors, None for a vector GoldQC failed on
+    """
+    if mode == 'serial':
+        count = len(session.ELEMENTS)
+        flat = [value for vector in vectors for value in vector]
+        output = session.CustomCalculations(flat, len(flat))
+        if not isinstance(output, list) or len(output) != len(flat):
+            return [None] * len(vectors)
+        return [output[i:i + count] for i in range(0, len(output), count)]
+    outputs = session.MyCustomCalculationsBatch(vectors)
+    return outputs if isinstance(outputs, list) else [None] * len(vectors)
+
+
+def replay(session, rows, mode, group_size, diff):
+    """
+    Replays recorded rows through GoldQC, comparing the outputs as each group completes.
+
+    :param session: initialised GoldQCSession to replay on.
+    :param rows: iterator of recording rows, @see StepRecorder.read_recording.
+    :param mode: one of MODES.
+    :param group_size: vectors per call.
+    :param diff: OutputDiff the outputs are compared in.
+
+    :return: (recorded per step times, replayed per step times, replay wall time) with times in seconds
+    """
+    count = len(diff.elements)
+    recorded = array('d')
+    replayed = array('d')
+    begin = default_timer()
+    while True:
+        group = list(islice(rows, group_size))
+        if not group:
+            break
+        vectors = [list(row[4:4 + count]) for row in group]
+        started = default_timer()
+        outputs = run_group(session, mode, vectors)
+        elapsed = (default_timer() - started) / len(group)
+        for row, output in zip(group, outputs):
+            diff.add(int(row[0]), row[4 + count:], output)
+            recorded.append(row[1])
+            replayed.append(elapsed)
+    return recorded, replayed, default_timer() - begin
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a GoldQC step recording and compare the outputs.")
+    parser.add_argument('recording', help="step recording written with the record_file config option")
+    parser.add_argument('--mode', choices=MODES, default='serial',
+                        help="serial GoldSim calls, batches on one engine or batches over the engine pool")
+    parser.add_argument('--batch-size', type=int, default=100, help="vectors per batch, per worker in pool mode "
+                                                                     "(default 100)")
+    parser.add_argument('--workers', type=int, default=4, help="engine pool workers in pool mode (default 4)")
+    parser.add_argument('--config', help="config file to replay with instead of the one saved in the recording")
+    parser.add_argument('--engine', help="PHREEQC engine backend to replay on, e.g. ctypes or fake")
+    parser.add_argument('--library', help="IPhreeqc shared library for the ctypes engine")
+    parser.add_argument('--database', help="PHREEQC database to replay with")
+    parser.add_argument('--log', default='GoldQC_replay.log', help="log file (default GoldQC_replay.log)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="relative tolerance for outputs (default %g)" % DEFAULT_TOLERANCE)
+    parser.add_argument('--element-tolerance', action='append', default=[], metavar='ELEMENT=TOLERANCE',
+                        help="relative tolerance for one element, may be repeated")
+    parser.add_argument('--save', help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    metadata, count, rows = read_recording(args.recording)
+    directory = tempfile.mkdtemp(prefix='goldqc_replay_')
+    try:
+        config_file = args.config
+        if config_file is None:
+            if not metadata.get('config'):
+                exit("Error: %s has no saved config, use --config" % args.recording)
+            config_file = os.path.join(directory, 'GoldQC.config')
+            with open(config_file, 'wb') as f:
+                f.write(metadata['config'])
+        session = GoldQC.GoldQCSession(config_file)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    # Replaying without overwriting the recording or writing a step by step log.
+    session.RECORD_FILE = ''
+    session.DEBUG_LEVEL = 0
+    session.LOG_FILE_NAME = args.log
+    session.POOL_SIZE = args.workers if args.mode == 'pool' else 0
+    if args.engine:
+        session.ENGINE_BACKEND = args.engine
+    if args.library:
+        session.ENGINE_LIBRARY = args.library
+    if args.database:
+        session.DB_PATH = args.database
+    if session.InitialChecks():
+        exit("Error: GoldQC could not be initialised. Check the log file %s" % session.LOG_FILE_NAME)
+    if session.ELEMENTS != metadata['elements']:
+        exit("Error: the config elements %s do not match the recording's %s" %
+             (session.ELEMENTS, metadata['elements']))
+    if args.mode != 'serial':
+        # Batches do not keep the recording's cells apart, so no step is skipped or warm started from another.
+        session.STEP_SKIPPER = None
+        session.WARM_START = None
+
+    group_size = {'serial': session.CELLS, 'batched': args.batch_size,
+                  'pool': args.batch_size * max(args.workers, 1)}[args.mode]
+    diff = OutputDiff(metadata['elements'], args.tolerance, parse_tolerances(args.element_tolerance))
+    recorded, replayed, wall_time = replay(session, rows, args.mode, group_size, diff)
+
+    stats = {'recorded': latency_stats(recorded, sum(recorded)), 'replayed': latency_stats(replayed, wall_time)}
+    print "Replayed %d of %d recorded steps in %s mode.\n" % (diff.steps, count, args.mode)
+    print "%-14s %14s %14s" % ('', 'recorded', 'replayed')
+    for key, name in (('steps_per_s', 'steps/s'), ('mean_us', 'mean us'), ('p50_us', 'p50 us'),
+                      ('p90_us', 'p90 us'), ('p99_us', 'p99 us'), ('max_us', 'max us')):
+        print "%-14s %14.1f %14.1f" % (name, stats['recorded'][key], stats['replayed'][key])
+    print
+    print diff.summary(),
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'recording': args.recording, 'mode': args.mode, 'latency': stats, 'outputs': diff.to_dict()},
+                      f, indent=2, sort_keys=True)
+    # Last as it exits if any step failed, which the report above also lists.
+    session.WrapUpStuff()
+    if not diff.passed():
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
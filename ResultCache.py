@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: ResultCache.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Provides a bounded, least recently used cache of PHREEQC results so that repeated (or nearly repeated)
+input vectors sent from GoldSim do not each require a full PHREEQC run, and a persistent on disk cache
+that keeps results between realizations and runs.
+"""
+# ===========================================================================
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from math import floor, log, log1p
+
+PERSISTENT_CACHE_FILE = 'GoldQC_cache.sqlite'
+EVICTION_INTERVAL = 500
+
+
+class ResultCache(object):
+    """
+    Bounded least recently used cache of PHREEQC selected output arrays.
+
+    Entries are keyed on the normalised input vector together with the PHREEQC state the vector was run under
+    (e.g. PHREEQC_SPECS, EQ_PHASES) so results are never shared between different simulation setups. When a
+    relative tolerance is set a miss on the exact key falls back to the cached vectors in the same bucket, found by
+    quantising every value on a log scale with a bucket width of the tolerance, so a lookup never scans the cache.
+    Vectors within the tolerance of each other but either side of a bucket boundary are not matched.
+    """
+
+    def __init__(self, max_entries=1000, tolerance=0.0):
+        """
+        :param max_entries: maximum number of results held before the least recently used one is evicted.
+        :param tolerance: relative tolerance for matching input vectors, 0 only matches exact vectors.
+        """
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        # Bucket key to the keys of the entries in that bucket, only used with a tolerance.
+        self._buckets = {}
+        self._width = log1p(tolerance) if tolerance else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(values, state):
+        """
+        Builds the cache key for an input vector.
+
+        :param values: list of input values from GoldSim.
+        :param state: hashable tuple describing the PHREEQC setup the values are run under.
+
+        :return: hashable key
+        """
+        return state, tuple(float(v) for v in values)
+
+    def _is_close(self, a, b):
+        """
+        Checks if every value in a is within the relative tolerance of the matching value in b.
+        """
+        tolerance = self.tolerance
+        for x, y in zip(a, b):
+            if abs(x - y) > tolerance * max(abs(x), abs(y)):
+                return False
+        return True
+
+    def _bucket(self, key):
+        """
+        :return: the bucket key of a cache key, each value quantised to a log scale step of the tolerance.
+        """
+        state, values = key
+        width = self._width
+        # nan and infinite values can not be quantised and are kept as they are.
+        return state, tuple([((v > 0) - (v < 0), int(floor(log(abs(v)) / width)))
+                             if v and v - v == 0 else v for v in values])
+
+    def _find_close(self, key):
+        """
+        Searches the bucket of key for an entry within tolerance of key.
+
+        :return: the matching key or None if there is no match.
+        """
+        for cached in self._buckets.get(self._bucket(key), ()):
+            if self._is_close(key[1], cached[1]):
+                return cached
+        return None
+
+    def _remove(self, key):
+        """
+        Removes an entry's key from its bucket.
+        """
+        bucket = self._bucket(key)
+        keys = self._buckets[bucket]
+        keys.remove(key)
+        if not keys:
+            del self._buckets[bucket]
+
+    def get(self, values, state):
+        """
+        Looks up the result for an input vector, marking it as most recently used.
+
+        :param values: list of input values from GoldSim.
+        :param state: hashable tuple describing the PHREEQC setup.
+
+        :return: the cached result or None on a miss.
+        """
+        key = self.make_key(values, state)
+        if key not in self._entries and self.tolerance:
+            key = self._find_close(key)
+        if key is None or key not in self._entries:
+            self.misses += 1
+            return None
+        result = self._entries.pop(key)
+        self._entries[key] = result
+        self.hits += 1
+        return result
+
+    def put(self, values, state, result):
+        """
+        Stores a result, evicting the least recently used entries if the cache is full.
+
+        :param values: list of input values from GoldSim.
+        :param state: hashable tuple describing the PHREEQC setup.
+        :param result: the PHREEQC selected output to cache.
+
+        :return: None
+        """
+        key = self.make_key(values, state)
+        if key in self._entries:
+            del self._entries[key]
+        elif self.tolerance:
+            self._buckets.setdefault(self._bucket(key), []).append(key)
+        self._entries[key] = result
+        while len(self._entries) > self.max_entries:
+            evicted = self._entries.popitem(last=False)[0]
+            if self.tolerance:
+                self._remove(evicted)
+            self.evictions += 1
+
+    def summary(self):
+        """
+        :return: A single line summary of the cache counters for the log file.
+        """
+        return "Result cache: %d hits, %d misses, %d evictions, %d entries held.\n" % \
+               (self.hits, self.misses, self.evictions, len(self._entries))
+
+
+class PersistentCache(object):
+    """
+    On disk cache of PHREEQC selected output tables backed by sqlite.
+
+    Results are keyed on a hash of the PHREEQC input for a single solution and the identity (path, modification
+    time and size) of the database file, so editing the database invalidates every result calculated with the old
+    version. The cache file uses sqlite's write ahead log so several GoldSim processes can share a cache directory;
+    any locking or IO error is treated as a cache miss rather than failing the step.
+    """
+
+    def __init__(self, directory, db_path, max_entries=100000, timeout=10.0):
+        """
+        :param directory: directory holding the cache file, created if it does not exist.
+        :param db_path: path to the PHREEQC database the results are calculated with.
+        :param max_entries: maximum number of results to keep, the least recently used are evicted first.
+        :param timeout: seconds to wait on a lock held by another process.
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        stat = os.stat(db_path)
+        self.db_path = os.path.abspath(db_path)
+        self.db_id = '%s|%r|%d' % (self.db_path, stat.st_mtime, stat.st_size)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._puts = 0
+
+        self._conn = sqlite3.connect(os.path.join(directory, PERSISTENT_CACHE_FILE), timeout=timeout,
+                                     isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, db_path TEXT, '
+                           'db_id TEXT, output TEXT, last_used REAL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+
+        # Removing results calculated with a previous version of this database.
+        cursor = self._conn.execute('DELETE FROM results WHERE db_path = ? AND db_id != ?',
+                                    (self.db_path, self.db_id))
+        self.invalidated = max(cursor.rowcount, 0)
+
+    def make_key(self, input_string):
+        """
+        :param input_string: PHREEQC input string for one solution, rendered with a fixed solution number.
+
+        :return: hex digest identifying the input string and database.
+        """
+        return hashlib.sha1('%s\n%s' % (self.db_id, input_string)).hexdigest()
+
+    def get(self, input_string):
+        """
+        Looks up the selected output table for an input string.
+
+        :param input_string: PHREEQC input string for one solution, rendered with a fixed solution number.
+
+        :return: the selected output table with headings, initial and equilibrated rows or None on a miss.
+        """
+        key = self.make_key(input_string)
+        try:
+            row = self._conn.execute('SELECT output FROM results WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                self._conn.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), key))
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tuple(tuple(r) for r in json.loads(row[0]))
+
+    def put(self, input_string, output):
+        """
+        Stores the selected output table for an input string.
+
+        :param input_string: PHREEQC input string for one solution, rendered with a fixed solution number.
+        :param output: selected output table with headings, initial and equilibrated rows.
+
+        :return: None
+        """
+        try:
+            self._conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                               (self.make_key(input_string), self.db_path, self.db_id, json.dumps(output),
+                                time.time()))
+        except sqlite3.Error:
+            return
+        self._puts += 1
+        if self._puts % EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used results until the cache is within max_entries.
+
+        :return: None
+        """
+        try:
+            count = self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute('DELETE FROM results WHERE key IN '
+                                   '(SELECT key FROM results ORDER BY last_used LIMIT ?)',
+                                   (count - self.max_entries,))
+                self.evictions += count - self.max_entries
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """
+        Enforces the size cap and closes the cache file.
+
+        :return: None
+        """
+        self.evict()
+        self._conn.close()
+
+    def summary(self):
+        """
+        :return: A single line summary of the cache counters for the log file.
+        """
+        return "Persistent cache: %d hits, %d misses, %d evictions, %d invalidated by a database change.\n" % \
+               (self.hits, self.misses, self.evictions, self.invalidated)
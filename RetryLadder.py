@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: RetryLadder.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Retry ladder for PHREEQC runs that fail to converge. Each rung re-runs the failed input with more robust KNOBS
+settings, and optionally without the equilibrium phases, until one succeeds.
+"""
+# ===========================================================================
+
+# PHREEQC's default KNOBS settings, restored after the ladder so later steps run as normal.
+KNOB_DEFAULTS = {'iterations': 100, 'convergence_tolerance': 1e-8, 'tolerance': 1e-15, 'step_size': 100,
+                 'pe_step_size': 10, 'diagonal_scale': False}
+# Rung option that removes the EQUILIBRIUM_PHASES block when False.
+PHASES_OPTION = 'phases'
+
+
+def validate_rungs(rungs):
+    """
+    :return: a description of the first problem with a retry ladder from the config, or None if it is valid.
+    """
+    if not isinstance(rungs, list):
+        return "the retry ladder must be a list of rungs"
+    for rung in rungs:
+        if not isinstance(rung, dict):
+            return "retry ladder rung %r is not a {option: value} dictionary" % (rung,)
+        for option in rung:
+            if option not in KNOB_DEFAULTS and option != PHASES_OPTION:
+                return "unknown retry ladder option %s, expected one of %s" % \
+                       (option, ", ".join(sorted(KNOB_DEFAULTS.keys() + [PHASES_OPTION])))
+    return None
+
+
+def knobs_block(settings):
+    """
+    :return: a KNOBS block setting the given options.
+    """
+    lines = []
+    for option in sorted(settings):
+        value = settings[option]
+        lines.append('\t-%s\t%s\n' % (option, ('true' if value else 'false') if isinstance(value, bool) else value))
+    return 'KNOBS\n%s' % "".join(lines)
+
+
+class RetryLadder(object):
+    """
+    Builds the retry attempts for a failed input and counts which rungs succeed.
+
+    Every attempt sets all of the KNOBS options used anywhere on the ladder, with PHREEQC's defaults for the ones
+    a rung does not change, so attempts do not depend on the rungs run before them.
+    """
+
+    def __init__(self, rungs):
+        """
+        :param rungs: list of {option: value} dictionaries, @see validate_rungs.
+        """
+        self.rungs = rungs
+        options = set([option for rung in rungs for option in rung if option != PHASES_OPTION])
+        self.defaults = dict([(option, KNOB_DEFAULTS[option]) for option in options])
+        self.failed_steps = 0
+        self.attempts_made = [0] * len(rungs)
+        self.successes = [0] * len(rungs)
+        self.time = [0.0] * len(rungs)
+        self.unrecovered = 0
+
+    def describe(self, rung):
+        """
+        :param rung: rung number, starting from 1.
+
+        :return: the rung's settings as a string for the log file
+        """
+        settings = self.rungs[rung - 1]
+        return ", ".join(["%s %s" % (option, settings[option]) for option in sorted(settings)]) or 'defaults'
+
+    def attempts(self, input_string, eq_phases='', keep_phases=False):
+        """
+        Generates the input string for each rung in turn.
+
+        :param input_string: the input that failed.
+        :param eq_phases: EQUILIBRIUM_PHASES block to remove on rungs with phases set to False.
+        :param keep_phases: never remove the phases, e.g. for warm starts that only equilibrate with them.
+
+        :return: iterator of (rung number, input string)
+        """
+        self.failed_steps += 1
+        for index, rung in enumerate(self.rungs):
+            settings = dict(self.defaults)
+            settings.update([(option, value) for option, value in rung.items() if option != PHASES_OPTION])
+            attempt = input_string
+            if not rung.get(PHASES_OPTION, True) and eq_phases and not keep_phases:
+                attempt = attempt.replace(eq_phases, '')
+            yield index + 1, (knobs_block(settings) if settings else '') + attempt
+
+    def reset_string(self):
+        """
+        :return: input restoring PHREEQC's default KNOBS settings, or '' if the ladder does not change any.
+        """
+        return '%sEND\n' % knobs_block(self.defaults) if self.defaults else ''
+
+    def record(self, rung, succeeded, seconds):
+        """
+        Adds the result of an attempt.
+
+        :param rung: rung number, starting from 1.
+        :param succeeded: whether the attempt ran without errors.
+        :param seconds: time taken by the attempt.
+
+        :return: None
+        """
+        self.attempts_made[rung - 1] += 1
+        self.time[rung - 1] += seconds
+        if succeeded:
+            self.successes[rung - 1] += 1
+
+    def summary(self):
+        """
+        :return: Summary of the steps recovered on each rung for the log file.
+        """
+        summary = "Retry ladder: %d failed runs, %d recovered, %d not recovered.\n" % \
+                  (self.failed_steps, sum(self.successes), self.unrecovered)
+        for index in range(len(self.rungs)):
+            summary += "\tRung %d (%s): %d attempts, %d succeeded, %.2f s\n" % \
+                       (index + 1, self.describe(index + 1), self.attempts_made[index], self.successes[index],
+                        self.time[index])
+        return summary
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: SaturationCheck.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Bookkeeping for the speciation fast path: each step is first run as a speciation of its solution, without the
+equilibrium phases, and only run again with them when the speciation shows a phase above its target saturation
+index. The share of steps taking the fast path and the time it saved are reported in the wrap up.
+"""
+# ===========================================================================
+
+
+class SaturationCheck(object):
+    """
+    Finds the steps whose speciation is supersaturated in an equilibrium phase and times both tiers of the runs.
+
+    Only valid for phases with 0 moles: they can only precipitate, which they do not while below their target
+    saturation index, so the speciated solution is also the equilibrated one.
+    """
+
+    def __init__(self, phases):
+        """
+        :param phases: list of (phase name, target saturation index) pairs.
+        """
+        self.phases = [name for name, _ in phases]
+        self.targets = [float(target) for _, target in phases]
+        self._headings = None
+        self._columns = []
+        self.speciated_steps = 0
+        self.speciation_time = 0.0
+        self.fast_steps = 0
+        self.equilibrated_steps = 0
+        self.equilibrium_time = 0.0
+
+    def supersaturated(self, table):
+        """
+        :param table: selected output table of a speciation run, @see split_selected_output.
+
+        :return: True if any phase is above its target saturation index, or its saturation index is not a number
+        """
+        if self._headings != tuple(table[0]):
+            self._headings = tuple(table[0])
+            self._columns = [self._headings.index('si_%s' % phase) for phase in self.phases]
+        row = table[2]
+        return any([not row[column] <= target for column, target in zip(self._columns, self.targets)])
+
+    def record_speciation(self, seconds, steps, fast_steps):
+        """
+        Adds the time taken to speciate one or more steps.
+
+        :param seconds: time taken by the speciation run.
+        :param steps: number of steps speciated.
+        :param fast_steps: number of those steps that did not need equilibrating.
+
+        :return: None
+        """
+        self.speciated_steps += steps
+        self.speciation_time += seconds
+        self.fast_steps += fast_steps
+
+    def record_equilibrium(self, seconds, steps):
+        """
+        Adds the time taken to equilibrate the supersaturated steps.
+
+        :param seconds: time taken by the equilibrium run.
+        :param steps: number of steps equilibrated.
+
+        :return: None
+        """
+        self.equilibrated_steps += steps
+        self.equilibrium_time += seconds
+
+    def summary(self):
+        """
+        :return: A single line summary of the fast path for the log file.
+        """
+        speciation = self.speciation_time / self.speciated_steps if self.speciated_steps else 0.0
+        equilibrium = self.equilibrium_time / self.equilibrated_steps if self.equilibrated_steps else 0.0
+        # Every speciated step would otherwise have been equilibrated, estimated from the steps that were.
+        saved = "an estimated %.3f s saved against equilibrating every step" % \
+                (equilibrium * self.speciated_steps - self.speciation_time - self.equilibrium_time) \
+            if self.equilibrated_steps else "no steps equilibrated to estimate the time saved from"
+        return "Speciation fast path: %d of %d steps (%.1f%%) below every phase's target saturation index, " \
+               "speciation %.1f us/step, equilibration %.1f us/step, %s.\n" % \
+               (self.fast_steps, self.speciated_steps,
+                100.0 * self.fast_steps / self.speciated_steps if self.speciated_steps else 0.0,
+                1e6 * speciation, 1e6 * equilibrium, saved)
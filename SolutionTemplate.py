@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: SolutionTemplate.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Compiles the parts of the PHREEQC input string that are fixed once GoldQC has been initialised (element order,
+charge balancing, pH handling, solution specifications, equilibrium phases and selected output) into a single
+format string so each step only has to substitute the GoldSim values. Likewise resolves the selected output
+headings once into the columns and molar masses needed to convert PHREEQC totals back to GoldSim values.
+
+Running this module directly times the template against building the input string from scratch each step.
+"""
+# ===========================================================================
+import re
+import timeit
+from collections import OrderedDict
+from math import log10
+from operator import itemgetter
+
+from Conversions import molar_masses
+
+
+class SolutionTemplate(object):
+    """
+    Pre-built PHREEQC SOLUTION/EQUILIBRIUM_PHASES input for a fixed element list.
+
+    The rendered string is identical to building the SOLUTION block element by element: values are written with
+    %s, the charge element is marked with "charge" (or added with a value of 0 when it is not a GoldSim element)
+    and pH is either the config pH or the GoldSim H+ concentration converted with -log10.
+
+    Warm start inputs instead replace the element totals and pH of a solution saved by an earlier simulation with
+    SOLUTION_MODIFY and equilibrate it again, keeping the saved solution's pe and water.
+    """
+
+    def __init__(self, elements, phreeqc_specs, eq_phases, totals, charge=None, ph=7, use_config_ph=True,
+                 projection=False, saturation_indices=()):
+        """
+        :param elements: list of PHREEQC element names in the GoldSim vector order.
+        :param phreeqc_specs: temp, pH, pe and redox lines of the SOLUTION block.
+        :param eq_phases: EQUILIBRIUM_PHASES block.
+        :param totals: elements to report in the SELECTED_OUTPUT totals.
+        :param charge: element used to charge balance the solution or None.
+        :param ph: config pH, used in place of the GoldSim pH when use_config_ph is True.
+        :param use_config_ph: whether to use the config pH or the GoldSim H+ concentration.
+        :param projection: whether to only select the simulation number, pH, mass of water and totals rather than
+                           the default selected output columns.
+        :param saturation_indices: phases to select the saturation indices of, after the totals.
+        """
+        self.elements = list(elements)
+        self.eq_phases = eq_phases
+
+        # Elements listed twice keep their first position but the last value, as a dict built from the vector would.
+        positions = OrderedDict()
+        for index, element in enumerate(self.elements):
+            positions[element] = index
+
+        lines = []
+        indexes = []
+        self._ph_index = None
+        self._ph = ph
+        self._charge = charge
+        self._positions = positions
+        self._warm = None
+        for element, index in positions.items():
+            if element == 'pH' and use_config_ph:
+                lines.append('\tpH\t\t\t%s\n' % escape(ph))
+                continue
+            if element == 'pH':
+                self._ph_index = index
+            lines.append('\t%s\t\t\t%%s%s\n' % (escape(element), '\tcharge' if element == charge else ''))
+            indexes.append(index)
+        if charge and charge not in positions:
+            lines.append('\t%s\t\t\t0\tcharge\n' % escape(charge))
+
+        solution = 'SOLUTION %%d\n\tunits\t\tmg/l\n\tdensity\t\t1\n\t-water\t\t1\n%s%s%s' % \
+                   (escape(phreeqc_specs), "".join(lines), escape(eq_phases))
+        if projection:
+            self.selected_output = 'SELECTED_OUTPUT\n\t-reset\t\tfalse\n\t-simulation\ttrue\n\t-pH\t\ttrue\n' \
+                                   '\t-water\t\ttrue\n\t-totals %s\n' % totals
+        else:
+            self.selected_output = 'SELECTED_OUTPUT\n\t-water\t\ttrue\n\t-totals %s\n' % totals
+        if saturation_indices:
+            self.selected_output += '\t-saturation_indices %s\n' % " ".join(saturation_indices)
+        self._first = '%s%sEND\n\n' % (solution, escape(self.selected_output))
+        self._rest = '%sEND\n\n' % solution
+
+        # itemgetter returns a single item rather than a tuple when given one index.
+        if len(indexes) > 1:
+            self._values = itemgetter(*indexes)
+        elif indexes:
+            self._values = lambda values: (values[indexes[0]],)
+        else:
+            self._values = lambda values: ()
+
+    def render(self, solution_number, element_values, selected_output=True, save=None):
+        """
+        Renders the input for a single solution.
+
+        :param solution_number: number given to the PHREEQC solution, normally the GoldSim step.
+        :param element_values: input vector from GoldSim.
+        :param selected_output: whether to include the SELECTED_OUTPUT block, only needed once per input string.
+        :param save: number to save the equilibrated solution as for warm starts, or None.
+
+        :return: PHREEQC input string for the solution ending in END
+        """
+        if self._ph_index is not None:
+            element_values = list(element_values)
+            element_values[self._ph_index] = -log10(element_values[self._ph_index])
+        template = self._first if selected_output else self._rest
+        if save is not None:
+            template = '%sSAVE solution %d\nEND\n\n' % (template[:-len('END\n\n')], save)
+        return template % ((solution_number,) + self._values(element_values))
+
+    def render_batch(self, solutions, save=None):
+        """
+        Renders the input for one or more solutions, each as its own simulation.
+
+        :param solutions: list of (solution number, input vector) pairs.
+        :param save: list of numbers to save each equilibrated solution as for warm starts, or None.
+
+        :return: PHREEQC input string
+        """
+        return "".join([self.render(number, element_values, i == 0, save[i] if save is not None else None)
+                        for i, (number, element_values) in enumerate(solutions)])
+
+    def render_warm(self, element_values, saved, selected_output=True, water=1.0):
+        """
+        Renders the input to equilibrate a saved solution with new element totals, saving the result in its place.
+
+        Totals are converted from mg/L to mol using the molar masses and the mass of water in the saved solution, so
+        the molalities match a cold start with 1 kg of water. The pH is set as in a cold start, from GoldSim or the
+        config, and with a charge element the solution's charge imbalance is set to 0 so it is balanced again when
+        equilibrated.
+
+        :param element_values: input vector from GoldSim.
+        :param saved: number of the saved solution.
+        :param selected_output: whether to include the SELECTED_OUTPUT block, only needed once per input string.
+        :param water: mass of water in kg in the saved solution.
+
+        :return: PHREEQC input string for the solution ending in END
+        """
+        if self._warm is None:
+            # Resolved on first use so elements without a molar mass only fail when warm starts are used.
+            elements = [element for element in self._positions if element != 'pH']
+            self._warm = [(element, self._positions[element], 1000.0 * mass)
+                          for element, mass in zip(elements, molar_masses(elements))]
+        if self._ph_index is not None:
+            options = '\t-pH\t\t%r\n' % -log10(element_values[self._ph_index])
+        else:
+            options = '\t-pH\t\t%s\n' % escape(self._ph)
+        if self._charge:
+            options += '\t-cb\t\t0\n'
+        totals = "".join(['\t\t%s\t\t%r\n' % (element, element_values[index] * water / mass)
+                          for element, index, mass in self._warm])
+        return 'SOLUTION_MODIFY %d\n%s\t-totals\n%sUSE solution %d\n%sSAVE solution %d\n%sEND\n\n' % \
+               (saved, options, totals, saved, self.eq_phases, saved, self.selected_output if selected_output else '')
+
+    def render_warm_batch(self, solutions, saved, water=None):
+        """
+        Renders the warm start input for one or more solutions, each starting from a saved solution. Solutions
+        sharing a saved solution number each start from the one before.
+
+        :param solutions: list of (solution number, input vector) pairs.
+        :param saved: list of the saved solution number for each solution.
+        :param water: list of the mass of water in kg in each saved solution, or None for 1 kg.
+
+        :return: PHREEQC input string
+        """
+        return "".join([self.render_warm(element_values, saved[i], i == 0, water[i] if water is not None else 1.0)
+                        for i, (number, element_values) in enumerate(solutions)])
+
+
+class OutputMap(object):
+    """
+    Fixed mapping from PHREEQC selected output columns to the GoldSim output vector.
+
+    The totals are the last columns of the selected output, apart from any saturation indices (si_ headings)
+    selected after them. The mass of water and pH are found from their headings, or are taken to be one and three
+    columns before the totals. Totals are converted from mol/kgw to mg/L and pH, if it is a GoldSim element, is
+    placed back in its position in the vector, converted to H+ concentration unless the config pH is used.
+    """
+
+    def __init__(self, headings, elements, use_config_ph=True):
+        """
+        :param headings: first row of the selected output array.
+        :param elements: list of PHREEQC element names in the GoldSim vector order.
+        :param use_config_ph: whether the config pH is used, otherwise pH is returned as H+ concentration.
+        """
+        self.headings = tuple(headings)
+        self.use_config_ph = use_config_ph
+        count = len(self.headings)
+        while count and str(self.headings[count - 1]).startswith('si_'):
+            count -= 1
+        totals = len([element for element in elements if element != 'pH'])
+        names = [re.sub('\(mol/kgw\)$', '', heading) for heading in self.headings[count - totals:]]
+        columns = dict(zip(names, range(count - totals, count)))
+
+        self.water_column = self.headings.index('mass_H2O') if 'mass_H2O' in self.headings else count - totals - 1
+        self.ph_column = self.headings.index('pH') if 'pH' in self.headings else count - totals - 3
+        self.ph_slot = elements.index('pH') if 'pH' in elements else None
+        if self.ph_slot is None:
+            # Values are returned in selected output order, the same as the element order.
+            self.columns = range(count - totals, count)
+            masses = molar_masses(names)
+        else:
+            outputs = [element for element in elements if element != 'pH']
+            self.columns = [columns[element] for element in outputs]
+            masses = molar_masses(outputs)
+        self.conversions = zip(self.columns, masses)
+
+    def convert(self, row):
+        """
+        Converts the equilibrated row of the selected output to the GoldSim output vector.
+
+        :param row: selected output row.
+
+        :return: list of output values in the GoldSim element order
+        """
+        inverse_water = float(1 / row[self.water_column])
+        values = [row[column] * mass * 1000.0 * inverse_water for column, mass in self.conversions]
+        if self.ph_slot is not None:
+            ph = row[self.ph_column]
+            values.insert(self.ph_slot, ph if self.use_config_ph else 10 ** -ph)
+        return values
+
+
+def escape(value):
+    """
+    :return: value as a string safe to embed in a % format string.
+    """
+    return str(value).replace('%', '%%')
+
+
+def _legacy_input_string(step, elements, element_values, phreeqc_specs, eq_phases, totals, charge, ph,
+                         use_config_ph):
+    """
+    Builds the input string the way MyCustomCalculations did before templates, used as the benchmark baseline.
+    """
+    items = OrderedDict(zip(elements, element_values))
+    if charge in elements:
+        items[charge] = "%s\tcharge" % items[charge]
+    if charge not in elements and charge:
+        items.update({charge: '0\tcharge'})
+    if 'pH' in elements:
+        items['pH'] = ph if use_config_ph else -log10(items['pH'])
+    return 'SOLUTION %d\n\tunits\t\tmg/l\n\tdensity\t\t1\n\t-water\t\t1\n' \
+           '%s%s%sSELECTED_OUTPUT\n\t-water\t\ttrue\n\t-totals %s\nEND\n\n' % \
+           (step, phreeqc_specs, "".join(['\t%s\t\t\t%s\n' % (element, value) for element, value in items.items()]),
+            eq_phases, totals)
+
+
+def main():
+    elements = ['Al', 'Ca', 'Mg', 'Na', 'pH', 'S(6)', 'Cl', 'Br']
+    values = [0.12, 323.0, 458.0, 4.32, 1e-6, 0.34, 1.23, 95.6554]
+    specs = '\ttemp\t\t25\n\tpe\t\t\t4\n\tredox\t\tpe\n'
+    eq_phases = 'EQUILIBRIUM_PHASES\n\tGypsum\t0\t0\n'
+    totals = "".join(['%s ' % s for s in elements if s != 'pH'])
+    number = 10000
+
+    for charge, use_config_ph in ((None, True), ('Cl', False), ('Na', True)):
+        args = (elements, values, specs, eq_phases, totals, charge, '7', use_config_ph)
+        template = SolutionTemplate(elements, specs, eq_phases, totals, charge, '7', use_config_ph)
+        assert template.render(1, values) == _legacy_input_string(1, *args)
+        legacy = min(timeit.repeat(lambda: _legacy_input_string(1, *args), number=number, repeat=3))
+        compiled = min(timeit.repeat(lambda: template.render(1, values), number=number, repeat=3))
+        print "charge=%s use_config_pH=%s: legacy %.2f us/step, template %.2f us/step (%.1fx faster)" % \
+              (charge, use_config_ph, 1e6 * legacy / number, 1e6 * compiled / number, legacy / compiled)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: StepRecorder.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Compact binary record of every GoldQC step: the step number, time taken, mass of water, pH and the input and output
+vectors, appended as rows of float64 to a preallocated memory mapped file that grows as needed. The header holds
+the element names, a copy of the config the run used and the number of rows written so far, so a recording is
+readable even if the run was stopped.
+Recordings are loaded as NumPy arrays without copying, or read row by row without NumPy.
+
+Usage: python StepRecorder.py recording.gqr > recording.csv
+"""
+# ===========================================================================
+import json
+import mmap
+import struct
+import sys
+
+MAGIC = 'GoldQCR\x00'
+RECORDING_VERSION = 1
+# Magic, version, header size, element count, rows written. The element names and config follow as JSON.
+HEADER = struct.Struct('<8sIIIQ')
+ROWS_OFFSET = HEADER.size - 8
+# Rows start on a page boundary after the header.
+PAGE_SIZE = 4096
+# Columns before the input and output vectors.
+FIXED_COLUMNS = ('step', 'seconds', 'mass_H2O', 'pH')
+INITIAL_ROWS = 4096
+
+
+def read_header(f):
+    """
+    :param f: recording file opened in binary mode.
+
+    :return: (header size, {'elements': element names, 'config': config file contents}, rows written)
+    """
+    magic, version, header_size, count, rows = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != RECORDING_VERSION:
+        raise ValueError("%s is not a version %d GoldQC step recording" % (getattr(f, 'name', 'file'),
+                                                                          RECORDING_VERSION))
+    metadata = json.loads(f.read(header_size - HEADER.size).rstrip('\x00'))
+    if len(metadata['elements']) != count:
+        raise ValueError("Corrupt GoldQC step recording header")
+    return header_size, metadata, rows
+
+
+def column_names(elements):
+    """
+    :return: names of the columns of a recording's rows.
+    """
+    return list(FIXED_COLUMNS) + ['%s in' % element for element in elements] + \
+        ['%s out' % element for element in elements]
+
+
+class StepRecorder(object):
+    """
+    Appends one row of float64 per step to a memory mapped recording file.
+
+    The file is extended by doubling its size so each row costs a single struct pack into the mapped file. Closing
+    the recorder trims the file to the rows written.
+    """
+
+    def __init__(self, path, elements, config='', initial_rows=INITIAL_ROWS):
+        """
+        :param path: recording file, overwritten if it exists.
+        :param elements: element names of the input and output vectors.
+        :param config: contents of the config file used for the run, so it can be replayed.
+        :param initial_rows: rows the file is first sized for.
+        """
+        self.path = path
+        self.elements = list(elements)
+        self.rows = 0
+        metadata = json.dumps({'elements': self.elements, 'config': config})
+        self.header_size = (HEADER.size + len(metadata) + PAGE_SIZE) // PAGE_SIZE * PAGE_SIZE
+        self._row = struct.Struct('<%dd' % (len(FIXED_COLUMNS) + 2 * len(self.elements)))
+        self.capacity = max(initial_rows, 1)
+        self._file = open(path, 'w+b')
+        self._file.truncate(self.header_size + self.capacity * self._row.size)
+        self._map = mmap.mmap(self._file.fileno(), self.header_size + self.capacity * self._row.size)
+        header = HEADER.pack(MAGIC, RECORDING_VERSION, self.header_size, len(self.elements), 0) + metadata
+        self._map[:len(header)] = header
+
+    def _grow(self):
+        self.capacity *= 2
+        size = self.header_size + self.capacity * self._row.size
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def write(self, step, seconds, water, ph, inputs, outputs):
+        """
+        Appends a step.
+
+        :param step: GoldQC STEP number.
+        :param seconds: time taken by the step.
+        :param water: mass of water in kg, NaN if PHREEQC was not run.
+        :param ph: equilibrated pH, NaN if PHREEQC was not run.
+        :param inputs: input vector from GoldSim.
+        :param outputs: output vector returned to GoldSim.
+
+        :return: None
+        """
+        if self.rows == self.capacity:
+            self._grow()
+        values = [step, seconds, water, ph]
+        values.extend(inputs)
+        values.extend(outputs)
+        self._row.pack_into(self._map, self.header_size + self.rows * self._row.size, *map(float, values))
+        self.rows += 1
+        struct.pack_into('<Q', self._map, ROWS_OFFSET, self.rows)
+
+    def close(self):
+        """
+        Writes the mapped rows to disk and trims the file to them.
+
+        :return: None
+        """
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.truncate(self.header_size + self.rows * self._row.size)
+        self._file.close()
+
+    def summary(self):
+        """
+        :return: A single line summary of the recording for the log file.
+        """
+        return "Step recorder: %d steps of %d elements written to %s.\n" % (self.rows, len(self.elements), self.path)
+
+
+def load_recording(path):
+    """
+    Loads a recording as NumPy arrays mapped from the file, so nothing is copied until it is used.
+
+    :param path: recording file.
+
+    :return: dictionary of element names ('elements'), the config file contents ('config'), one array per fixed
+             column ('step', 'seconds', 'mass_H2O', 'pH') and rows x elements arrays of the 'inputs' and 'outputs'
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy is required to load GoldQC step recordings as arrays, use read_recording instead")
+    with open(path, 'rb') as f:
+        header_size, metadata, rows = read_header(f)
+    elements = metadata['elements']
+    width = len(FIXED_COLUMNS) + 2 * len(elements)
+    if not rows:
+        data = numpy.zeros((0, width))
+    else:
+        data = numpy.memmap(path, dtype='<f8', mode='r', offset=header_size, shape=(rows, width))
+    recording = dict([(name, data[:, column]) for column, name in enumerate(FIXED_COLUMNS)])
+    recording.update(metadata)
+    recording['inputs'] = data[:, len(FIXED_COLUMNS):len(FIXED_COLUMNS) + len(elements)]
+    recording['outputs'] = data[:, len(FIXED_COLUMNS) + len(elements):]
+    return recording
+
+
+def read_recording(path):
+    """
+    Reads a recording row by row without NumPy.
+
+    :param path: recording file.
+
+    :return: ({'elements': element names, 'config': config file contents}, number of rows, iterator of row
+             tuples in column_names order)
+    """
+    f = open(path, 'rb')
+    header_size, metadata, rows = read_header(f)
+    row = struct.Struct('<%dd' % (len(FIXED_COLUMNS) + 2 * len(metadata['elements'])))
+
+    def iterate():
+        with f:
+            f.seek(header_size)
+            for _ in xrange(rows):
+                yield row.unpack(f.read(row.size))
+    return metadata, rows, iterate()
+
+
+def main(argv=None):
+    import csv
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        exit("Usage: python StepRecorder.py recording.gqr > recording.csv")
+    metadata, count, rows = read_recording(argv[0])
+    writer = csv.writer(sys.stdout)
+    writer.writerow(column_names(metadata['elements']))
+    for row in rows:
+        writer.writerow([repr(value) for value in row])
+
+
+if __name__ == "__main__":
+    main()
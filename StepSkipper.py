@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: StepSkipper.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Change driven step skipping: a GoldSim cell's step reuses, or extrapolates, the result of the cell's last PHREEQC
+run while none of its inputs have drifted from that run by more than their thresholds, with a full run forced at
+least every refresh_interval steps. The skip ratio and the largest drift accepted without a run are reported in the
+wrap up.
+"""
+# ===========================================================================
+
+
+class StepSkipper(object):
+    """
+    Decides which steps of each cell need a PHREEQC run, keeping the inputs and outputs of the cell's last two runs.
+
+    Drift is measured from the last run rather than the previous step so slow changes still add up to a run.
+    """
+
+    def __init__(self, elements, threshold, element_thresholds=None, refresh_interval=0, extrapolate=False):
+        """
+        :param elements: input element names, in the order of the input vectors.
+        :param threshold: largest relative drift of an input that is skipped.
+        :param element_thresholds: dictionary of element name to threshold overriding threshold for that element.
+        :param refresh_interval: run every cell at least once every refresh_interval of its steps, 0 for no limit.
+        :param extrapolate: extrapolate linearly along the change in inputs between the cell's last two runs instead
+                            of reusing the last.
+        """
+        element_thresholds = element_thresholds or {}
+        self.elements = list(elements)
+        self.thresholds = [abs(float(element_thresholds.get(element, threshold))) for element in elements]
+        self.refresh_interval = refresh_interval
+        self.extrapolate = extrapolate
+        # Per cell (step, inputs, outputs) of the last run and the one before.
+        self._last = {}
+        self._before = {}
+        # Per cell number of steps skipped since the last run.
+        self._skipped = {}
+        self.runs = 0
+        self.skips = 0
+        self.refreshes = 0
+        self.largest = 0.0
+        self.largest_element = None
+        self.largest_step = None
+
+    def drift(self, last_values, element_values):
+        """
+        :return: (index, relative drift) of the input that drifted the most, with a None index if none changed, or
+                 None if any input drifted past its threshold.
+        """
+        largest = (None, 0.0)
+        for i, (last, value, threshold) in enumerate(zip(last_values, element_values, self.thresholds)):
+            if value == last:
+                continue
+            relative = abs(value - last) / abs(last) if last else float('inf')
+            # Also true for nan inputs.
+            if not relative <= threshold:
+                return None
+            if relative > largest[1]:
+                largest = (i, relative)
+        return largest
+
+    @staticmethod
+    def progress(before_values, last_values, element_values):
+        """
+        :return: how far the inputs have moved on from the last run along the change in inputs between the last two
+                 runs, as a fraction of that change fitted by least squares over the relative changes of each input.
+        """
+        along = 0.0
+        squared = 0.0
+        for before, last, value in zip(before_values, last_values, element_values):
+            if not last:
+                continue
+            change = (last - before) / last
+            along += change * (value - last) / last
+            squared += change * change
+        return along / squared if squared else 0.0
+
+    def predict(self, cell, step, element_values):
+        """
+        :param cell: index of the GoldSim cell.
+        :param step: GoldQC STEP number.
+        :param element_values: input vector, @see GoldQCSession.cache_values.
+
+        :return: output vector to use for the step, or None if the step needs a PHREEQC run
+        """
+        last = self._last.get(cell)
+        if last is None:
+            return None
+        _, last_values, last_output = last
+        values = [float(value) for value in element_values]
+        drift = self.drift(last_values, values)
+        if drift is None:
+            return None
+        if self.refresh_interval and self._skipped[cell] + 1 >= self.refresh_interval:
+            self.refreshes += 1
+            return None
+        self._skipped[cell] += 1
+        self.skips += 1
+        index, relative = drift
+        if relative > self.largest:
+            self.largest = relative
+            self.largest_element = self.elements[index]
+            self.largest_step = step
+        before = self._before.get(cell)
+        if not self.extrapolate or before is None:
+            return list(last_output)
+        _, before_values, before_output = before
+        # Outputs follow the inputs, steps where nothing changed reuse the last result.
+        scale = self.progress(before_values, last_values, values)
+        if not scale:
+            return list(last_output)
+        output = []
+        for previous, current in zip(before_output, last_output):
+            value = current + (current - previous) * scale
+            # Concentrations can not change sign, holding the last value rather than extrapolating past zero.
+            output.append(value if value * current > 0 else current)
+        return output
+
+    def update(self, cell, step, element_values, output):
+        """
+        Records a PHREEQC run of a cell.
+
+        :param cell: index of the GoldSim cell.
+        :param step: GoldQC STEP number.
+        :param element_values: input vector, @see GoldQCSession.cache_values.
+        :param output: output vector returned to GoldSim.
+
+        :return: None
+        """
+        self.runs += 1
+        if cell in self._last:
+            self._before[cell] = self._last[cell]
+        self._last[cell] = (step, [float(value) for value in element_values], list(output))
+        self._skipped[cell] = 0
+
+    def summary(self):
+        """
+        :return: A single line summary of the skipped steps for the log file.
+        """
+        steps = self.runs + self.skips
+        largest = "%.3g%% (%s at step %d)" % (100 * self.largest, self.largest_element, self.largest_step) \
+            if self.largest_element is not None else "none"
+        return "Step skipping: %d of %d steps skipped (%.1f%%), %d runs forced by the refresh interval, largest " \
+               "accepted drift %s.\n" % (self.skips, steps, 100.0 * self.skips / steps if steps else 0.0,
+                                        self.refreshes, largest)
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: Surrogate.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Precomputed surrogate for PHREEQC over the region of composition space a model visits. The space is divided into
+a sparse grid of cells, log spaced in each element's concentration, and each cell visited by a set of sample inputs
+holds a linear model fitted to PHREEQC at the cell centre. Each cell's error is estimated against PHREEQC at its
+corners so GoldQC only interpolates where the surrogate is accurate and runs PHREEQC everywhere else.
+
+Usage: python Surrogate.py samples.csv table.json.gz [--bins-per-decade N] [--header] [--config FILE]
+"""
+# ===========================================================================
+import gzip
+import hashlib
+import json
+from math import floor, log10
+
+from DatabaseIndex import file_hash
+
+TABLE_VERSION = 1
+# Values below this are treated as zero and given their own bin.
+ZERO_VALUE = 1e-12
+ZERO_BIN = -(2 ** 31)
+# Finite difference step as a fraction of the cell width.
+STEP_FRACTION = 0.01
+# Smallest magnitude used when computing relative errors.
+ERROR_FLOOR = 1e-12
+
+
+def fingerprint(elements, phreeqc_specs, eq_phases, charge, ph, use_config_ph, db_path):
+    """
+    :return: sha1 hex digest identifying the PHREEQC setup a surrogate table was built for.
+    """
+    setup = repr((list(elements), phreeqc_specs, eq_phases, charge, str(ph) if use_config_ph else None,
+                  bool(use_config_ph), file_hash(db_path)))
+    return hashlib.sha1(setup).hexdigest()
+
+
+def relative_error(predicted, actual):
+    """
+    :return: the largest relative difference between two output vectors.
+    """
+    return max([abs(p - a) / max(abs(a), ERROR_FLOOR) for p, a in zip(predicted, actual)] or [0.0])
+
+
+class SurrogateTable(object):
+    """
+    Sparse grid of linear models of the GoldQC output vector.
+
+    Cells are keyed by the bin of each varying input, floor(log10(value) * bins_per_decade), and hold the output at
+    the cell centre, the derivative of each output with respect to each input and the estimated relative error.
+    """
+
+    def __init__(self, elements, use_config_ph=True, bins_per_decade=4, setup='', tolerance=0.01):
+        """
+        :param elements: list of PHREEQC element names in the GoldSim vector order.
+        :param use_config_ph: whether the config pH is used, in which case the GoldSim pH is not an input.
+        :param bins_per_decade: number of cells per factor of 10 in each input.
+        :param setup: fingerprint of the PHREEQC setup the table is built for.
+        :param tolerance: largest estimated relative error of a cell that is interpolated.
+        """
+        self.elements = list(elements)
+        self.use_config_ph = use_config_ph
+        self.bins_per_decade = bins_per_decade
+        self.setup = setup
+        self.tolerance = tolerance
+        self.dims = [i for i, element in enumerate(self.elements) if not (element == 'pH' and use_config_ph)]
+        self.cells = {}
+        self.hits = 0
+        self.outside = 0
+        self.rejected = 0
+        self.checks = 0
+        self.max_used_error = 0.0
+        self.max_observed_error = 0.0
+
+    def cell_key(self, element_values):
+        """
+        :return: tuple of the bin of each varying input.
+        """
+        bins_per_decade = self.bins_per_decade
+        return tuple([int(floor(log10(element_values[i]) * bins_per_decade)) if element_values[i] >= ZERO_VALUE
+                      else ZERO_BIN for i in self.dims])
+
+    def cell_bounds(self, key):
+        """
+        :return: list of (low, centre, high) values of each varying input in a cell.
+        """
+        bounds = []
+        for b in key:
+            if b == ZERO_BIN:
+                bounds.append((0.0, 0.0, ZERO_VALUE))
+            else:
+                low = 10 ** (float(b) / self.bins_per_decade)
+                high = 10 ** (float(b + 1) / self.bins_per_decade)
+                bounds.append((low, (low * high) ** 0.5, high))
+        return bounds
+
+    def sample_points(self, key):
+        """
+        Points PHREEQC is run at to build a cell: the centre, the centre stepped in each varying input and the
+        low and high corners used to estimate the error.
+
+        :return: list of input vectors
+        """
+        bounds = self.cell_bounds(key)
+        template = [1e-7 if element == 'pH' else 0.0 for element in self.elements]
+
+        def point(values):
+            vector = list(template)
+            for i, value in zip(self.dims, values):
+                vector[i] = value
+            return vector
+
+        centre = [c for low, c, high in bounds]
+        points = [point(centre)]
+        for d, (low, c, high) in enumerate(bounds):
+            stepped = list(centre)
+            stepped[d] = c + STEP_FRACTION * (high - low)
+            points.append(point(stepped))
+        # Corners sit just inside the cell so floating point rounding does not move them to the next bin.
+        points.append(point([low + 1e-6 * (high - low) for low, c, high in bounds]))
+        points.append(point([high - 1e-6 * (high - low) for low, c, high in bounds]))
+        return points
+
+    def fit(self, key, outputs):
+        """
+        Fits a cell's linear model to the PHREEQC outputs at its sample points.
+
+        :param key: cell key.
+        :param outputs: output vectors for each of sample_points(key).
+
+        :return: the estimated relative error of the cell
+        """
+        bounds = self.cell_bounds(key)
+        centre = outputs[0]
+        gradients = []
+        for d, (low, c, high) in enumerate(bounds):
+            step = STEP_FRACTION * (high - low)
+            gradients.append([(stepped - base) / step for stepped, base in zip(outputs[d + 1], centre)])
+        # Stored as one row of derivatives per output.
+        rows = [list(row) for row in zip(*gradients)] if gradients else [[] for value in centre]
+        cell = {'centre': [c for low, c, high in bounds], 'output': list(centre), 'rows': rows, 'error': 0.0}
+        self.cells[key] = cell
+        points = self.sample_points(key)
+        cell['error'] = max([relative_error(self._evaluate(cell, point), actual)
+                             for point, actual in zip(points[-2:], outputs[-2:])])
+        return cell['error']
+
+    def _evaluate(self, cell, element_values):
+        dx = [element_values[i] - c for i, c in zip(self.dims, cell['centre'])]
+        return [base + sum([g * d for g, d in zip(row, dx)]) for base, row in zip(cell['output'], cell['rows'])]
+
+    def predict(self, element_values):
+        """
+        Interpolates the output vector for an input vector.
+
+        :param element_values: input vector from GoldSim.
+
+        :return: list of output values, or None if the input is outside the table or its cell's error is too high
+        """
+        cell = self.cells.get(self.cell_key(element_values))
+        if cell is None:
+            self.outside += 1
+            return None
+        if cell['error'] > self.tolerance:
+            self.rejected += 1
+            return None
+        self.hits += 1
+        if cell['error'] > self.max_used_error:
+            self.max_used_error = cell['error']
+        return self._evaluate(cell, element_values)
+
+    def check(self, predicted, actual):
+        """
+        Records the error of an interpolated output checked against PHREEQC.
+
+        :return: the relative error
+        """
+        error = relative_error(predicted, actual)
+        self.checks += 1
+        if error > self.max_observed_error:
+            self.max_observed_error = error
+        return error
+
+    def summary(self):
+        """
+        :return: A single line summary of the surrogate counters for the log file.
+        """
+        queries = self.hits + self.outside + self.rejected
+        fallbacks = self.outside + self.rejected
+        return "Surrogate table: %d interpolated, %d outside the table, %d above the error tolerance " \
+               "(%.1f%% fallback rate), max estimated error %.3g, max observed error %.3g over %d checks.\n" % \
+               (self.hits, self.outside, self.rejected, 100.0 * fallbacks / queries if queries else 0.0,
+                self.max_used_error, self.max_observed_error, self.checks)
+
+    def save(self, path):
+        """
+        Writes the table to a gzip compressed JSON file.
+
+        :param path: output file path.
+
+        :return: None
+        """
+        contents = {'version': TABLE_VERSION, 'elements': self.elements, 'use_config_ph': self.use_config_ph,
+                    'bins_per_decade': self.bins_per_decade, 'setup': self.setup,
+                    'cells': [[list(key), cell] for key, cell in self.cells.items()]}
+        f = gzip.open(path, 'wb')
+        try:
+            json.dump(contents, f)
+        finally:
+            f.close()
+
+    @classmethod
+    def load(cls, path, tolerance=0.01):
+        """
+        Reads a table written by save.
+
+        :param path: table file path.
+        :param tolerance: largest estimated relative error of a cell that is interpolated.
+
+        :return: SurrogateTable
+        """
+        f = gzip.open(path, 'rb')
+        try:
+            contents = json.load(f)
+        finally:
+            f.close()
+        if contents.get('version') != TABLE_VERSION:
+            raise ValueError("surrogate table %s was written by a different version of GoldQC" % path)
+        table = cls(contents['elements'], contents['use_config_ph'], contents['bins_per_decade'],
+                    contents['setup'], tolerance)
+        table.cells = dict([(tuple(key), cell) for key, cell in contents['cells']])
+        return table
+
+
+def build_table(vectors, session, bins_per_decade=4, chunk_size=100):
+    """
+    Builds a surrogate table for every cell visited by the sample vectors, running PHREEQC through a GoldQC session,
+    which must already be initialised.
+
+    :param vectors: iterable of sample input vectors.
+    :param session: initialised GoldQCSession to run on.
+    :param bins_per_decade: number of cells per factor of 10 in each input.
+    :param chunk_size: number of vectors run per PHREEQC call.
+
+    :return: (SurrogateTable, number of cells PHREEQC failed on)
+    """
+    from BatchDriver import chunks, run_chunk
+
+    setup = fingerprint(session.ELEMENTS, session.PHREEQC_SPECS, session.EQ_PHASES, session.CHARGE, session.PH,
+                        session.USE_CONFIG_PH, session.DB_PATH)
+    table = SurrogateTable(session.ELEMENTS, session.USE_CONFIG_PH, bins_per_decade, setup)
+    keys = sorted(set([table.cell_key(vector) for vector in vectors]))
+
+    # Approximate and history dependent results would be fitted into the table.
+    session.RESULT_CACHE = None
+    session.WARM_START = None
+    session.STEP_SKIPPER = None
+    session.SURROGATE = None
+
+    failed = 0
+    cells_per_chunk = max(chunk_size // (len(table.dims) + 3), 1)
+    for key_chunk in chunks(keys, cells_per_chunk):
+        points = [table.sample_points(key) for key in key_chunk]
+        outputs, chunk_failed = run_chunk([point for cell_points in points for point in cell_points], session)
+        start = 0
+        for key, cell_points in zip(key_chunk, points):
+            cell_outputs = outputs[start:start + len(cell_points)]
+            start += len(cell_points)
+            if None in cell_outputs:
+                failed += 1
+            else:
+                table.fit(key, cell_outputs)
+    return table, failed
+
+
+def main(argv=None):
+    import argparse
+    import GoldQC
+    from BatchDriver import read_csv, read_npy
+
+    parser = argparse.ArgumentParser(description="Build a GoldQC surrogate table covering a set of sample inputs.")
+    parser.add_argument('samples', help="CSV or .npy file of representative input vectors, e.g. from a previous run")
+    parser.add_argument('table', help="surrogate table file to write, e.g. GoldQC_surrogate.json.gz")
+    parser.add_argument('--config', default="GoldQC.config", help="GoldQC config file (default GoldQC.config)")
+    parser.add_argument('--bins-per-decade', type=int, default=4, help="cells per factor of 10 in each input "
+                                                                       "(default 4)")
+    parser.add_argument('--chunk-size', type=int, default=100, help="vectors run per PHREEQC call (default 100)")
+    parser.add_argument('--header', action='store_true', help="the CSV input has a header row")
+    args = parser.parse_args(argv)
+
+    session = GoldQC.GoldQCSession(args.config)
+    if session.InitialChecks():
+        exit("Error: GoldQC could not be initialised. Check the log file %s" % session.LOG_FILE_NAME)
+    if args.samples.lower().endswith('.npy'):
+        vectors = list(read_npy(args.samples))
+    else:
+        vectors = list(read_csv(args.samples, header=args.header))
+
+    table, failed = build_table(vectors, session, args.bins_per_decade, args.chunk_size)
+    table.save(args.table)
+    errors = sorted([cell['error'] for cell in table.cells.values()])
+    summary = "Surrogate table: %d cells from %d samples, %d failed, median estimated error %.3g, max %.3g.\n" % \
+              (len(table.cells), len(vectors), failed, errors[len(errors) // 2] if errors else 0.0,
+               errors[-1] if errors else 0.0)
+    print summary,
+    session.write_log(summary)
+    session.WrapUpStuff()
+
+
+if __name__ == "__main__":
+    main()
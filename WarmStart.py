@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: WarmStart.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Bookkeeping for warm starting each GoldQC step from the previous step's equilibrated solution saved in PHREEQC,
+along with the time taken by warm and cold starts for the wrap up report.
+"""
+# ===========================================================================
+
+
+class WarmStart(object):
+    """
+    Tracks whether PHREEQC holds a saved solution to warm start the next step from.
+
+    Steps are cold started from new SOLUTION blocks until one has been equilibrated and saved, after a failed warm
+    start and, when refresh_interval is set, after every refresh_interval warm steps to stop any drift building up.
+    The mass of water in each saved solution is kept so warm start totals can be given for it.
+    """
+
+    def __init__(self, refresh_interval=0):
+        """
+        :param refresh_interval: number of warm steps between cold starts, 0 to only cold start when needed.
+        """
+        self.refresh_interval = refresh_interval
+        self.saved = False
+        self.water = {}
+        self.since_cold = 0
+        self.warm_steps = 0
+        self.warm_time = 0.0
+        self.cold_steps = 0
+        self.cold_time = 0.0
+        self.fallbacks = 0
+        self.fallback_steps = 0
+        self.fallback_time = 0.0
+        self._fell_back = False
+
+    def use_warm(self):
+        """
+        :return: True if the next run should start from the saved solution
+        """
+        return self.saved and not (self.refresh_interval and self.since_cold >= self.refresh_interval)
+
+    def fallback(self):
+        """
+        Records a failed warm start, the steps are then rerun from a cold start.
+
+        :return: None
+        """
+        self.fallbacks += 1
+        self.saved = False
+        self._fell_back = True
+
+    def record(self, warm, seconds, steps):
+        """
+        Adds the time taken to run one or more steps.
+
+        :param warm: whether the run was started warm, including runs that fell back to a cold start.
+        :param seconds: time taken by the run.
+        :param steps: number of steps in the run.
+
+        :return: None
+        """
+        if warm and self._fell_back:
+            self.fallback_steps += steps
+            self.fallback_time += seconds
+            self.since_cold = 0
+        elif warm:
+            self.warm_steps += steps
+            self.warm_time += seconds
+            self.since_cold += steps
+        else:
+            self.cold_steps += steps
+            self.cold_time += seconds
+            self.since_cold = 0
+        self._fell_back = False
+
+    def summary(self):
+        """
+        :return: A single line summary of warm and cold start timings for the log file.
+        """
+        warm = self.warm_time / self.warm_steps if self.warm_steps else 0.0
+        cold = self.cold_time / self.cold_steps if self.cold_steps else 0.0
+        # Fallbacks cost the failed warm start on top of the cold start.
+        saved = (cold - warm) * self.warm_steps - (self.fallback_time - cold * self.fallback_steps) \
+            if self.cold_steps else 0.0
+        return "Warm start: %d warm steps (%.1f us/step), %d cold steps (%.1f us/step), %d fallbacks to a cold " \
+               "start, %.3f s saved against cold starting every step.\n" % \
+               (self.warm_steps, 1e6 * warm, self.cold_steps, 1e6 * cold, self.fallbacks, saved)
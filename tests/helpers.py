@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/helpers.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Shared set up for the GoldQC tests: sessions on the fake PHREEQC engine with a minimal database, so the tests
+run without IPhreeqc. Run the tests from the repository root with python -m unittest discover tests
+"""
+# ===========================================================================
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from functools import partial
+
+import Engines
+import GoldQC
+from Conversions import MOLAR_MASS_LIST
+
+# Some tests change directory, GoldQC imports its optional modules when they are enabled so the repository must stay
+# importable from anywhere.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+ELEMENTS = ['Ca', 'Mg', 'Na', 'pH', 'S(6)', 'Cl']
+VECTOR = [323.0, 458.0, 4.32, 1e-7, 0.34, 1.23]
+
+
+def write_database(path, elements):
+    """
+    Writes a minimal PHREEQC database defining the elements and the Gypsum phase.
+    """
+    with open(path, 'w') as database:
+        database.write("SOLUTION_MASTER_SPECIES\n")
+        for element in elements:
+            if element != 'pH':
+                database.write("%s\t%s\t0\t%s\t%s\n" % (element, element, element, MOLAR_MASS_LIST[element]))
+        database.write("PHASES\nGypsum\n\tCaSO4:2H2O = Ca+2 + SO4-2 + 2 H2O\n\tlog_k\t-4.58\nEND\n")
+
+
+class FailingEngine(Engines.FakeEngine):
+    """
+    Fake engine failing the inputs a test chooses. The choice is made per engine, not by patching FakeEngine, so
+    other sessions running at the same time are not affected.
+    """
+
+    def __init__(self, fail, warning=''):
+        """
+        :param fail: module level function of an input string returning the PHREEQC error for it, '' to run it.
+        :param warning: PHREEQC warning given for every input that is run.
+        """
+        Engines.FakeEngine.__init__(self)
+        self.fail = fail
+        self.warning = warning
+
+    def RunString(self, input_string):
+        error = self.fail(input_string)
+        if error:
+            self.run_count += 1
+            self._error = error
+            self._warning = ''
+            self._output = ()
+            raise Engines.EngineError(error)
+        Engines.FakeEngine.RunString(self, input_string)
+        self._warning = self.warning
+
+
+def use_failing_engine(session, fail, warning=''):
+    """
+    Makes a session, before InitialChecks, run on FailingEngines, including in its pool and retry processes.
+
+    :param session: GoldQCSession to set up.
+    :param fail: function choosing the inputs to fail, @see FailingEngine.
+    :param warning: PHREEQC warning given for every input that is run.
+    """
+    factory = partial(FailingEngine, fail, warning)
+    session.engine_factory = lambda: factory
+
+
+class SessionTestCase(unittest.TestCase):
+    """
+    Test case with a temporary directory and helpers to start GoldQC sessions on the fake engine in it.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='goldqc_test_')
+        self.sessions = []
+
+    def tearDown(self):
+        for session in self.sessions:
+            # WrapUpStuff exits on errors, the tests check ERRORS themselves.
+            session.ERRORS = 0
+            session.WrapUpStuff()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write_config(self, name, elements=ELEMENTS):
+        """
+        Writes a config file running elements on the fake engine, with its database, in the temporary directory.
+
+        :param name: config file name.
+        :param elements: GoldSim element list.
+
+        :return: path to the config file
+        """
+        path = os.path.join(self.directory, name)
+        # Each config has its own database so sessions with different elements can run side by side.
+        db_path = path + '.dat'
+        write_database(db_path, elements)
+        with open(path, 'w') as config:
+            config.write("[phreeqc]\ndatabase= %s\nengine= fake\n\n[GoldSim]\nelements= %r\n\n[GoldQC]\n"
+                         "log_file= %s\n" % (db_path, list(elements), path + '.log'))
+        return path
+
+    def make_session(self, elements=ELEMENTS, fail=None, warning='', **settings):
+        """
+        :param elements: GoldSim element list.
+        :param fail: function choosing the inputs the session's engines fail, @see FailingEngine.
+        :param warning: PHREEQC warning the session's engines give for every input when fail is set.
+        :param settings: session attributes to set before InitialChecks e.g. CACHE_SIZE=10.
+
+        :return: an initialised GoldQCSession on the fake engine
+        """
+        session = GoldQC.GoldQCSession()
+        session.ELEMENTS = list(elements)
+        session.DB_PATH = os.path.join(self.directory, 'test.dat')
+        # Sessions in a test share the database, rewriting it would invalidate their persistent cache.
+        if not self.sessions:
+            write_database(session.DB_PATH, elements)
+        session.LOG_FILE_NAME = os.path.join(self.directory, 'test%d.log' % len(self.sessions))
+        session.ENGINE_BACKEND = 'fake'
+        session.USE_CONFIG_PH = False
+        for name, value in settings.items():
+            setattr(session, name, value)
+        if fail is not None:
+            use_failing_engine(session, fail, warning)
+        count = session.CELLS * len(elements)
+        vector_type = GoldQC.MATRIX_TYPE if session.CELLS > 1 else GoldQC.VECTOR_TYPE
+        session.IN_VAR_LIST = [[count, vector_type, "input"]]
+        session.RET_VAR_LIST = [[count, vector_type, "output"]]
+        self.assertEqual(session.InitialChecks(), 0)
+        self.sessions.append(session)
+        return session
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_batch_driver.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for the batch driver, run without a GoldQC.config in the working directory.
+"""
+# ===========================================================================
+import csv
+import os
+import unittest
+
+import BatchDriver
+import GoldQC
+from tests.helpers import SessionTestCase, VECTOR
+
+
+class BatchDriverTest(SessionTestCase):
+
+    def setUp(self):
+        SessionTestCase.setUp(self)
+        self.working_directory = os.getcwd()
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.working_directory)
+        SessionTestCase.tearDown(self)
+
+    def test_runs_with_own_config(self):
+        config_path = self.write_config('Other.config')
+        vectors = [VECTOR, [value * 2 for value in VECTOR]]
+        with open('in.csv', 'wb') as f:
+            csv.writer(f).writerows(vectors)
+        BatchDriver.main(['in.csv', 'out.csv', '--config', config_path])
+        with open('out.csv', 'rb') as f:
+            outputs = [[float(value) for value in row] for row in csv.reader(f)]
+        expected = self.make_session(CELLS=2, USE_CONFIG_PH=True).MyCustomCalculationsBatch(vectors)
+        self.assertEqual(len(outputs), 2)
+        for output, values in zip(outputs, expected):
+            for value, expected_value in zip(output, values):
+                self.assertAlmostEqual(value, expected_value)
+        self.assertFalse(os.path.exists('GoldQC.config'))
+        self.assertIsNone(GoldQC.SESSION)
+
+    def test_rows_not_skipped(self):
+        config_path = self.write_config('Other.config')
+        with open(config_path, 'a') as config:
+            config.write("\n[step_skip]\nthreshold= 0.5\n")
+        vectors = [VECTOR, [value * 1.1 for value in VECTOR]]
+        with open('in.csv', 'wb') as f:
+            csv.writer(f).writerows(vectors)
+        BatchDriver.main(['in.csv', 'out.csv', '--config', config_path, '--chunk-size', '1'])
+        with open('out.csv', 'rb') as f:
+            outputs = [[float(value) for value in row] for row in csv.reader(f)]
+        self.assertNotEqual(outputs[0], outputs[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
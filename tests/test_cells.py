@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_cells.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for running several cells per GoldSim call.
+"""
+# ===========================================================================
+import unittest
+
+from tests.helpers import SessionTestCase, VECTOR
+
+FAILING_CALCIUM = -1.0
+
+
+def negative_calcium(input_string):
+    """
+    Fails any input with a solution holding FAILING_CALCIUM mg/L of Ca.
+    """
+    return 'ERROR: Negative concentration.\n' if '\tCa\t\t\t%s\n' % FAILING_CALCIUM in input_string else ''
+
+
+class CellsTest(SessionTestCase):
+
+    def test_step_counts_goldsim_calls(self):
+        session = self.make_session(fail=negative_calcium, CELLS=3)
+        for _ in range(2):
+            outputs = session.CustomCalculations(VECTOR * 3, len(VECTOR) * 3)
+        self.assertEqual(len(outputs), len(VECTOR) * 3)
+        self.assertEqual(session.STEP, 2)
+        self.assertEqual(session.ERRORS, 0)
+
+    def test_failed_cell_marked_alone(self):
+        session = self.make_session(fail=negative_calcium, CELLS=3)
+        expected = session.CustomCalculations(VECTOR * 3, len(VECTOR) * 3)
+        failing = list(VECTOR)
+        failing[0] = FAILING_CALCIUM
+        outputs = session.CustomCalculations(VECTOR + failing + VECTOR, len(VECTOR) * 3)
+        count = len(VECTOR)
+        self.assertEqual(outputs[:count], expected[:count])
+        self.assertEqual(outputs[count:2 * count], [-1] * count)
+        self.assertEqual(outputs[2 * count:], expected[2 * count:])
+        self.assertEqual(session.ERRORS, 1)
+        self.assertEqual(session.STEP, 2)
+        session.LOG_WRITER.flush()
+        with open(session.LOG_FILE_NAME) as log_file:
+            self.assertIn('Error at step 1: PHREEQC failed on cell 1.', log_file.read())
+
+    def test_batch_of_failures(self):
+        session = self.make_session(fail=negative_calcium, CELLS=2)
+        failing = list(VECTOR)
+        failing[0] = FAILING_CALCIUM
+        self.assertEqual(session.MyCustomCalculationsBatch([failing, failing]), -1)
+        self.assertEqual(session.MyCustomCalculationsBatch([VECTOR, failing])[1], None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_engine_pool.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for the engine pool on the fake engine, compared with running on a single engine.
+"""
+# ===========================================================================
+import os
+import time
+import unittest
+
+from EnginePool import EnginePool
+from Engines import FakeEngine
+from tests.helpers import SessionTestCase, VECTOR, write_database
+
+
+class SlowEngine(FakeEngine):
+    """
+    Fake engine that takes two seconds over any input containing SLOW.
+    """
+
+    def RunString(self, input_string):
+        if 'SLOW' in input_string:
+            time.sleep(2)
+        FakeEngine.RunString(self, input_string)
+
+
+def solution_input(calcium):
+    return "SOLUTION 1\n\tCa\t%r\nSELECTED_OUTPUT\n\t-totals Ca\nEND\n" % calcium
+
+
+def engine_output(db_path, input_string):
+    """
+    :return: the selected output from running input_string on a new fake engine.
+    """
+    engine = FakeEngine()
+    engine.LoadDatabase(db_path)
+    engine.RunString(input_string)
+    return engine.GetSelectedOutputArray()
+
+
+class EnginePoolTest(SessionTestCase):
+
+    def setUp(self):
+        SessionTestCase.setUp(self)
+        self.db_path = os.path.join(self.directory, 'test.dat')
+        write_database(self.db_path, ['Ca'])
+
+    def test_results_in_input_order(self):
+        pool = EnginePool(2, self.db_path, FakeEngine)
+        try:
+            results = pool.run([solution_input(float(i)) for i in range(1, 7)])
+        finally:
+            pool.close()
+        self.assertEqual([error for output, error, warning in results], [''] * 6)
+        totals = [output[2][-1] for output, error, warning in results]
+        self.assertEqual(totals, sorted(totals))
+        self.assertEqual(sum(pool.tasks_done), 6)
+
+    def test_overdue_result_not_returned_to_next_run(self):
+        pool = EnginePool(1, self.db_path, SlowEngine)
+        try:
+            output, error, warning = pool.run([solution_input(1.0) + 'SLOW\n'], 0.2)[0]
+            self.assertIsNone(output)
+            self.assertIn('time budget', error)
+            self.assertEqual(pool.timeouts, 1)
+            output, error, warning = pool.run([solution_input(2.0)], 0.2)[0]
+        finally:
+            pool.close()
+        self.assertEqual(error, '')
+        self.assertEqual(output, engine_output(self.db_path, solution_input(2.0)))
+
+
+class PoolSessionTest(SessionTestCase):
+
+    def test_pool_matches_single_engine(self):
+        vectors = [[value * (cell + 1) for value in VECTOR] for cell in range(4)]
+        serial = self.make_session(CELLS=4)
+        pooled = self.make_session(CELLS=4, POOL_SIZE=2)
+        for step in range(3):
+            vectors = [[value * (1.0 + 0.1 * step) for value in vector] for vector in vectors]
+            self.assertEqual(pooled.MyCustomCalculationsBatch(vectors), serial.MyCustomCalculationsBatch(vectors))
+        self.assertIsNotNone(pooled.ENGINE_POOL)
+        self.assertEqual(sum(pooled.ENGINE_POOL.tasks_done), 3 * pooled.ENGINE_POOL.size)
+        self.assertEqual(pooled.STEP, serial.STEP)
+
+
+if __name__ == '__main__':
+    unittest.main()
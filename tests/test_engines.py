@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_engines.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for creating the PHREEQC engine backends.
+"""
+# ===========================================================================
+import ctypes
+import os
+import unittest
+from array import array
+
+import GoldQC
+from Engines import EngineError, FakeEngine, IPhreeqcLibrary, create_engine
+from Engines import MAX_STRING_LENGTH, TT_DOUBLE, TT_LONG, TT_STRING
+from tests.helpers import SessionTestCase, VECTOR, write_database
+
+try:
+    import comtypes
+except ImportError:
+    comtypes = None
+
+
+class SelectedOutputLibrary(object):
+    """
+    Stands in for the selected output functions of the IPhreeqc shared library, holding a fixed table.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def GetSelectedOutputRowCount(self, handle):
+        return len(self.table)
+
+    def GetSelectedOutputColumnCount(self, handle):
+        return len(self.table[0])
+
+    def GetSelectedOutputValue2(self, handle, row, column, vtype, dvalue, svalue, length):
+        value = self.table[row][column]
+        if isinstance(value, str):
+            vtype._obj.value = TT_STRING
+            svalue.value = value
+        else:
+            vtype._obj.value = TT_LONG if isinstance(value, int) else TT_DOUBLE
+            dvalue._obj.value = value
+        return 0
+
+
+def library_engine(table):
+    """
+    :return: an IPhreeqcLibrary reading its selected output from table rather than the shared library.
+    """
+    engine = IPhreeqcLibrary.__new__(IPhreeqcLibrary)
+    engine._lib = SelectedOutputLibrary(table)
+    engine._id = -1
+    engine._vtype = ctypes.c_int()
+    engine._dvalue = ctypes.c_double()
+    engine._svalue = ctypes.create_string_buffer(MAX_STRING_LENGTH)
+    engine._buffer = array('d')
+    return engine
+
+
+class CreateEngineTest(SessionTestCase):
+
+    def test_fake_backend(self):
+        self.assertIsInstance(create_engine('fake'), FakeEngine)
+
+    def test_unknown_backend(self):
+        self.assertRaises(EngineError, create_engine, 'unknown')
+
+    @unittest.skipIf(comtypes is not None, "comtypes is installed")
+    def test_com_backend_without_comtypes(self):
+        self.assertRaises(EngineError, create_engine, 'com')
+        session = GoldQC.GoldQCSession()
+        session.DB_PATH = os.path.join(self.directory, 'test.dat')
+        write_database(session.DB_PATH, session.ELEMENTS)
+        session.LOG_FILE_NAME = os.path.join(self.directory, 'test.log')
+        session.ENGINE_BACKEND = 'com'
+        self.assertEqual(session.InitialChecks(), 1)
+        session.LOG_WRITER.close()
+        with open(session.LOG_FILE_NAME) as log_file:
+            log = log_file.read()
+        self.assertIn('Starting GoldQC', log)
+        self.assertIn('needs the comtypes package', log)
+
+
+class LibraryEngineTest(unittest.TestCase):
+
+    def test_selected_output_read_into_buffer(self):
+        engine = library_engine([('sim', 'state', 'pH', 'Ca'), (1, 'i_soln', 7.0, 0.008), (1, 'react', 7.2, 0.004),
+                                 (2, 'i_soln', 6.5, 0.01)])
+        output = engine.GetSelectedOutputArray()
+        self.assertEqual(output[0], ('sim', 'state', 'pH', 'Ca'))
+        self.assertEqual(len(output), 4)
+        for row, expected in zip(output[1:], [(1, 7.0, 0.008), (1, 7.2, 0.004), (2, 6.5, 0.01)]):
+            self.assertIsInstance(row, array)
+            self.assertEqual((row[0], row[2], row[3]), expected)
+            self.assertNotEqual(row[1], row[1])
+        # The buffer is reused, earlier rows are copies.
+        engine._lib.table = [('sim', 'pH'), (3, 8.0)]
+        self.assertEqual([list(row) for row in engine.GetSelectedOutputArray()[1:]], [[3.0, 8.0]])
+        self.assertEqual(output[1][0], 1.0)
+
+
+class RestartEngineTest(SessionTestCase):
+
+    def test_step_run_after_restart(self):
+        session = self.make_session()
+        expected = session.CustomCalculations(VECTOR, len(VECTOR))
+        session.PHREEQC = None
+        self.assertEqual(session.CustomCalculations(VECTOR, len(VECTOR)), expected)
+        self.assertEqual((session.ERRORS, session.STEP, session.PHREEQC.run_count), (0, 2, 1))
+
+    def test_warm_start_run_cold_after_restart(self):
+        session = self.make_session(WARM_START_ENABLED=True, WARM_FALLBACK=False)
+        # The first step is a cold start, as is the step after the restart.
+        expected = session.CustomCalculations(VECTOR, len(VECTOR))
+        session.CustomCalculations(VECTOR, len(VECTOR))
+        session.PHREEQC = None
+        self.assertEqual(session.CustomCalculations(VECTOR, len(VECTOR)), expected)
+        self.assertEqual(session.ERRORS, 0)
+        self.assertEqual(session.WARM_START.fallbacks, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_message_counter.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for counting repeated PHREEQC warnings and errors.
+"""
+# ===========================================================================
+import unittest
+
+from tests.helpers import SessionTestCase, VECTOR
+
+WARNING = 'WARNING: Maximum iterations exceeded, 100\n'
+
+
+def negative_calcium(input_string):
+    """
+    Fails any input with a solution holding negative calcium.
+    """
+    return 'ERROR: Negative concentration.\n' if '\tCa\t\t\t-' in input_string else ''
+
+
+class MessageCounterTest(SessionTestCase):
+
+    def test_errors_written_warnings_collapsed(self):
+        session = self.make_session(fail=negative_calcium, warning=WARNING, MESSAGE_REPEATS=1)
+        failing = list(VECTOR)
+        failing[0] = -1.0
+        for vector in (VECTOR, VECTOR, failing, failing, failing):
+            session.CustomCalculations(vector, len(vector))
+        session.LOG_WRITER.flush()
+        with open(session.LOG_FILE_NAME) as log_file:
+            log = log_file.read()
+        self.assertEqual(log.count('Warning at step'), 1)
+        self.assertEqual(log.count('Error at step'), 3)
+        self.assertEqual(session.MESSAGES.signatures[('Error', 'ERROR: Negative concentration.')][0], 3)
+        # Only the repeated warnings were hidden.
+        self.assertIn('5 warnings and errors, 2 distinct lines, 1 messages only counted', session.MESSAGES.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
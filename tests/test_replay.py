@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_replay.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for replaying step recordings, run without a GoldQC.config in the working directory.
+"""
+# ===========================================================================
+import json
+import os
+import sys
+import unittest
+from StringIO import StringIO
+
+import GoldQC
+import Replay
+from tests.helpers import SessionTestCase, VECTOR, use_failing_engine
+
+
+def negative_calcium(input_string):
+    """
+    Fails any input with a solution holding negative calcium.
+    """
+    return 'ERROR: Negative concentration.\n' if '\tCa\t\t\t-' in input_string else ''
+
+
+class FailingSession(GoldQC.GoldQCSession):
+    """
+    Session replaying on engines that fail solutions with negative calcium.
+    """
+
+    def __init__(self, config_file=None):
+        GoldQC.GoldQCSession.__init__(self, config_file)
+        use_failing_engine(self, negative_calcium)
+
+
+class FailingGoldQC(object):
+    """
+    Stands in for the GoldQC module in Replay so only the replay session runs on failing engines.
+    """
+    GoldQCSession = FailingSession
+
+
+class ReplayTest(SessionTestCase):
+
+    def setUp(self):
+        SessionTestCase.setUp(self)
+        self.working_directory = os.getcwd()
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.working_directory)
+        SessionTestCase.tearDown(self)
+
+    def record(self, steps, negative_step=None):
+        """
+        Records steps of a session started from its own config file.
+
+        :param steps: number of steps to record.
+        :param negative_step: step given negative calcium, which the fake engine runs.
+
+        :return: path to the recording
+        """
+        session = GoldQC.GoldQCSession(self.write_config('Other.config'))
+        session.RECORD_FILE = os.path.join(self.directory, 'run.gqr')
+        self.assertEqual(session.InitialChecks(), 0)
+        for step in range(steps):
+            vector = [value * (1.0 + 0.1 * step) for value in VECTOR]
+            if step == negative_step:
+                vector[0] = -1.0
+            session.MyCustomCalculations([vector])
+        session.WrapUpStuff()
+        return session.RECORD_FILE
+
+    def test_replay_matches_recording(self):
+        recording = self.record(5)
+        for mode in ('serial', 'batched'):
+            stdout = sys.stdout
+            sys.stdout = StringIO()
+            try:
+                Replay.main([recording, '--mode', mode, '--config', 'Other.config'])
+                report = sys.stdout.getvalue()
+            finally:
+                sys.stdout = stdout
+            self.assertIn('Replayed 5 of 5 recorded steps in %s mode' % mode, report)
+        self.assertFalse(os.path.exists('GoldQC.config'))
+        self.assertIsNone(GoldQC.SESSION)
+
+    def test_failed_step_reported(self):
+        recording = self.record(5, negative_step=2)
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        Replay.GoldQC = FailingGoldQC
+        try:
+            with self.assertRaises(SystemExit):
+                Replay.main([recording, '--config', 'Other.config', '--save', 'report.json'])
+            report = sys.stdout.getvalue()
+        finally:
+            Replay.GoldQC = GoldQC
+            sys.stdout = stdout
+        self.assertIn('Replayed 5 of 5 recorded steps in serial mode', report)
+        with open('report.json') as f:
+            self.assertEqual(json.load(f)['outputs']['failed_steps'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
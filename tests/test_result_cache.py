@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_result_cache.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for the in memory result cache, counting RunString calls on the fake engine, and the persistent cache.
+"""
+# ===========================================================================
+import os
+import unittest
+
+from ResultCache import ResultCache
+from tests.helpers import SessionTestCase, VECTOR
+
+
+def negative_calcium(input_string):
+    """
+    Fails any input with a solution holding negative calcium.
+    """
+    return 'ERROR: Negative concentration.\n' if '\tCa\t\t\t-' in input_string else ''
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def test_tolerance_matches_within_bucket(self):
+        cache = ResultCache(10, 0.01)
+        cache.put([1.0, 2.0, 0.0], 'state', 'result')
+        self.assertEqual(cache.get([1.001, 2.001, 0.0], 'state'), 'result')
+        self.assertIsNone(cache.get([1.1, 2.0, 0.0], 'state'))
+        self.assertIsNone(cache.get([1.0, 2.0, 0.0], 'other state'))
+
+    def test_eviction_removes_buckets(self):
+        cache = ResultCache(2, 0.01)
+        for i in range(5):
+            cache.put([10.0 + i], 'state', i)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(len(cache._buckets), 2)
+        self.assertEqual(cache.evictions, 3)
+        self.assertIsNone(cache.get([10.0], 'state'))
+        self.assertEqual(cache.get([14.0], 'state'), 4)
+
+
+class CachedSessionTest(SessionTestCase):
+
+    def test_repeated_inputs_run_once(self):
+        session = self.make_session(CACHE_SIZE=10)
+        outputs = [session.CustomCalculations(VECTOR, len(VECTOR)) for _ in range(5)]
+        self.assertEqual(session.PHREEQC.run_count, 1)
+        self.assertEqual(outputs, [outputs[0]] * 5)
+        self.assertEqual((session.RESULT_CACHE.hits, session.RESULT_CACHE.misses), (4, 1))
+
+    def test_close_inputs_use_tolerance(self):
+        session = self.make_session(CACHE_SIZE=10, CACHE_TOLERANCE=0.01)
+        session.CustomCalculations(VECTOR, len(VECTOR))
+        session.CustomCalculations([value * 1.0001 for value in VECTOR], len(VECTOR))
+        self.assertEqual(session.PHREEQC.run_count, 1)
+        session.CustomCalculations([value * 1.5 for value in VECTOR], len(VECTOR))
+        self.assertEqual(session.PHREEQC.run_count, 2)
+
+    def test_caching_continues_after_failed_cell(self):
+        directory = os.path.join(self.directory, 'cache')
+        session = self.make_session(fail=negative_calcium, CELLS=2, CACHE_SIZE=10, CACHE_DIRECTORY=directory)
+        failing = list(VECTOR)
+        failing[0] = -1.0
+        session.MyCustomCalculationsBatch([VECTOR, failing])
+        self.assertEqual(session.ERRORS, 1)
+        changed = [value * 2 for value in VECTOR]
+        for _ in range(4):
+            session.MyCustomCalculationsBatch([changed, VECTOR])
+        self.assertEqual(len(session.RESULT_CACHE), 2)
+        self.assertEqual((session.RESULT_CACHE.hits, session.RESULT_CACHE.misses), (7, 3))
+        second = self.make_session(CELLS=2, CACHE_DIRECTORY=directory)
+        second.MyCustomCalculationsBatch([changed, VECTOR])
+        self.assertEqual((second.DISK_CACHE.hits, second.DISK_CACHE.misses), (2, 0))
+
+    def test_uncached_session_runs_every_step(self):
+        session = self.make_session()
+        for _ in range(3):
+            session.CustomCalculations(VECTOR, len(VECTOR))
+        self.assertEqual(session.PHREEQC.run_count, 3)
+
+
+class PersistentSessionTest(SessionTestCase):
+
+    def test_solutions_reused_across_batches(self):
+        directory = os.path.join(self.directory, 'cache')
+        changed = [value * 2 for value in VECTOR]
+        first = self.make_session(CELLS=2, CACHE_DIRECTORY=directory)
+        outputs = first.MyCustomCalculationsBatch([VECTOR, changed])
+        self.assertEqual((first.DISK_CACHE.hits, first.DISK_CACHE.misses), (0, 2))
+
+        # Only the changed cell misses, and a single vector reuses a result stored from a batch.
+        second = self.make_session(CELLS=2, CACHE_DIRECTORY=directory)
+        again = second.MyCustomCalculationsBatch([[value * 3 for value in VECTOR], VECTOR])
+        self.assertEqual(again[1], outputs[0])
+        self.assertEqual(second.MyCustomCalculationsBatch([changed]), [outputs[1]])
+        self.assertEqual((second.DISK_CACHE.hits, second.DISK_CACHE.misses), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
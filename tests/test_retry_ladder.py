@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_retry_ladder.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for the retry ladder on the fake engine, with and without a time budget per attempt.
+"""
+# ===========================================================================
+import time
+import unittest
+
+from tests.helpers import SessionTestCase, VECTOR
+
+RUNGS = [{"iterations": 400}, {"iterations": 1000, "diagonal_scale": True}]
+
+
+def unconverged(input_string):
+    """
+    Fails every solution not run with 1000 iterations, taking two seconds to fail with 400 iterations.
+    """
+    if 'SOLUTION' in input_string and '-iterations\t1000' not in input_string:
+        if '-iterations\t400' in input_string:
+            time.sleep(2)
+        return 'ERROR: Model failed to converge.\n'
+    return ''
+
+
+class RetryLadderTest(SessionTestCase):
+
+    def setUp(self):
+        SessionTestCase.setUp(self)
+        self.expected = self.make_session().CustomCalculations(VECTOR, len(VECTOR))
+
+    def test_recovers_on_engine(self):
+        session = self.make_session(fail=unconverged, RETRY_RUNGS=[{"iterations": 1000}])
+        self.assertEqual(session.CustomCalculations(VECTOR, len(VECTOR)), self.expected)
+        self.assertEqual((session.ERRORS, session.WARNINGS), (0, 1))
+        self.assertEqual(session.RETRY_LADDER.successes, [1])
+
+    def test_overdue_attempt_skipped_on_pool(self):
+        session = self.make_session(fail=unconverged, RETRY_RUNGS=RUNGS, RETRY_BUDGET=0.2)
+        for _ in range(2):
+            self.assertEqual(session.CustomCalculations(VECTOR, len(VECTOR)), self.expected)
+        self.assertEqual(session.ERRORS, 0)
+        self.assertEqual(session.RETRY_LADDER.successes, [0, 2])
+        self.assertEqual(session.RETRY_POOL.timeouts, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
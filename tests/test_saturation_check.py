@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_saturation_check.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for the speciation fast path.
+"""
+# ===========================================================================
+import unittest
+
+from tests.helpers import SessionTestCase, VECTOR
+
+
+def failing_speciation(input_string):
+    """
+    Fails any input without equilibrium phases, i.e. the speciation pass.
+    """
+    return 'ERROR: Speciation did not converge.\n' if 'EQUILIBRIUM_PHASES' not in input_string else ''
+
+
+class SpeciationFailureTest(SessionTestCase):
+
+    def check_equilibrated(self, **settings):
+        vectors = [VECTOR, [value * 2 for value in VECTOR]] * 2
+        expected = self.make_session(CELLS=4).CustomCalculations(sum(vectors, []), len(VECTOR) * 4)
+        session = self.make_session(CELLS=4, fail=failing_speciation, SPECIATION_FAST_PATH=True, **settings)
+        self.assertIsNotNone(session.SATURATION_CHECK)
+        self.assertEqual(session.CustomCalculations(sum(vectors, []), len(VECTOR) * 4), expected)
+        self.assertEqual(session.ERRORS, 0)
+        self.assertEqual(session.WARNINGS, 1)
+        session.LOG_WRITER.flush()
+        with open(session.LOG_FILE_NAME) as log_file:
+            log = log_file.read()
+        self.assertIn('Warning at step 0: speciation failed, equilibrating instead', log)
+        self.assertNotIn('Error at step', log)
+
+    def test_speciation_failure_is_warning(self):
+        self.check_equilibrated()
+
+    def test_speciation_failure_on_pool_is_warning(self):
+        self.check_equilibrated(POOL_SIZE=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
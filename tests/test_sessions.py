@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_sessions.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for independent GoldQC sessions.
+"""
+# ===========================================================================
+import os
+import threading
+import unittest
+
+import GoldQC
+from tests.helpers import ELEMENTS, SessionTestCase, VECTOR, use_failing_engine
+
+OTHER_ELEMENTS = ['Ca', 'Na', 'pH', 'Cl']
+STEPS = 50
+
+
+def negative_calcium(input_string):
+    """
+    Fails any input with a solution holding negative calcium.
+    """
+    return 'ERROR: Negative concentration.\n' if '\tCa\t\t\t-' in input_string else ''
+
+
+def step_vectors(vector):
+    """
+    :return: STEPS input vectors scaled from vector, every tenth one with negative calcium.
+    """
+    vectors = []
+    for step in range(STEPS):
+        values = [value * (1 + 0.01 * step) for value in vector]
+        if step % 10 == 5:
+            values[0] = -1.0
+        vectors.append(values)
+    return vectors
+
+
+class ConcurrentSessionsTest(SessionTestCase):
+
+    def config_session(self, name, elements, fail=None):
+        """
+        :return: an initialised GoldQCSession from its own config file.
+        """
+        session = GoldQC.GoldQCSession(self.write_config(name, elements))
+        if fail is not None:
+            use_failing_engine(session, fail)
+        self.assertEqual(session.InitialChecks(), 0)
+        self.sessions.append(session)
+        return session
+
+    def run_steps(self, session, vectors, outputs):
+        for vector in vectors:
+            outputs.append(session.CustomCalculations(vector, len(vector)))
+
+    def test_sessions_run_side_by_side(self):
+        vectors = step_vectors(VECTOR)
+        other_vectors = step_vectors([10.0, 20.0, 1e-8, 30.0])
+        expected = []
+        self.run_steps(self.config_session('Expected.config', ELEMENTS, negative_calcium), vectors, expected)
+        other_expected = []
+        self.run_steps(self.config_session('OtherExpected.config', OTHER_ELEMENTS), other_vectors, other_expected)
+
+        # Only the first session's engine fails, the other runs the same inputs on its own engine.
+        first = self.config_session('First.config', ELEMENTS, negative_calcium)
+        second = self.config_session('Second.config', OTHER_ELEMENTS)
+        self.assertIsNot(first.PHREEQC, second.PHREEQC)
+        outputs = []
+        other_outputs = []
+        threads = [threading.Thread(target=self.run_steps, args=(first, vectors, outputs)),
+                   threading.Thread(target=self.run_steps, args=(second, other_vectors, other_outputs))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outputs, expected)
+        self.assertEqual(other_outputs, other_expected)
+        self.assertEqual((first.STEP, second.STEP), (STEPS, STEPS))
+        self.assertEqual((first.ERRORS, second.ERRORS), (1, 0))
+        self.assertEqual(first.PHREEQC.run_count, STEPS)
+        self.assertEqual(second.PHREEQC.run_count, STEPS)
+        self.assertIsNone(GoldQC.SESSION)
+        for session in (first, second):
+            session.LOG_WRITER.flush()
+        with open(first.LOG_FILE_NAME) as log_file:
+            self.assertEqual(log_file.read().count('Error at step'), STEPS // 10)
+        with open(second.LOG_FILE_NAME) as log_file:
+            self.assertNotIn('Error at step', log_file.read())
+
+
+class InitializationErrorTest(SessionTestCase):
+
+    def setUp(self):
+        SessionTestCase.setUp(self)
+        self.working_directory = os.getcwd()
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.working_directory)
+        SessionTestCase.tearDown(self)
+
+    def test_logged_without_config(self):
+        GoldQC.PythonInitializationError()
+        self.assertIsNone(GoldQC.SESSION)
+        with open(GoldQC.DEFAULT_LOG_FILE) as log_file:
+            self.assertIn('Python did not initialize correctly.', log_file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_step_skipper.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for change driven step skipping.
+"""
+# ===========================================================================
+import unittest
+
+from StepSkipper import StepSkipper
+
+
+class StepSkipperTest(unittest.TestCase):
+
+    def setUp(self):
+        self.skipper = StepSkipper(['Ca', 'Na'], 0.5, extrapolate=True)
+        self.skipper.update(0, 1, [100.0, 10.0], [1.0, 2.0])
+        self.skipper.update(0, 2, [110.0, 11.0], [1.5, 2.5])
+
+    def test_extrapolates_along_inputs(self):
+        output = self.skipper.predict(0, 3, [120.0, 12.0])
+        self.assertAlmostEqual(output[0], 2.0)
+        self.assertAlmostEqual(output[1], 3.0)
+
+    def test_unchanged_inputs_reuse_last(self):
+        self.assertEqual(self.skipper.predict(0, 10, [110.0, 11.0]), [1.5, 2.5])
+
+    def test_cells_kept_apart(self):
+        self.assertIsNone(self.skipper.predict(1, 3, [110.0, 11.0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Python Module: tests/test_warm_start.py
+Created by: The GoldQC Authors
+Creation Date: 17/10/2026
+
+Copyright 2026, The GoldQC Authors
+This file is part of GoldQC.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice,
+  this list of conditions and the following disclaimer.
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+* The name of the author may not be used to endorse or promote products
+  derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+POSSIBILITY OF SUCH DAMAGE.
+
+Purpose:
+Tests for warm starts, compared with cold starting every step on the fake engine.
+"""
+# ===========================================================================
+import unittest
+
+from Conversions import MOLAR_MASS_LIST
+from SolutionTemplate import SolutionTemplate
+from tests.helpers import ELEMENTS, SessionTestCase, VECTOR
+
+SPECS = '\ttemp\t\t25\n\tpe\t\t\t4\n\tredox\t\tpe\n'
+PHASES = 'EQUILIBRIUM_PHASES\n\tGypsum\t0\t0\n'
+TOTALS = 'Ca Mg Na S(6) Cl '
+CALCIUM_MG_PER_MOL = 1000.0 * MOLAR_MASS_LIST['Ca']
+
+
+class RenderWarmTest(unittest.TestCase):
+
+    def test_totals_scaled_by_saved_water(self):
+        template = SolutionTemplate(ELEMENTS, SPECS, PHASES, TOTALS, use_config_ph=False)
+        full = template.render_warm(VECTOR, 5)
+        half = template.render_warm(VECTOR, 5, water=0.5)
+        self.assertIn('\t\tCa\t\t%r\n' % (VECTOR[0] / CALCIUM_MG_PER_MOL), full)
+        self.assertIn('\t\tCa\t\t%r\n' % (VECTOR[0] * 0.5 / CALCIUM_MG_PER_MOL), half)
+
+    def test_goldsim_ph_and_charge(self):
+        template = SolutionTemplate(ELEMENTS, SPECS, PHASES, TOTALS, charge='Cl', use_config_ph=False)
+        warm = template.render_warm(VECTOR, 5)
+        self.assertIn('\t-pH\t\t7.0\n', warm)
+        self.assertIn('\t-cb\t\t0\n', warm)
+
+    def test_config_ph(self):
+        template = SolutionTemplate(ELEMENTS, SPECS, PHASES, TOTALS, ph=6.5)
+        warm = template.render_warm(VECTOR, 5)
+        self.assertIn('\t-pH\t\t6.5\n', warm)
+        self.assertNotIn('-cb', warm)
+
+
+class WarmSessionTest(SessionTestCase):
+
+    def assert_outputs_close(self, outputs, expected):
+        for output, expected_output in zip(outputs, expected):
+            for value, expected_value in zip(output, expected_output):
+                self.assertAlmostEqual(value, expected_value, delta=1e-9 * max(abs(expected_value), 1.0))
+
+    def test_matches_cold_start(self):
+        cold = self.make_session(CELLS=2, CHARGE='Cl')
+        warm = self.make_session(CELLS=2, CHARGE='Cl', WARM_START_ENABLED=True)
+        ph_index = ELEMENTS.index('pH')
+        for step in range(5):
+            vectors = [[value * (1.0 + 0.2 * step + cell) for value in VECTOR] for cell in range(2)]
+            for vector in vectors:
+                vector[ph_index] = 10 ** -(6.0 + 0.3 * step)
+            self.assert_outputs_close(warm.MyCustomCalculationsBatch(vectors), cold.MyCustomCalculationsBatch(vectors))
+        self.assertEqual(warm.WARM_START.warm_steps, 8)
+        self.assertEqual(warm.WARM_START.water, {999999: 1.0, 1000000: 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()